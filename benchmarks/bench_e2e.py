@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# Description: End-to-end timings of psqlc subcommands against a throwaway local cluster (initdb/pg_ctl)
+# License: MIT
+
+"""
+Usage:
+
+    python benchmarks/bench_e2e.py --tables 2000 --rows 10000 --output results.json
+    python benchmarks/bench_e2e.py --compare results.json --threshold 1.25
+
+Creates a cluster with initdb in a temporary directory, starts it with pg_ctl on a
+free port, seeds --tables tables (spread over --schemas schemas, each with an index)
+of which the first --data-tables get --rows rows, then times:
+
+* every CLI subcommand in a fresh `psqlc` process: once cold (empty psqlc caches)
+  and --repeat times warm (caches populated), including import, config discovery,
+  connect and rendering;
+* the catalog fetch functions in-process, without rendering, cold and warm.
+
+Results are printed (and written to --output) as JSON. With --compare, warm medians
+are checked against a previous result file and the script exits 1 when any command
+got slower than --threshold times its baseline. The cluster is removed at the end
+unless --keep is given. initdb/pg_ctl are taken from --pg-bin, `pg_config --bindir`
+or $PATH.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, ROOT)
+
+import asyncpg
+import psqlc
+
+DATABASE = "psqlc_bench"
+
+
+def cli_commands(backup_dir: str) -> list:
+    """(label, argv) pairs timed through the CLI"""
+    return [
+        ("show dbs", ["show", "dbs"]),
+        ("show tables", ["show", "tables", "-d", DATABASE]),
+        ("show tables --sort size", ["show", "tables", "-d", DATABASE, "--sort", "size"]),
+        ("show indexes", ["show", "indexes", "-d", DATABASE]),
+        ("show size", ["show", "size"]),
+        ("show size -d", ["show", "size", "-d", DATABASE]),
+        ("show connections", ["show", "connections"]),
+        ("show users", ["show", "users"]),
+        ("describe", ["describe", "-d", DATABASE, "-t", "tenant_0.t_0"]),
+        ("query (table, 100 rows)", ["query", "-d", DATABASE, "-q", "SELECT * FROM tenant_0.t_0"]),
+        ("query --no-limit", ["query", "-d", DATABASE, "--no-limit", "-q", "SELECT * FROM tenant_0.t_0"]),
+        ("query --format csv", ["query", "-d", DATABASE, "--format", "csv", "-o", os.devnull, "-q", "SELECT * FROM tenant_0.t_0"]),
+        ("backup --run (plain)", ["backup", "-d", DATABASE, "--run", "-o", os.path.join(backup_dir, "plain.sql")]),
+        ("backup --engine psqlc", ["backup", "-d", DATABASE, "--engine", "psqlc", "--compress", "gzip", "-o", os.path.join(backup_dir, "archive")]),
+    ]
+
+
+def find_pg_bin(explicit: str = None) -> str:
+    if explicit:
+        return explicit
+    pg_config = shutil.which("pg_config")
+    if pg_config:
+        bindir = subprocess.run([pg_config, "--bindir"], capture_output=True, text=True).stdout.strip()
+        if os.path.exists(os.path.join(bindir, "initdb")):
+            return bindir
+    initdb = shutil.which("initdb")
+    if not initdb:
+        sys.exit("initdb not found: pass --pg-bin or put the PostgreSQL binaries on $PATH")
+    return os.path.dirname(initdb)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_cluster(pg_bin: str, workdir: str, port: int) -> str:
+    data = os.path.join(workdir, "data")
+    subprocess.run([os.path.join(pg_bin, "initdb"), "-D", data, "-U", "postgres", "-A", "trust", "--no-sync"],
+                   check=True, stdout=subprocess.DEVNULL)
+    options = f"-p {port} -k {workdir} -c listen_addresses=127.0.0.1 -c fsync=off -c synchronous_commit=off -c full_page_writes=off"
+    subprocess.run([os.path.join(pg_bin, "pg_ctl"), "-D", data, "-o", options, "-l", os.path.join(workdir, "server.log"), "-w", "start"],
+                   check=True, stdout=subprocess.DEVNULL)
+    return data
+
+
+def stop_cluster(pg_bin: str, data: str):
+    subprocess.run([os.path.join(pg_bin, "pg_ctl"), "-D", data, "-m", "immediate", "stop"],
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+async def seed(port: int, tables: int, schemas: int, data_tables: int, rows: int, batch: int = 200):
+    admin = await asyncpg.connect(host="127.0.0.1", port=port, user="postgres", database="postgres")
+    await admin.execute(f"CREATE DATABASE {DATABASE}")
+    await admin.close()
+
+    conn = await asyncpg.connect(host="127.0.0.1", port=port, user="postgres", database=DATABASE)
+    try:
+        for s in range(schemas):
+            await conn.execute(f"CREATE SCHEMA tenant_{s}")
+        for start in range(0, tables, batch):
+            statements = []
+            for i in range(start, min(start + batch, tables)):
+                name = f"tenant_{i % schemas}.t_{i}"
+                statements.append(f"CREATE TABLE {name} (id bigint PRIMARY KEY, name varchar(64) NOT NULL, "
+                                  f"created timestamptz DEFAULT now(), payload jsonb, CHECK (id >= 0))")
+                statements.append(f"CREATE INDEX ON {name} (created)")
+            await conn.execute(";".join(statements))
+        for i in range(min(data_tables, tables)):
+            await conn.execute(f"""
+                INSERT INTO tenant_{i % schemas}.t_{i} (id, name, payload)
+                SELECT g, 'row ' || g, jsonb_build_object('n', g) FROM generate_series(1, $1) g
+            """, rows)
+        await conn.execute("ANALYZE")
+    finally:
+        await conn.close()
+
+
+def run_cli(argv: list, env: dict, cwd: str) -> tuple:
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, os.path.join(ROOT, "psqlc.py"), *argv], cwd=cwd, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return time.perf_counter() - started, result.returncode, result.stderr[-500:]
+
+
+def time_cli(port: int, workdir: str, repeat: int) -> list:
+    cwd = os.path.join(workdir, "project")
+    backup_dir = os.path.join(workdir, "backups")
+    cache = os.path.join(workdir, "cache")
+    os.makedirs(cwd, exist_ok=True)
+    with open(os.path.join(cwd, ".env"), "w") as f:
+        f.write(f"ENGINE=postgresql\nHOST=127.0.0.1\nPORT={port}\nUSER=postgres\nPASSWORD=\nNAME={DATABASE}\n")
+
+    env = dict(os.environ, HOST="127.0.0.1", PORT=str(port), USER="postgres", XDG_CACHE_HOME=cache,
+               PSQLC_NO_DAEMON="1", PAGER="cat", COLUMNS="200")
+    for key in ("PASSWORD", "DATABASE", "DB_NAME", "DB", "PSQLC_NO_CACHE", "DEBUG"):
+        env.pop(key, None)
+
+    # byte-compile once so "cold" measures psqlc, not the compiler
+    subprocess.run([sys.executable, "-m", "compileall", "-q", os.path.join(ROOT, "psqlc.py")], check=False)
+
+    results = []
+    for label, argv in cli_commands(backup_dir):
+        shutil.rmtree(cache, ignore_errors=True)
+        shutil.rmtree(backup_dir, ignore_errors=True)
+        os.makedirs(backup_dir)
+        cold, code, err = run_cli(argv, env, cwd)
+        warm = []
+        for _ in range(repeat):
+            shutil.rmtree(backup_dir, ignore_errors=True)
+            os.makedirs(backup_dir)
+            elapsed, code, err = run_cli(argv, env, cwd)
+            warm.append(elapsed)
+        warm.sort()
+        entry = {"command": label, "cold_ms": round(cold * 1000, 1),
+                 "warm_median_ms": round(warm[len(warm) // 2] * 1000, 1) if warm else None,
+                 "warm_min_ms": round(warm[0] * 1000, 1) if warm else None,
+                 "exit_code": code}
+        if code:
+            entry["stderr"] = err
+        results.append(entry)
+        print(f"{label:28s} cold {entry['cold_ms']:8.1f} ms   warm {entry['warm_median_ms']} ms", file=sys.stderr)
+    return results
+
+
+async def time_fetches(port: int, workdir: str, repeat: int) -> list:
+    """Time the catalog queries behind the show commands without process start-up or rendering"""
+    os.environ["XDG_CACHE_HOME"] = os.path.join(workdir, "cache-inprocess")
+    conn = await asyncpg.connect(host="127.0.0.1", port=port, user="postgres", database=DATABASE)
+    fetches = [
+        ("fetch_databases", lambda: psqlc.fetch_databases(conn)),
+        ("fetch_tables_page name", lambda: psqlc.fetch_tables_page(conn, limit=1000)),
+        ("fetch_tables_page size", lambda: psqlc.fetch_tables_page(conn, sort="size", limit=1000)),
+        ("fetch_indexes", lambda: psqlc.fetch_indexes(conn)),
+        ("fetch_indexes table", lambda: psqlc.fetch_indexes(conn, "tenant_0.t_0")),
+        ("fetch_table_columns", lambda: psqlc.fetch_table_columns(conn, "tenant_0.t_0")),
+        ("fetch_table_sizes", lambda: psqlc.fetch_table_sizes(conn)),
+        ("fetch_database_sizes", lambda: psqlc.fetch_database_sizes(conn)),
+        ("fetch_connections", lambda: psqlc.fetch_connections(conn)),
+        ("fetch_limited 100", lambda: psqlc.fetch_limited(conn, "SELECT * FROM tenant_0.t_0", limit=100)),
+    ]
+    results = []
+    try:
+        for label, factory in fetches:
+            started = time.perf_counter()
+            await factory()
+            cold = time.perf_counter() - started
+            warm = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                await factory()
+                warm.append(time.perf_counter() - started)
+            warm.sort()
+            results.append({"function": label, "cold_ms": round(cold * 1000, 2),
+                            "warm_median_ms": round(warm[len(warm) // 2] * 1000, 2) if warm else None})
+    finally:
+        await conn.close()
+    return results
+
+
+def compare(report: dict, baseline_path: str, threshold: float) -> list:
+    """Return the entries whose warm median grew beyond `threshold` x the baseline"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = []
+    for section, key in (("cli", "command"), ("fetch", "function")):
+        before = {item[key]: item for item in baseline.get(section, [])}
+        for item in report.get(section, []):
+            old = before.get(item[key])
+            if not old or not old.get("warm_median_ms") or not item.get("warm_median_ms"):
+                continue
+            ratio = item["warm_median_ms"] / old["warm_median_ms"]
+            if ratio > threshold:
+                regressions.append({"section": section, "name": item[key], "baseline_ms": old["warm_median_ms"],
+                                    "current_ms": item["warm_median_ms"], "ratio": round(ratio, 2)})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pg-bin", help="Directory with initdb and pg_ctl")
+    parser.add_argument("--tables", type=int, default=2000)
+    parser.add_argument("--schemas", type=int, default=10)
+    parser.add_argument("--data-tables", type=int, default=5, help="Tables that get --rows rows (default: 5)")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5, help="Warm runs per command (default: 5)")
+    parser.add_argument("--skip-cli", action="store_true", help="Only time the in-process fetch functions")
+    parser.add_argument("-o", "--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Previous JSON report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed slowdown ratio for --compare (default: 1.25)")
+    parser.add_argument("--keep", action="store_true", help="Keep the cluster directory and leave the server running")
+    args = parser.parse_args()
+
+    pg_bin = find_pg_bin(args.pg_bin)
+    workdir = tempfile.mkdtemp(prefix="psqlc-bench-")
+    port = free_port()
+    data = start_cluster(pg_bin, workdir, port)
+    print(f"cluster at {workdir} on port {port}", file=sys.stderr)
+
+    try:
+        started = time.perf_counter()
+        asyncio.run(seed(port, args.tables, args.schemas, args.data_tables, args.rows))
+        seeded = time.perf_counter() - started
+        print(f"seeded {args.tables} tables in {seeded:.1f}s", file=sys.stderr)
+
+        version = subprocess.run([os.path.join(pg_bin, "pg_ctl"), "--version"], capture_output=True, text=True).stdout.strip()
+        report = {
+            "meta": {"postgres": version, "python": sys.version.split()[0], "psqlc": psqlc.get_version(),
+                     "tables": args.tables, "schemas": args.schemas, "data_tables": args.data_tables,
+                     "rows": args.rows, "repeat": args.repeat, "seed_s": round(seeded, 1),
+                     "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")},
+            "fetch": asyncio.run(time_fetches(port, workdir, args.repeat)),
+        }
+        if not args.skip_cli:
+            report["cli"] = time_cli(port, workdir, args.repeat)
+
+        regressions = compare(report, args.compare, args.threshold) if args.compare else []
+        if args.compare:
+            report["regressions"] = regressions
+
+        text = json.dumps(report, indent=2)
+        print(text)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(text + "\n")
+    finally:
+        if not args.keep:
+            stop_cluster(pg_bin, data)
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# Description: Track psqlc cold-start time (`import psqlc`, `psqlc --version`, `psqlc --help`) against a target
+# License: MIT
+
+"""
+Usage:
+
+    python benchmarks/bench_startup.py --runs 20 --target-ms 60
+
+Runs each command --runs times in a fresh interpreter and reports the median wall
+time, the interpreter's own startup (`python -c pass`) for reference, and the ten
+most expensive imports from `python -X importtime -c "import psqlc"`.
+Exits with status 1 when `--version` misses --target-ms, so it can gate CI.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BOOT = f"import sys; sys.path.insert(0, {ROOT!r}); "
+
+COMMANDS = {
+    "python -c pass": "pass",
+    "import psqlc": BOOT + "import psqlc",
+    "psqlc --version": BOOT + "sys.argv = ['psqlc', '--version']; import psqlc; psqlc.main()",
+    "psqlc --help": BOOT + "sys.argv = ['psqlc', '--help']; import psqlc; psqlc.main()",
+}
+
+
+def median_ms(code: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def top_imports(limit: int = 10) -> list:
+    """Parse `-X importtime` output for `import psqlc` and return the most expensive top-level imports"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", BOOT + "import psqlc"],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        # "import time: <self us> | <cumulative us> | <indent><module>"
+        _, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not cumulative_us.strip().isdigit():
+            continue
+        imports.append({"module": name.strip(), "cumulative_ms": int(cumulative_us) / 1000,
+                        "depth": (len(name) - len(name.lstrip())) // 2})
+    top = [item for item in imports if item["depth"] <= 1]
+    top.sort(key=lambda item: item["cumulative_ms"], reverse=True)
+    return [{"module": item["module"], "cumulative_ms": round(item["cumulative_ms"], 2)} for item in top[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--target-ms", type=float, default=60.0, help="Budget for `psqlc --version` (default: 60)")
+    args = parser.parse_args()
+
+    subprocess.run([sys.executable, "-m", "compileall", "-q", os.path.join(ROOT, "psqlc.py")], check=False)
+
+    results = {label: round(median_ms(code, args.runs), 1) for label, code in COMMANDS.items()}
+    report = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "median_ms": results,
+        "target_ms": args.target_ms,
+        "version_within_target": results["psqlc --version"] <= args.target_ms,
+        "top_imports": top_imports(),
+    }
+    print(json.dumps(report, indent=2))
+    sys.exit(0 if report["version_within_target"] else 1)
+
+
+if __name__ == "__main__":
+    main()
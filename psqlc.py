@@ -4,13 +4,37 @@
 # Description: PostgreSQL management CLI tool with asyncpg
 # License: MIT
 
+from __future__ import annotations
+
 import sys
 import os
-import asyncio
-from typing import Optional, Dict, Any
-from urllib.parse import urlparse
+import time
+
+# typing costs more than the rest of the module import; annotations are not evaluated at runtime
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, Dict, Any, List, Tuple
+
+
+class _LazyModule:
+    """Stand-in for a module that is imported on first attribute access.
+
+    asyncio alone is most of psqlc's import time, and `--version`/`--help` never touch it.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+
+    def __getattr__(self, attr):
+        import importlib
+        module = importlib.import_module(self._name)
+        globals()[self._name] = module
+        return getattr(module, attr)
 
-if len(sys.argv) > 1 and any('--debug' == arg or '-d' == arg for arg in sys.argv):
+
+asyncio = _LazyModule("asyncio")
+
+if len(sys.argv) > 1 and '--debug' in sys.argv:
     print("🐞 Debug mode enabled")
     os.environ["DEBUG"] = "1"
     os.environ['LOGGING'] = "1"
@@ -67,12 +91,388 @@ def get_logger(name: str = 'psqlc', level: int = None, prefer_rich: bool = True,
     _logging.basicConfig(level=level)
     return _logging.getLogger(name)
 
+def _logging_enabled() -> bool:
+    return not os.getenv('NO_LOGGING') or str(os.getenv("DEBUG", "")).lower() in ("1", "true", "yes")
+
+
+def _log_noop(*args, **kwargs):
+    pass
+
+
+class _LazyLogger:
+    """Module logger created on first real use.
+
+    Chatter levels are dropped while logging is off (NO_LOGGING without DEBUG) without
+    importing a logging backend at all; everything else goes to get_logger()'s logger.
+    """
+    _CHATTER = ('debug', 'info', 'notice')
+
+    def __init__(self, name: str):
+        self._name = name
+        self._logger = None
+
+    def __getattr__(self, attr):
+        if attr in self._CHATTER and not _logging_enabled():
+            return _log_noop
+        if self._logger is None:
+            self._logger = get_logger(self._name)
+        return getattr(self._logger, attr)
+
+
 # create module-level logger (can be re-created later by calling get_logger)
-logger = get_logger(__name__)
+logger = _LazyLogger(__name__)
 
 HOST = "127.0.0.1"
 DEFAULT_PORT = 5432
 _settings_cache = None
+# send status messages to stderr when stdout carries data (export/stream modes)
+STATUS_TO_STDERR = False
+# import settings.py when static parsing cannot resolve DATABASES; --exec-settings / $PSQLC_EXEC_SETTINGS
+EXEC_SETTINGS = str(os.getenv("PSQLC_EXEC_SETTINGS", "")).lower() in ("1", "true", "yes")
+
+# ============================================================================
+# TIMINGS (--timings / $PSQLC_TIMINGS)
+# ============================================================================
+
+class _Phase:
+    __slots__ = ("timings", "name", "started", "children")
+
+    def __init__(self, timings, name: str):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.children = 0.0
+        self.timings._stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        stack = self.timings._stack
+        stack.remove(self)
+        if stack:
+            stack[-1].children += elapsed
+        total = self.timings.phases.setdefault(self.name, [0.0, 0])
+        total[0] += elapsed - self.children
+        total[1] += 1
+        return False
+
+
+class _NoPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class PhaseTimings:
+    """Wall time per phase (exclusive of nested phases) plus rows and bytes received.
+
+    Phases are opened with `with TIMINGS.phase("connect"):`; when timings are off this is a no-op.
+    Time not covered by any phase is reported as "other".
+    """
+    ORDER = ("import", "parse args", "discovery", "dns", "connect", "query", "render")
+
+    def __init__(self):
+        self.enabled = False
+        self.format = "text"
+        self.started = time.perf_counter()
+        self.phases = {}
+        self.counters = {"queries": 0, "rows": 0, "bytes_received": 0}
+        self._stack = []
+        self._idle = _NoPhase()
+
+    def enable(self, fmt: str = "text"):
+        self.enabled = True
+        self.format = "json" if str(fmt).lower() == "json" else "text"
+
+    def phase(self, name: str):
+        return _Phase(self, name) if self.enabled else self._idle
+
+    def add(self, name: str, seconds: float):
+        """Book a span measured elsewhere (e.g. module import before timings were enabled)"""
+        total = self.phases.setdefault(name, [0.0, 0])
+        total[0] += seconds
+        total[1] += 1
+
+    def count(self, **counters):
+        if self.enabled:
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + (value or 0)
+
+    def summary(self) -> Dict[str, Any]:
+        total = time.perf_counter() - self.started
+        names = [name for name in self.ORDER if name in self.phases] + sorted(set(self.phases) - set(self.ORDER))
+        phases = {name: {"ms": round(self.phases[name][0] * 1000, 2), "calls": self.phases[name][1]} for name in names}
+        covered = sum(self.phases[name][0] for name in names)
+        phases["other"] = {"ms": round(max(total - covered, 0.0) * 1000, 2), "calls": 1}
+        return {"total_ms": round(total * 1000, 2), "phases": phases, **self.counters}
+
+    def report(self):
+        """Print the breakdown to stderr (stdout may carry query output)"""
+        summary = self.summary()
+        if self.format == "json":
+            import json
+            sys.stderr.write(json.dumps(summary) + "\n")
+            return
+
+        from rich.console import Console
+        from rich.table import Table
+
+        total = summary["total_ms"] or 1
+        table = Table(title="⏱  psqlc timings", show_header=True, header_style="bold magenta")
+        table.add_column("Phase", style="cyan")
+        table.add_column("ms", style="green", justify="right")
+        table.add_column("%", style="yellow", justify="right")
+        table.add_column("Calls", style="blue", justify="right")
+        for name, item in summary["phases"].items():
+            table.add_row(name, f"{item['ms']:.2f}", f"{item['ms'] / total * 100:.1f}", str(item["calls"]))
+        table.add_row("total", f"{summary['total_ms']:.2f}", "100.0", "-", style="bold")
+        console = Console(stderr=True)
+        console.print(table)
+        console.print(f"[bold #00CED1]{summary['queries']}[/] queries, [bold #00CED1]{summary['rows']:,}[/] rows, "
+                      f"[bold #00CED1]{format_bytes(summary['bytes_received'])}[/] received")
+
+
+TIMINGS = PhaseTimings()
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class _CountingProtocol:
+    """Protocol shim between an asyncpg connection's transport and its protocol that counts bytes received"""
+
+    def __init__(self, inner):
+        self._inner = inner
+
+    def data_received(self, data):
+        TIMINGS.counters["bytes_received"] += len(data)
+        self._inner.data_received(data)
+
+    def __getattr__(self, name):
+        return getattr(self._inner, name)
+
+
+async def _timed_rows(iterable):
+    """Iterate an async cursor, booking fetch time as "query" and counting rows"""
+    TIMINGS.count(queries=1)
+    iterator = iterable.__aiter__()
+    while True:
+        with TIMINGS.phase("query"):
+            try:
+                row = await iterator.__anext__()
+            except StopAsyncIteration:
+                break
+        TIMINGS.counters["rows"] += 1
+        yield row
+
+
+class TimedConnection:
+    """Connection wrapper used with --timings: statement time goes to the "query" phase, rows are counted"""
+    _TIMED = ("fetch", "fetchrow", "fetchval", "execute", "executemany", "fetch_limited",
+              "copy_from_query", "copy_from_table", "copy_to_table", "copy_records_to_table")
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, *args, **kwargs):
+        return _timed_rows(self._conn.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        attr = getattr(self._conn, name)
+        if name not in self._TIMED:
+            return attr
+
+        async def timed(*args, **kwargs):
+            with TIMINGS.phase("query"):
+                result = await attr(*args, **kwargs)
+            if isinstance(result, list):
+                rows = len(result)
+            elif isinstance(result, str) and result.startswith("COPY "):
+                rows = int(result.split()[-1])
+            else:
+                rows = 0 if result is None or isinstance(result, str) else 1
+            TIMINGS.count(queries=1, rows=rows)
+            return result
+        return timed
+
+
+def instrument_connection(conn):
+    """Wrap `conn` for --timings; returns it unchanged when timings are off"""
+    if not TIMINGS.enabled or conn is None:
+        return conn
+    transport = getattr(conn, "_transport", None)
+    if transport is not None and hasattr(transport, "set_protocol"):
+        try:
+            transport.set_protocol(_CountingProtocol(transport.get_protocol()))
+        except Exception as e:
+            logger.debug(f"cannot count bytes received: {e}")
+    return TimedConnection(conn)
+
+
+def print_table(table):
+    """Render a rich Table to stdout, booked as the "render" phase.
+
+    With --plain/--tsv the cells are written by PlainWriter instead, and output
+    taller than an interactive terminal goes through $PAGER.
+    """
+    import shutil
+    rows = getattr(table, "row_count", 0)
+    tall = rows + 6 > shutil.get_terminal_size().lines
+    with TIMINGS.phase("render"):
+        if PLAIN_OUTPUT and hasattr(table, "columns"):
+            with PagedOutput(enabled=tall) as out:
+                print_plain_table(table, PLAIN_OUTPUT, out)
+            return
+        from rich.console import Console
+        console = Console()
+        if tall and console.is_terminal:
+            with PagedOutput() as out:
+                Console(file=out, force_terminal=True, width=console.width).print(table)
+        else:
+            console.print(table)
+
+
+# ============================================================================
+# PLAIN OUTPUT (--plain / --tsv / $PAGER)
+# ============================================================================
+
+# rich measures every cell before printing anything; larger results use PlainWriter
+RICH_MAX_ROWS = 1000
+# rows the aligned writer buffers to size its columns before it starts streaming
+PLAIN_SAMPLE_ROWS = 200
+# None (rich tables), "aligned" or "tsv"; set from --plain/--tsv
+PLAIN_OUTPUT = None
+# cleared by --no-pager
+USE_PAGER = True
+
+_PLAIN_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def plain_value(value) -> str:
+    """Cell text for plain output: NULL for None, tabs and newlines escaped as in COPY text format"""
+    if value is None:
+        return "NULL"
+    return str(value).translate(_PLAIN_ESCAPES)
+
+
+class PlainWriter:
+    """Write rows as they arrive, as "tsv" (tab-separated) or "aligned" (space-padded columns).
+
+    Nothing is printed until the first row. The aligned writer sizes its columns
+    from the first PLAIN_SAMPLE_ROWS rows and then streams; a longer value further
+    down only shifts the rest of its own line. Numeric columns are right-aligned.
+    """
+
+    def __init__(self, columns, mode: str = "aligned", out=None, right: list = None):
+        self.columns = [str(c) for c in columns]
+        self.mode = mode
+        self.out = out if out is not None else sys.stdout
+        self.right = right
+        self.rows = 0
+        self._sample = []
+        self._widths = None
+
+    def write(self, values):
+        values = tuple(values)
+        cells = [plain_value(v) for v in values]
+        self.rows += 1
+        if self.mode == "tsv":
+            if self.rows == 1:
+                self.out.write("\t".join(self.columns) + "\n")
+            self.out.write("\t".join(cells) + "\n")
+        elif self._widths is None:
+            self._sample.append((cells, values))
+            if len(self._sample) >= PLAIN_SAMPLE_ROWS:
+                self._start()
+        else:
+            self._line(cells)
+
+    def _start(self):
+        widths = [len(c) for c in self.columns]
+        for cells, _ in self._sample:
+            for i, cell in enumerate(cells):
+                if len(cell) > widths[i]:
+                    widths[i] = len(cell)
+        if self.right is None:
+            from decimal import Decimal
+            self.right = []
+            for i in range(len(self.columns)):
+                present = [values[i] for _, values in self._sample if values[i] is not None]
+                self.right.append(bool(present) and all(
+                    isinstance(v, (int, float, Decimal)) and not isinstance(v, bool) for v in present))
+        self._widths = widths
+        self._line(self.columns)
+        self.out.write("  ".join("-" * w for w in widths) + "\n")
+        for cells, _ in self._sample:
+            self._line(cells)
+        self._sample = []
+
+    def _line(self, cells):
+        padded = [cell.rjust(w) if right else cell.ljust(w)
+                  for cell, w, right in zip(cells, self._widths, self.right)]
+        self.out.write("  ".join(padded).rstrip() + "\n")
+
+    def close(self) -> int:
+        """Flush buffered rows; returns the number of rows written"""
+        if self.mode == "aligned" and self._widths is None and self._sample:
+            self._start()
+        self.out.flush()
+        return self.rows
+
+
+def print_plain_table(table, mode: str, out=None) -> int:
+    """Write the cells of a rich Table through PlainWriter (title and styles are dropped)"""
+    columns = table.columns
+    writer = PlainWriter([c.header for c in columns], mode, out, right=[c.justify == "right" for c in columns])
+    for values in zip(*(c.cells for c in columns)):
+        writer.write(str(v) for v in values)
+    return writer.close()
+
+
+class PagedOutput:
+    """Context manager returning the stream to print to: $PAGER's stdin on an
+    interactive terminal, stdout otherwise. Quitting the pager early ends output quietly.
+
+    Like git, the pager defaults to `less` and LESS defaults to FRSX, so output that
+    fits on one screen is printed without stopping.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.pager = None
+
+    def __enter__(self):
+        command = os.environ.get("PAGER", "less")
+        if self.enabled and USE_PAGER and command.strip() and sys.stdout.isatty():
+            import shlex
+            import subprocess
+            env = dict(os.environ)
+            env.setdefault("LESS", "FRSX")
+            try:
+                self.pager = subprocess.Popen(shlex.split(command), stdin=subprocess.PIPE, env=env,
+                                              text=True, errors="replace")
+            except OSError as e:
+                logger.debug(f"cannot start pager {command!r}: {e}")
+        return self.pager.stdin if self.pager else sys.stdout
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.pager is None:
+            return False
+        try:
+            self.pager.stdin.close()
+        except BrokenPipeError:
+            pass
+        self.pager.wait()
+        return exc_type is BrokenPipeError
+
 
 # ============================================================================
 # UTILITY FUNCTIONS
@@ -89,7 +489,7 @@ def rich_print(msg: str, color: str = "#FFFFFF", bgcolor: str = None, bold: bool
     from rich.style import Style
     from rich.text import Text
     
-    console = Console()
+    console = Console(stderr=STATUS_TO_STDERR)
     style_kwargs = {"color": color, "bold": bold}
     if bgcolor:
         style_kwargs["bgcolor"] = bgcolor
@@ -136,12 +536,150 @@ def find_settings_recursive1(start_path: str = None, max_depth: int = 5, filenam
     
     return search_directory(start_path)
 
+CONFIG_CANDIDATES = ('settings.py', 'config.json', '.env', '.json', '.yaml')
+ENV_CANDIDATES = ('.env', '.json', '.yaml')
+DISCOVERY_EXCLUDES = {'node_modules', 'venv', '__pycache__', '.git'}
+DISCOVERY_IGNORE_FILES = ('.gitignore', '.psqlcignore')
+DISCOVERY_MAX_FILES = 50000
+DISCOVERY_TIME_BUDGET = 2.0
+
+
+def _read_ignore_rules(directory: str) -> List[tuple]:
+    """Read .gitignore-style rules from `directory` as (base, pattern, dir_only) tuples.
+
+    Negated patterns ("!foo") are not supported and are skipped.
+    """
+    rules = []
+    for ignore_file in DISCOVERY_IGNORE_FILES:
+        try:
+            with open(os.path.join(directory, ignore_file), 'r', encoding='utf-8', errors='ignore') as f:
+                lines = f.read().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#') or line.startswith('!'):
+                continue
+            dir_only = line.endswith('/')
+            pattern = line.strip('/')
+            if pattern:
+                rules.append((directory, pattern, dir_only))
+    return rules
+
+
+def _is_ignored_dir(path: str, name: str, rules: List[tuple]) -> bool:
+    """Return True when a directory is excluded by the built-in list or inherited ignore rules"""
+    from fnmatch import fnmatch
+
+    if name in DISCOVERY_EXCLUDES or '-env' in name:
+        return True
+    for base, pattern, _dir_only in rules:
+        if '/' in pattern:
+            rel = os.path.relpath(path, base).replace(os.sep, '/')
+            if fnmatch(rel, pattern):
+                return True
+        elif fnmatch(name, pattern):
+            return True
+    return False
+
+
+def discover_config_files(
+    start_path: str = None,
+    max_depth_up: int = 0,
+    max_depth_down: int = 5,
+    filenames: tuple = CONFIG_CANDIDATES,
+    max_files: int = None,
+    time_budget: float = None,
+    visited: Optional[List[str]] = None
+) -> List[str]:
+    """Find config files in a single breadth-first `os.scandir` walk.
+
+    All `filenames` are matched in the same pass, and the result lists the
+    shallowest match of each name in the order of `filenames` (priority order).
+    The subtree of `start_path` is scanned first; with `max_depth_up` each
+    ancestor's subtree is scanned next, skipping the child already covered.
+    Directories listed in .gitignore/.psqlcignore are pruned (ignore rules
+    never hide the candidate files themselves, since `.env` is usually ignored).
+    The walk stops once the highest-priority name is found or when `max_files`
+    entries or `time_budget` seconds are spent. Scanned directories are
+    appended to `visited` when a list is given.
+    """
+    import time
+    from collections import deque
+
+    max_depth_up = int(max_depth_up or 0)
+    max_depth_down = int(max_depth_down or 0)
+    if max_files is None:
+        max_files = int(os.getenv('PSQLC_DISCOVERY_MAX_FILES') or DISCOVERY_MAX_FILES)
+    if time_budget is None:
+        time_budget = float(os.getenv('PSQLC_DISCOVERY_TIMEOUT') or DISCOVERY_TIME_BUDGET)
+
+    start_path = os.path.realpath(start_path or os.getcwd())
+    wanted = set(filenames)
+    found = {}
+    deadline = time.monotonic() + time_budget
+    scanned = 0
+
+    def walk(root: str, skip: Optional[str] = None) -> bool:
+        """Scan one subtree; return True when the walk should stop"""
+        nonlocal scanned
+        queue = deque([(root, 0, [])])
+        while queue:
+            path, depth, rules = queue.popleft()
+            try:
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            if visited is not None:
+                visited.append(path)
+            if any(entry.name in DISCOVERY_IGNORE_FILES for entry in entries):
+                rules = rules + _read_ignore_rules(path)
+
+            subdirs = []
+            for entry in entries:
+                scanned += 1
+                if entry.name in wanted and entry.name not in found:
+                    try:
+                        if entry.is_file():
+                            found[entry.name] = entry.path
+                    except OSError:
+                        pass
+                elif depth < max_depth_down and entry.path != skip:
+                    try:
+                        if entry.is_dir(follow_symlinks=False) and not _is_ignored_dir(entry.path, entry.name, rules):
+                            subdirs.append(entry)
+                    except OSError:
+                        pass
+
+            if filenames[0] in found:
+                return True
+            if scanned >= max_files or time.monotonic() > deadline:
+                logger.debug(f"config discovery budget exhausted after {scanned} entries")
+                return True
+
+            for entry in subdirs:
+                queue.append((entry.path, depth + 1, rules))
+        return False
+
+    stop = walk(start_path)
+
+    if not stop and max_depth_up > 0:
+        previous, current = start_path, os.path.dirname(start_path)
+        depth = 0
+        while current != previous and depth <= max_depth_up:
+            if walk(current, skip=previous):
+                break
+            previous, current = current, os.path.dirname(current)
+            depth += 1
+
+    return [found[name] for name in filenames if name in found]
+
+
 def find_any_config(start_path: str = None, max_depth_up: int = 0, max_depth_down: str = 1) -> Optional[str]:
-    for ext in [".env", ".json", ".yaml"]:
-        path = find_settings_recursive(start_path, filename=ext, max_depth_up=max_depth_up, max_depth_down=max_depth_down)
-        if path:
-            return path
-    return None
+    """Return the first .env/.json/.yaml config found in a single walk"""
+    paths = discover_config_files(start_path, max_depth_up=max_depth_up, max_depth_down=max_depth_down, filenames=ENV_CANDIDATES)
+    return paths[0] if paths else None
 
 def find_settings_recursive(
     start_path: str = None,
@@ -152,63 +690,146 @@ def find_settings_recursive(
     """Search for a file by:
     1. Scanning downward from current dir (including all subdirs)
     2. If not found, go upward (parent, grandparent, ...) up to root,
-       and for *each* ancestor, scan its entire subtree downward.
+       and for *each* ancestor, scan its subtree downward.
     """
-    from pathlib import Path
+    paths = discover_config_files(start_path, max_depth_up=max_depth_up, max_depth_down=max_depth_down, filenames=(filename,))
+    return paths[0] if paths else None
 
-    logger.warning(f"max_depth_up: {max_depth_up}")
-    logger.warning(f"max_depth_down: {max_depth_down}")
-    logger.warning(f"start_path: {start_path}")
+def find_env_engine_config(max_depth_up: int = 0, max_depth_down: str = 1):
+    """Return (path, config) for the nearest .env/.json/.yaml declaring a PostgreSQL engine.
 
-    if start_path is None:
-        start_path = os.getcwd()
-    start_path = Path(start_path).resolve()
-    logger.warning(f"start_path: {start_path}")
+    `config` is empty when the file does not declare a PostgreSQL ENGINE/TYPE.
+    """
+    def resolve(visited: List[str]):
+        path = discover_config_files(max_depth_up=max_depth_up, max_depth_down=max_depth_down, filenames=ENV_CANDIDATES, visited=visited)
+        if not path:
+            return None, None
+        from envdot import load_env
+        config = ENV_DB_ALIASES.resolve(load_env(path[0]).as_dict(), path[0])
+        if is_pg_engine(config.pop("engine")):
+            del config["url"]
+            return path[0], config
+        return path[0], {}
 
-    # Helper: recursive downward search from a root dir
-    def search_down(root: Path, current_depth: int = 0) -> Optional[Path]:
-        if current_depth > max_depth_down:
-            return None
-        candidate = root / filename
-        if candidate.is_file():
-            return candidate
-        try:
-            for item in root.iterdir():
-                if item.is_dir() and item.name not in {'node_modules', 'venv', '__pycache__'} and '-env' not in item.name:
-                    result = search_down(item, current_depth + 1)
-                    if result:
-                        return result
-        except (PermissionError, OSError):
-            pass
+    with TIMINGS.phase("discovery"):
+        return cached_discovery('env', None, max_depth_up, max_depth_down, resolve)
+
+
+_discovery_memo = {}
+DISCOVERY_CACHE_MAX_ENTRIES = 64
+# bump when the shape of cached configs changes so older entries are ignored
+DISCOVERY_CACHE_VERSION = 2
+
+
+def _discovery_cache_file() -> str:
+    return os.path.join(get_cache_dir(), "discovery.json")
+
+
+def _load_discovery_cache() -> Dict[str, Any]:
+    import json
+    try:
+        with open(_discovery_cache_file(), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_discovery_cache(data: Dict[str, Any]):
+    import json
+    cache_file = _discovery_cache_file()
+    try:
+        os.makedirs(os.path.dirname(cache_file), mode=0o700, exist_ok=True)
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        logger.debug(f"could not write discovery cache: {e}")
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
         return None
 
-    # Step 1: Search downward from current directory
-    result = search_down(start_path)
-    logger.notice(f"search down result [0]: {result}")
-    if result:
-        return str(result)
-
-    # Step 2: Walk upward and search downward from each ancestor
-    if max_depth_up > 0:
-        current = start_path.parent
-        logger.debug(f"current: {current}")
-        logger.debug(f"current.parent: {current.parent}")    
-        depth = 0
-        while current != current.parent and depth <= max_depth_up:
-            result = search_down(current)
-            logger.notice(f"search down result [1]: {result}")
-            if result:
-                return str(result)
-            current = current.parent
-            depth += 1
 
-    return None
+def _discovery_entry_valid(entry: Dict[str, Any]) -> bool:
+    """An entry is valid while no visited directory, the chosen file, or a file or
+    environment variable its parse depended on (settings.py imports, .env) changed"""
+    for directory, mtime in entry.get("dirs", {}).items():
+        if _mtime_ns(directory) != mtime:
+            return False
+    if entry.get("path") and _mtime_ns(entry["path"]) != entry.get("file_mtime"):
+        return False
+    for path, mtime in entry.get("files", {}).items():
+        if _mtime_ns(path) != mtime:
+            return False
+    for name, value in entry.get("environ", {}).items():
+        if os.environ.get(name) != value:
+            return False
+    return True
+
+
+def cached_discovery(kind: str, settings_path: Optional[str], max_depth_up, max_depth_down, resolve):
+    """Return (path, config) from the on-disk discovery cache or by calling `resolve(visited)`.
+
+    Entries live in ~/.cache/psqlc/discovery.json, keyed by (kind, cwd,
+    settings_path, up/down levels), and are invalidated by the mtimes of the
+    directories the walk visited and of the chosen file, plus any extra files and
+    environment variables the parse reported via a "_depends" key (settings.py
+    star-imports, .env files, os.environ lookups). Negative results are
+    cached too. Set PSQLC_NO_CACHE=1 to bypass the on-disk cache.
+    """
+    import json
+    import time
+
+    key = json.dumps([DISCOVERY_CACHE_VERSION, kind, os.getcwd(), os.path.abspath(settings_path) if settings_path else None,
+                      int(max_depth_up or 0), int(max_depth_down or 0)])
+    if key in _discovery_memo:
+        return _discovery_memo[key]
+
+    use_disk = str(os.getenv("PSQLC_NO_CACHE", "")).lower() not in ("1", "true", "yes")
+    data = _load_discovery_cache() if use_disk else {}
+    entry = data.get(key)
+    if entry and _discovery_entry_valid(entry):
+        logger.debug(f"discovery cache hit: {entry.get('path')}")
+        result = (entry.get("path"), entry.get("config"))
+        if result[1]:
+            rich_print(f"📄 Found settings at: {result[0]} (cached)", color="#00CED1")
+        _discovery_memo[key] = result
+        return result
+
+    visited = []
+    path, config = resolve(visited)
+    depends = config.pop("_depends", None) if isinstance(config, dict) else None
+    result = (path, config)
+    _discovery_memo[key] = result
+
+    if use_disk:
+        data[key] = {
+            "path": path,
+            "config": config,
+            "file_mtime": _mtime_ns(path) if path else None,
+            "dirs": {directory: _mtime_ns(directory) for directory in visited},
+            "files": (depends or {}).get("files", {}),
+            "environ": (depends or {}).get("environ", {}),
+            "created": time.time(),
+        }
+        if len(data) > DISCOVERY_CACHE_MAX_ENTRIES:
+            for stale in sorted(data, key=lambda k: data[k].get("created", 0))[:len(data) - DISCOVERY_CACHE_MAX_ENTRIES]:
+                del data[stale]
+        _save_discovery_cache(data)
+    return result
 
 def parse_postgresql_url(connection_string):
     """
     Parse PostgreSQL connection URL and display its components
     """
     # Parse URLs using urllib.parse
+    from urllib.parse import urlparse
     parsed = urlparse(connection_string)
     
     # Extract components from URL
@@ -232,67 +853,59 @@ def parse_django_settings(settings_path: str = None, max_depth_up: int = 0, max_
     if _settings_cache is not None:
         return _settings_cache
     logger.debug(f"settings_path: {settings_path}")
-    try:
-        if settings_path is None:
-            current_settings = os.path.join(os.getcwd(), "settings.py")
-            if os.path.isfile(current_settings):
-                settings_path = current_settings
-            else:
-                settings_path = find_settings_recursive(max_depth_up=max_depth_up, max_depth_down=max_depth_down)
 
-        logger.debug(f"settings_path: {settings_path}")
+    def resolve(visited: List[str]):
+        path = settings_path
+        if path is None:
+            candidates = discover_config_files(max_depth_up=max_depth_up, max_depth_down=max_depth_down, visited=visited)
+            logger.debug(f"candidates: {candidates}")
+            path = candidates[0] if candidates else None
+        elif not os.path.isfile(path):
+            path = find_any_config(max_depth_up=max_depth_up, max_depth_down=max_depth_down)
+        if not path or not os.path.isfile(path):
+            return None, None
+        return path, parse_settings_file(path)
 
-        if settings_path is None:
-            current_settings = os.path.join(os.getcwd(), "config.json")
-            if os.path.isfile(current_settings):
-                settings_path = current_settings
-            else:
-                settings_path = find_settings_recursive(filename="config.json", max_depth_up=max_depth_up, max_depth_down=max_depth_down)
-        
-        logger.debug(f"settings_path: {settings_path}")
-        
-        if settings_path: logger.info(f"os.path.isfile(settings_path): {os.path.isfile(settings_path)}")
-
-        if not settings_path or not os.path.isfile(settings_path):
-            # for cf in [".env", ".json", ".yaml"]:
-            #     settings_path = find_settings_recursive(filename=cf)
-            #     logger.notice(f"settings_path: {settings_path}")
-            #     if settings_path:
-            #         break
-            settings_path = find_any_config(max_depth_up=max_depth_up, max_depth_down=max_depth_down)
-        
-        if not settings_path or not os.path.isfile(settings_path):
-            return None
-        
-        final_path = settings_path
-        logger.emergency(f"final_path: {final_path}")
-        logger.emergency(f"final_path is file: {os.path.isfile(final_path)}")
+    with TIMINGS.phase("discovery"):
+        _path, config = cached_discovery('settings+exec' if EXEC_SETTINGS else 'settings', settings_path, max_depth_up, max_depth_down, resolve)
+    if config:
+        _settings_cache = config
+    return config
+
+
+def parse_settings_file(final_path: str) -> Optional[Dict[str, Any]]:
+    """Extract PostgreSQL settings from a settings.py, .env, .json or .yaml file"""
+    global _settings_cache
+
+    try:
+        logger.debug(f"parsing settings from {final_path}")
 
-        logger.warning(f"CHECK [1]: {final_path.endswith('settings.py') or 'settings.py' in final_path}")
-        
         if final_path.endswith('settings.py') or 'settings.py' in final_path:
-            logger.alert(f"processsing 'settings.py' in final_path ...")
-            settings = load_settings_from_path(final_path)
-            logger.info(f"settings: {settings}")
-            databases_obj = getattr(settings, "DATABASES", None)
+            databases_obj, complete, depends = static_databases(final_path)
+            if not complete and EXEC_SETTINGS:
+                logger.notice(f"static parse of {final_path} incomplete, importing it (--exec-settings)")
+                settings = load_settings_from_path(final_path)
+                logger.info(f"settings: {settings}")
+                databases_obj, depends = getattr(settings, "DATABASES", None), None
+            elif databases_obj is None:
+                rich_print(f"⚠️ Could not read DATABASES from {final_path} without running it. "
+                           f"Use --exec-settings (or PSQLC_EXEC_SETTINGS=1) to import it", color="#FFFF00")
             logger.info(f"databases_obj: {databases_obj}")
             
             engine = None
 
             if databases_obj:
                 for db_key, cfg in databases_obj.items():
-                    if cfg.get("ENGINE") == "django.db.backends.postgresql" or cfg.get("ENGINE", '').lower() in ["postgresql", 'postgres', 'postgre'] or cfg.get("ENGINE") == ".postgresql":
-                        engine = cfg.get("ENGINE")
+                    if not isinstance(cfg, dict):
+                        continue
+                    config = DJANGO_DB_ALIASES.resolve(cfg, final_path, key_format=f"DATABASES[{db_key!r}][{{!r}}]")
+                    engine = config.pop("engine")
+                    if is_pg_engine(engine):
                         rich_print(f"📄 Found settings at: {final_path}", color="#00CED1")
-                        _settings_cache = {
-                            'username': cfg.get("USER") or cfg.get("USERNAME") or cfg.get("user") or cfg.get("username"),
-                            'password': cfg.get("PASSWORD") or cfg.get("PASS") or cfg.get("password") or cfg.get("pass"),
-                            'database': cfg.get("NAME") or cfg.get("DB") or cfg.get("DB_NAME") or cfg.get("DBNAME") or cfg.get("name") or cfg.get("db") or cfg.get("db_name") or cfg.get("dbname"),
-                            'host': cfg.get("HOST") or cfg.get("HOSTNAME") or cfg.get("SERVER") or cfg.get("host") or cfg.get("hostname") or cfg.get("server"),
-                            'port': cfg.get("PORT") or cfg.get("port")
-                        }
-                        # print(f"_settings_cache: {_settings_cache}")
+                        _settings_cache = config
                         logger.notice(f"[{final_path}] _settings_cache: {_settings_cache}")
+                        if depends:
+                            return dict(_settings_cache, _depends=depends)
                         return _settings_cache
             if engine != "django.db.backends.postgresql":
                 from rich.console import Console
@@ -305,211 +918,28 @@ def parse_django_settings(settings_path: str = None, max_depth_up: int = 0, max_
             logger.debug(f"processing '{final_path}' ...")
             from envdot import load_env
             cfg = load_env(final_path)
-
-            logger.notice(f"cfg: {cfg._data}")
-
-            logger.info(f"'database_url' in list(cfg.keys()) or  'DATABASE_URL' in list(cfg.keys()): {'database_url' in list(cfg.keys()) or  'DATABASE_URL' in list(cfg.keys())}")
+            config = ENV_DB_ALIASES.resolve(cfg.as_dict(), final_path)
+            logger.notice(f"config: {config}")
 
             try:
-                check_db_url = list(filter(lambda k: k in list(cfg.keys()), ['database_url', 'DATABASE_URL', 'database_uri', 'DATABASE_URI']))
-                logger.emergency(f"check_db_url: {check_db_url}")
-                if check_db_url:
-                    config_db = parse_postgresql_url(cfg.get(check_db_url[0]))
+                if config["url"]:
+                    config_db = parse_postgresql_url(config["url"])
                     logger.debug(f"config_db: {config_db}")
                     if config_db.get('host') and config_db.get('username') and config_db.get('database') and config_db.get('protocol') == 'postgresql':
+                        key = config["_sources"]["url"][0]
+                        config_db["_sources"] = {field: (key, final_path) for field in PARAM_FIELDS.values()}
                         logger.notice("return config_db")
                         return config_db
             except Exception as e:
                 logger.exception(e)
 
-            for key in ['engine', 'ENGINE', 'TYPE', 'type', 'db_type']:
-                if cfg.get(key, '').lower() in ["django.db.backends.postgresql", "postgresql", "psql", "postgres", "postgre"] or cfg.get("POSTGRESQL_PORT") or cfg.get("postgresql_port") or cfg.get("POSTGRES_PORT") or cfg.get("postgres_port") or cfg.get("POSTGRE_PORT") or cfg.get("postgre_port"):
-                    rich_print(f"📄 Found config at: {final_path}", color="#00CED1")
-                    engine = cfg.get("ENGINE")
-                    rich_print(f"📄 Found settings at: {final_path}", color="#00CED1")
-                    _settings_cache = {
-                        'username': cfg.get("POSTGRESQL_USERNAME") or \
-                                    cfg.get("POSTGRESQL_USER") or \
-                                    cfg.get("POSTGRES_USERNAME") or \
-                                    cfg.get("POSTGRES_USER") or \
-                                    cfg.get("POSTGRE_USERNAME") or \
-                                    cfg.get("POSTGRE_USER") or \
-                                    
-                                    cfg.get("postgresql_username") or \
-                                    cfg.get("postgresql_user") or \
-                                    cfg.get("postgres_username") or \
-                                    cfg.get("postgres_user") or \
-                                    cfg.get("postgre_username") or \
-                                    cfg.get("postgre_user") or \
-                                    
-                                    cfg.get("DB_USER") or \
-                                    cfg.get("DB_USERNAME") or \
-                                    cfg.get("db_user") or \
-                                    cfg.get("db_username") or \
-
-                                    cfg.get("USER") or \
-                                    cfg.get("USERNAME") or \
-                                    cfg.get("user") or \
-                                    cfg.get("username"),
-                        'password': cfg.get("POSTGRESQL_PASSWORD") or \
-                                    cfg.get("POSTGRESQL_PASS") or \
-                                    cfg.get("POSTGRES_PASSWORD") or \
-                                    cfg.get("POSTGRES_PASS") or \
-                                    cfg.get("POSTGRE_PASSWORD") or \
-                                    cfg.get("POSTGRE_PASS") or \
-                                    
-                                    cfg.get("postgresql_password") or \
-                                    cfg.get("postgresql_pass") or \
-                                    cfg.get("postgres_password") or \
-                                    cfg.get("postgres_pass") or \
-                                    cfg.get("postgre_password") or \
-                                    cfg.get("postgre_pass") or \
-                                    
-                                    cfg.get("PASSWORD") or \
-                                    cfg.get("PASS") or \
-                                    cfg.get("pass") or \
-                                    cfg.get("password") or \
-                                    cfg.get("db_password") or \
-                                    cfg.get("DB_PASSWORD") or \
-                                    cfg.get("DB_PASS") or \
-                                    cfg.get("db_pass"),
-                        'database': cfg.get("POSTGRESQL_DATABASE") or \
-                                    cfg.get("POSTGRESQL_DB_NAME") or \
-                                    cfg.get("POSTGRESQL_DBNAME") or \
-                                    cfg.get("POSTGRESQL_DB") or \
-                                    cfg.get("POSTGRESQL_NAME") or \
-                                    cfg.get("POSTGRES_DB_NAME") or \
-                                    cfg.get("POSTGRES_DBNAME") or \
-                                    cfg.get("POSTGRES_DB") or \
-                                    cfg.get("POSTGRES_NAME") or \
-                                    cfg.get("POSTGRE_DB_NAME") or \
-                                    cfg.get("POSTGRE_DBNAME") or \
-                                    cfg.get("POSTGRE_DB") or \
-                                    cfg.get("POSTGRE_NAME") or \
-                                    cfg.get("POSTGRE_DATABASE") or \
-                                    cfg.get("POSTGRES_DATABASE") or \
-
-                                    cfg.get("postgresql_database") or \
-                                    cfg.get("postgres_database") or \
-                                    cfg.get("postgre_database") or \
-                                    cfg.get("postgresql_db_name") or \
-                                    cfg.get("postgresql_dbname") or \
-                                    cfg.get("postgresql_db") or \
-                                    cfg.get("postgresql_name") or \
-                                    cfg.get("postgres_db_name") or \
-                                    cfg.get("postgres_dbname") or \
-                                    cfg.get("postgres_db") or \
-                                    cfg.get("postgres_name") or \
-                                    cfg.get("postgre_db_name") or \
-                                    cfg.get("postgre_dbname") or \
-                                    cfg.get("postgre_db") or \
-                                    cfg.get("postgre_name") or \
-
-                                    # cfg.get("NAME") or \
-                                    cfg.get("DB") or \
-                                    cfg.get("DB_NAME") or \
-                                    cfg.get("DBNAME") or \
-                                    # cfg.get("name") or \
-                                    cfg.get("db") or \
-                                    cfg.get("db_name") or \
-                                    cfg.get("dbname"),
-                        'host': cfg.get("POSTGRESQL_HOSTNAME") or \
-                                cfg.get("POSTGRESQL_HOST") or \
-                                cfg.get("POSTGRES_HOSTNAME") or \
-                                cfg.get("POSTGRES_HOST") or \
-                                cfg.get("POSTGRE_HOSTNAME") or \
-                                cfg.get("POSTGRE_HOST") or \
-
-                                cfg.get("postgresql_hostname") or \
-                                cfg.get("postgresql_host") or \
-                                cfg.get("postgres_hostname") or \
-                                cfg.get("postgres_host") or \
-                                cfg.get("postgre_hostname") or \
-                                cfg.get("postgre_host") or \
-                                
-                                cfg.get("db_host") or \
-                                cfg.get("DB_HOST") or \
-                                
-                                cfg.get("SERVER") or \
-                                cfg.get("host") or \
-                                cfg.get("hostname") or \
-                                cfg.get("server"),
-                        'port': cfg.get("POSTGRESQL_PORT") or \
-                                cfg.get("POSTGRES_PORT") or \
-                                cfg.get("POSTGRE_PORT") or \
-                                
-                                cfg.get("postgresql_port") or \
-                                cfg.get("postgres_port") or \
-                                cfg.get("postgre_port") or \
-                                
-                                cfg.get("db_port") or \
-                                cfg.get("DB_PORT") or \
-
-                                cfg.get("PORT") or \
-                                cfg.get("port")
-                    }
-                    # print(f"_settings_cache: {_settings_cache}")
-                    logger.notice(f"[{final_path}] _settings_cache: {_settings_cache}")
-                    
-                    logger.debug(f'POSTGRESQL_USERNAME = {cfg.get("POSTGRESQL_USERNAME")}')
-                    logger.debug(f'POSTGRESQL_USER = {cfg.get("POSTGRESQL_USER")}')
-                    logger.debug(f'POSTGRES_USERNAME = {cfg.get("POSTGRES_USERNAME")}')
-                    logger.debug(f'POSTGRES_USER = {cfg.get("POSTGRES_USER")}')
-                    logger.debug(f'POSTGRE_USERNAME = {cfg.get("POSTGRE_USERNAME")}')
-                    logger.debug(f'POSTGRE_USER = {cfg.get("POSTGRE_USER")}')
-                    logger.debug(f'postgresql_username = {cfg.get("postgresql_username")}')
-                    logger.debug(f'postgresql_user = {cfg.get("postgresql_user")}')
-                    logger.debug(f'postgres_username = {cfg.get("postgres_username")}')
-                    logger.debug(f'postgres_user = {cfg.get("postgres_user")}')
-                    logger.debug(f'postgre_username = {cfg.get("postgre_username")}')
-                    logger.debug(f'postgre_user = {cfg.get("postgre_user")}')
-                    logger.debug(f'DB_USER = {cfg.get("DB_USER")}')
-                    logger.debug(f'db_user = {cfg.get("db_user")}')
-                    logger.debug(f'USER = {cfg.get("USER")}')
-                    logger.debug(f'USERNAME = {cfg.get("USERNAME")}')
-                    logger.debug(f'user = {cfg.get("user")}')
-                    logger.debug(f'username = {cfg.get("username")}')
-                    
-                    logger.debug(f'cfg.get("POSTGRESQL_DATABASE") = {cfg.get("POSTGRESQL_DATABASE")}')
-                    logger.debug(f'cfg.get("POSTGRES_DATABASE") = {cfg.get("POSTGRES_DATABASE")}')
-                    logger.debug(f'cfg.get("POSTGRE_DATABASE") = {cfg.get("POSTGRE_DATABASE")}')
-                    logger.debug(f'cfg.get("POSTGRESQL_DB_NAME") = {cfg.get("POSTGRESQL_DB_NAME")}')
-                    logger.debug(f'cfg.get("POSTGRESQL_DBNAME") = {cfg.get("POSTGRESQL_DBNAME")}')
-                    logger.debug(f'cfg.get("POSTGRESQL_DB") = {cfg.get("POSTGRESQL_DB")}')
-                    logger.debug(f'cfg.get("POSTGRESQL_NAME") = {cfg.get("POSTGRESQL_NAME")}')
-                    logger.debug(f'cfg.get("POSTGRES_DB_NAME") = {cfg.get("POSTGRES_DB_NAME")}')
-                    logger.debug(f'cfg.get("POSTGRES_DBNAME") = {cfg.get("POSTGRES_DBNAME")}')
-                    logger.debug(f'cfg.get("POSTGRES_DB") = {cfg.get("POSTGRES_DB")}')
-                    logger.debug(f'cfg.get("POSTGRES_NAME") = {cfg.get("POSTGRES_NAME")}')
-                    logger.debug(f'cfg.get("POSTGRE_DB_NAME") = {cfg.get("POSTGRE_DB_NAME")}')
-                    logger.debug(f'cfg.get("POSTGRE_DBNAME") = {cfg.get("POSTGRE_DBNAME")}')
-                    logger.debug(f'cfg.get("POSTGRE_DB") = {cfg.get("POSTGRE_DB")}')
-                    logger.debug(f'cfg.get("POSTGRE_NAME") = {cfg.get("POSTGRE_NAME")}')
-
-                    logger.debug(f'cfg.get("postgresql_database") = {cfg.get("postgresql_database")}')
-                    logger.debug(f'cfg.get("postgres_database") = {cfg.get("postgres_database")}')
-                    logger.debug(f'cfg.get("postgre_database") = {cfg.get("postgre_database")}')
-                    logger.debug(f'cfg.get("postgresql_db_name") = {cfg.get("postgresql_db_name")}')
-                    logger.debug(f'cfg.get("postgresql_dbname") = {cfg.get("postgresql_dbname")}')
-                    logger.debug(f'cfg.get("postgresql_db") = {cfg.get("postgresql_db")}')
-                    logger.debug(f'cfg.get("postgresql_name") = {cfg.get("postgresql_name")}')
-                    logger.debug(f'cfg.get("postgres_db_name") = {cfg.get("postgres_db_name")}')
-                    logger.debug(f'cfg.get("postgres_dbname") = {cfg.get("postgres_dbname")}')
-                    logger.debug(f'cfg.get("postgres_db") = {cfg.get("postgres_db")}')
-                    logger.debug(f'cfg.get("postgres_name") = {cfg.get("postgres_name")}')
-                    logger.debug(f'cfg.get("postgre_db_name") = {cfg.get("postgre_db_name")}')
-                    logger.debug(f'cfg.get("postgre_dbname") = {cfg.get("postgre_dbname")}')
-                    logger.debug(f'cfg.get("postgre_db") = {cfg.get("postgre_db")}')
-                    logger.debug(f'cfg.get("postgre_name") = {cfg.get("postgre_name")}')
-
-                    logger.debug(f'cfg.get("DB") = {cfg.get("DB")}')
-                    logger.debug(f'cfg.get("DB_NAME") = {cfg.get("DB_NAME")}')
-                    logger.debug(f'cfg.get("DBNAME") = {cfg.get("DBNAME")}')
-                    logger.debug(f'cfg.get("db") = {cfg.get("db")}')
-                    logger.debug(f'cfg.get("db_name") = {cfg.get("db_name")}')
-                    logger.debug(f'cfg.get("dbname") = {cfg.get("dbname")}')
-
-                    return _settings_cache
+            port_key = config["_sources"].get("port", ("",))[0].upper()
+            if is_pg_engine(config["engine"]) or port_key.startswith(("POSTGRESQL_", "POSTGRES_", "POSTGRE_")):
+                rich_print(f"📄 Found settings at: {final_path}", color="#00CED1")
+                del config["engine"], config["url"]
+                _settings_cache = config
+                logger.notice(f"[{final_path}] _settings_cache: {_settings_cache}")
+                return _settings_cache
     
     except Exception as e:
         #if os.getenv("DEBUG", "0") == "1":
@@ -526,10 +956,9 @@ def parse_django_settings(settings_path: str = None, max_depth_up: int = 0, max_
 
 def get_version() -> str:
     """Get version from __version__.py file"""
-    from pathlib import Path
     try:
-        version_file = Path(__file__).parent / "__version__.py"
-        if version_file.is_file():
+        version_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__version__.py")
+        if os.path.isfile(version_file):
             with open(version_file, "r") as f:
                 for line in f:
                     if line.strip().startswith("version"):
@@ -541,139 +970,2999 @@ def get_version() -> str:
     return "2.0"
 
 
+def print_version():
+    """Print the version with plain ANSI colors; importing rich would cost more than the whole command"""
+    version = get_version()
+    if sys.stdout.isatty() and not os.getenv("NO_COLOR"):
+        sys.stdout.write(f"📦 \x1b[1;38;2;255;255;0mVersion:\x1b[0m \x1b[1;38;2;0;255;255m{version}\x1b[0m\n")
+    else:
+        sys.stdout.write(f"📦 Version: {version}\n")
+
+
+def get_cache_dir() -> str:
+    """Return psqlc's cache directory ($XDG_CACHE_HOME/psqlc or ~/.cache/psqlc)"""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "psqlc")
+
+
 # ============================================================================
-# DATABASE CONNECTION
+# CONFIG KEY RESOLUTION
 # ============================================================================
 
-async def get_connection(host: str, port: int, user: str, password: str, 
-                        database: str = "postgres", auto_settings: bool = True, settings_path = None, max_depth_up: int = 0, max_depth_down: str = 1):
-    """Create async database connection"""
-    import asyncpg
-    
-    if auto_settings:
-        db_config = parse_django_settings(settings_path, max_depth_up=max_depth_up, max_depth_down=max_depth_down)
-        # print(f"db_config: {db_config}")
-        if db_config:
-            host = db_config.get('host') or host or os.getenv("HOST")
-            port = db_config.get('port') or port or os.getenv("PORT")
-            user = db_config.get('username') or user or os.getenv("USER")
-            password = db_config.get('password') or password or os.getenv("PASSWORD")
-            if db_config.get('database'): database = db_config.get('database')
-            database = database or os.getenv('DATABASE') or os.getenv('DB_NAME') or os.getenv('DB')
-    else:
-        for cf in [".env", ".json", ".yaml"]:
-            settings_path = find_settings_recursive(filename=cf, max_depth_up=max_depth_up, max_depth_down=max_depth_down)
-            if settings_path:
-                break
-        
-        if not settings_path or not os.path.isfile(settings_path):
-            rich_print(f'❌ env file (".env", ".json", ".yaml") not Found !', color='bold red')
-            return None
+def _pg_prefixed(*suffixes: str) -> Tuple[str, ...]:
+    return tuple(prefix + suffix for prefix in ("POSTGRESQL_", "POSTGRES_", "POSTGRE_") for suffix in suffixes)
 
-        from envdot import load_env
-        cfg = load_env(settings_path)
-        
-        for key in ['engine', 'ENGINE', 'TYPE', 'type']:
-            if cfg.get(key) in ["django.db.backends.postgresql", "postgresql", "psql"]:
-                rich_print(f"📄 Found config at: {settings_path}", color="#00CED1")
-                username = (cfg.get("USER") or cfg.get("user") or cfg.get("username") or cfg.get("USERNAME"))
-                password = (cfg.get("PASSWORD") or cfg.get("password") or cfg.get("pass") or cfg.get("PASS"))
-                database = (cfg.get("NAME") or cfg.get("name") or cfg.get("db") or cfg.get("DB") or cfg.get("dbname") or cfg.get("DBNAME") or cfg.get("db_name") or cfg.get("DB_NAME"))
-                host = cfg.get("HOST") or cfg.get("host") or cfg.get("hostname")
-                port = cfg.get("PORT") or cfg.get("port")
-
-    host = os.getenv('HOST') or host
-    port = os.getenv('PORT') or port
-    user = os.getenv('USER') or user
-    password = os.getenv('PASSWORD') or password
-    database = os.getenv('DATABASE') or os.getenv('DB_NAME') or os.getenv('DB') or database
-
-    rich_print(f"🔍 Using host={host}, user={user}, db={database}, passwd={'*'*len(password)}", color="#00CED1")
-    
-    try:
-        return await asyncpg.connect(
-            database=database,
-            user=user,
-            password=password,
-            host=host,
-            port=port,
-            timeout=10
-        )
-    except Exception as e:
-        rich_print(f"❌ Connection failed: {e}", color="#FF4500", bold=True)
-        sys.exit(1)
 
+class AliasTable:
+    """Config key aliases per field, highest priority first, compiled into one dict.
 
-def get_db_config_or_args(args):
-    """Get database config from settings or args"""
-    db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
-    # print(f"db_config: {db_config}")
-    if db_config:
-        return {
-            'host': db_config.get('host') or args.hostname,
-            'port': db_config.get('port') or args.port,
-            'user': db_config.get('username') or args.user,
-            'password': args.passwd or  db_config.get('password')
-        }
-    else:
-        return {
-            'host': args.hostname,
-            'port': args.port,
-            'user': args.user,
-            'password': args.passwd
-        }
+    `resolve()` walks a config's keys once and looks each up in the compiled
+    index (case-folded unless `fold=False`), keeping the best-ranked non-empty
+    value per field, so the cost no longer grows with the number of aliases.
+    """
 
+    def __init__(self, aliases: Dict[str, Tuple[str, ...]], fold: bool = True):
+        self.fields = tuple(aliases)
+        self.fold = fold
+        self.index = {}
+        for field, names in aliases.items():
+            for rank, name in enumerate(names):
+                self.index.setdefault(name.casefold() if fold else name, (field, rank))
 
-# ============================================================================
-# SHOW COMMANDS
-# ============================================================================
+    def resolve(self, cfg, source: str, key_format: str = "{}") -> Dict[str, Any]:
+        """Return {field: value} plus a "_sources" map of {field: (key, source)}"""
+        best = {}
+        for key, value in cfg.items():
+            if value is None or value == "" or not isinstance(key, str):
+                continue
+            hit = self.index.get(key.casefold() if self.fold else key)
+            if hit and (hit[0] not in best or hit[1] < best[hit[0]][0]):
+                best[hit[0]] = (hit[1], key, value)
+        config = dict.fromkeys(self.fields)
+        config["_sources"] = {}
+        for field, (_rank, key, value) in best.items():
+            config[field] = value
+            config["_sources"][field] = (key_format.format(key), source)
+        return config
 
-async def show_databases(args):
-    """List all databases"""
+
+# a Django DATABASES entry
+DJANGO_DB_ALIASES = AliasTable({
+    "engine": ("ENGINE",),
+    "username": ("USER", "USERNAME"),
+    "password": ("PASSWORD", "PASS"),
+    "database": ("NAME", "DB", "DB_NAME", "DBNAME"),
+    "host": ("HOST", "HOSTNAME", "SERVER"),
+    "port": ("PORT",),
+})
+
+# a .env / .json / .yaml file
+ENV_DB_ALIASES = AliasTable({
+    "engine": ("ENGINE", "TYPE", "DB_TYPE"),
+    "url": ("DATABASE_URL", "DATABASE_URI"),
+    "username": _pg_prefixed("USERNAME", "USER") + ("DB_USER", "DB_USERNAME", "USER", "USERNAME"),
+    "password": _pg_prefixed("PASSWORD", "PASS") + ("PASSWORD", "PASS", "DB_PASSWORD", "DB_PASS"),
+    "database": _pg_prefixed("DATABASE", "DB_NAME", "DBNAME", "DB", "NAME") + ("DB", "DB_NAME", "DBNAME", "NAME"),
+    "host": _pg_prefixed("HOSTNAME", "HOST") + ("DB_HOST", "HOST", "HOSTNAME", "SERVER"),
+    "port": _pg_prefixed("PORT") + ("DB_PORT", "PORT"),
+})
+
+# the process environment, applied last; variable names are case-sensitive
+ENVIRON_ALIASES = AliasTable({
+    "username": ("USER",),
+    "password": ("PASSWORD",),
+    "database": ("DATABASE", "DB_NAME", "DB"),
+    "host": ("HOST",),
+    "port": ("PORT",),
+}, fold=False)
+
+PG_ENGINES = ("django.db.backends.postgresql", "postgresql", "postgres", "postgre", "psql", ".postgresql")
+
+# connection parameter -> config field
+PARAM_FIELDS = {"host": "host", "port": "port", "user": "username", "password": "password", "database": "database"}
+
+# connection parameter -> (key, source, value) of the last value set from config; printed by --config-sources
+CONFIG_SOURCES: Dict[str, Tuple[str, str, Any]] = {}
+SHOW_CONFIG_SOURCES = False
+
+
+def is_pg_engine(value) -> bool:
+    return isinstance(value, str) and value.lower() in PG_ENGINES
+
+
+def overlay_config(params: Dict[str, Any], config: Optional[Dict[str, Any]], names=tuple(PARAM_FIELDS),
+                   keep_equal: bool = True) -> Dict[str, Any]:
+    """Copy the non-empty fields of a resolved config onto connection params, recording where each came from.
+
+    With `keep_equal`, a value equal to the current one keeps its recorded source:
+    envdot exports the .env it loads into os.environ, which would otherwise claim
+    those values.
+    """
+    if not config:
+        return params
+    sources = config.get("_sources") or {}
+    for param in names:
+        value = config.get(PARAM_FIELDS[param])
+        if value and not (keep_equal and param in CONFIG_SOURCES and str(value) == str(params.get(param))):
+            params[param] = value
+            key, source = sources.get(PARAM_FIELDS[param], ("?", "config"))
+            CONFIG_SOURCES[param] = (key, source, value)
+    return params
+
+
+def print_config_sources(params: Dict[str, Any]):
+    """Print each connection parameter with the key and file (or flag) it was taken from"""
     from rich.console import Console
     from rich.table import Table
-    
-    config = get_db_config_or_args(args)
-    conn = await get_connection(**config, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
-    
+
+    table = Table(title="Connection settings", show_header=True, header_style="bold magenta")
+    table.add_column("Parameter", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_column("Key", style="yellow", overflow="fold")
+    table.add_column("Source", style="blue", overflow="fold")
+    for param in PARAM_FIELDS:
+        value = params.get(param)
+        key, source, recorded = CONFIG_SOURCES.get(param, ("-", "default", value))
+        if str(recorded) != str(value):
+            # recorded for a value the command did not end up using (e.g. NAME for `show dbs`)
+            key, source = "-", "default"
+        if param == "password" and value:
+            value = "*" * len(str(value))
+        table.add_row(param, "" if value is None else str(value), key, source)
+    Console(stderr=STATUS_TO_STDERR).print(table)
+
+
+# ============================================================================
+# STATIC SETTINGS.PY PARSER
+# ============================================================================
+
+class _Unresolved:
+    """Marker for a settings expression that cannot be evaluated without running code"""
+
+    def __repr__(self):
+        return "<unresolved>"
+
+
+UNRESOLVED = _Unresolved()
+
+
+class _Ref:
+    """A dotted name bound by an import (`os.environ`, `dj_database_url.parse`, ...)"""
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+def read_dotenv(path: str) -> Dict[str, str]:
+    """Minimal KEY=VALUE reader for a .env file (comments, `export` and quotes; no interpolation)"""
+    values = {}
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            key = key.strip()
+            if key.startswith("export "):
+                key = key[len("export "):].strip()
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in "'\"":
+                value = value[1:-1]
+            elif " #" in value:
+                value = value.split(" #", 1)[0].rstrip()
+            values[key] = value
+    return values
+
+
+def database_url_to_django(url: str) -> Dict[str, Any]:
+    """Turn a database URL into a Django DATABASES entry, like dj_database_url.parse()"""
+    from urllib.parse import unquote
+    parts = parse_postgresql_url(url)
+    scheme = (parts['protocol'] or '').split('+')[0]
+    postgres = scheme in ('postgres', 'postgresql', 'pgsql', 'postgis', 'psql')
+    return {
+        'ENGINE': 'django.db.backends.postgresql' if postgres else scheme,
+        'NAME': unquote(parts['database'] or ''),
+        'USER': unquote(parts['username']) if parts['username'] else '',
+        'PASSWORD': unquote(parts['password']) if parts['password'] else '',
+        'HOST': parts['host'] or '',
+        'PORT': parts['port'] or '',
+    }
+
+
+class StaticSettings:
+    """Evaluate the module-level assignments of a settings.py without executing it.
+
+    Understands literals, names assigned earlier, string concatenation, % and
+    f-strings, `__file__`/pathlib/os.path arithmetic for BASE_DIR,
+    os.environ[...] / os.environ.get / os.getenv, django-environ's env(),
+    env.str/int/bool/db and read_env(), python-decouple's config(), python-dotenv's
+    load_dotenv() and dj_database_url.parse() / .config(). `from .base import *`
+    is followed into sibling modules. Anything else evaluates to UNRESOLVED, and an
+    `if` whose condition is unresolved leaves the names it assigns UNRESOLVED.
+
+    `environ` and `files` record the environment variables and files the result
+    depends on, so cached results can be invalidated.
+    """
+
+    SAFE_METHODS = {
+        str: {'lower', 'upper', 'strip', 'lstrip', 'rstrip', 'split', 'replace', 'format', 'startswith', 'endswith', 'join'},
+        dict: {'get', 'copy', 'update', 'setdefault'},
+    }
+    PATH_ATTRIBUTES = {'parent', 'name', 'stem', 'resolve', 'absolute', 'joinpath', 'expanduser'}
+    ENV_CASTS = {'str': str, 'int': int, 'float': float, 'bool': None, 'list': None, 'db': 'db', 'db_url': 'db'}
+
+    def __init__(self, path: str, depth: int = 0):
+        self.path = os.path.abspath(path)
+        self.depth = depth
+        self.names = {'__file__': self.path, '__name__': 'settings', 'True': True, 'False': False, 'None': None}
+        self.names.update({name: _Ref(name) for name in ('str', 'int', 'float', 'bool', 'list')})
+        self.environ = {}
+        self.files = {}
+        self.dotenv = None
+        self.env_scheme = {}
+        self.in_try = 0
+
+    # -- environment ------------------------------------------------------
+
+    def _load_dotenv(self, path=None):
+        if path is None:
+            directory = os.path.dirname(self.path)
+            for _ in range(4):
+                candidate = os.path.join(directory, ".env")
+                if os.path.isfile(candidate):
+                    path = candidate
+                    break
+                directory = os.path.dirname(directory)
+        if path is None or not os.path.isfile(str(path)):
+            return
+        path = str(path)
+        self.files[path] = _mtime_ns(path)
+        self.dotenv = dict(self.dotenv or {}, **{k: v for k, v in read_dotenv(path).items() if k not in (self.dotenv or {})})
+
+    def getenv(self, name, default=UNRESOLVED):
+        if not isinstance(name, str):
+            return UNRESOLVED
+        value = os.environ.get(name)
+        self.environ[name] = value
+        if value is None and self.dotenv:
+            value = self.dotenv.get(name)
+        return default if value is None else value
+
+    def _env_value(self, name, kind: str = 'str', default=UNRESOLVED):
+        if kind == 'db':
+            url = self.getenv(name or 'DATABASE_URL', default)
+            return database_url_to_django(url) if isinstance(url, str) and url else UNRESOLVED
+        if default is UNRESOLVED and name in self.env_scheme:
+            cast, default = self.env_scheme[name]
+            kind = cast or kind
+        value = self.getenv(name, default)
+        if not isinstance(value, str) or kind == 'str':
+            return value
+        if kind == 'bool':
+            return value.strip().lower() in ('1', 'true', 'yes', 'on', 'y', 't')
+        if kind == 'list':
+            return [v.strip() for v in value.split(',') if v.strip()]
+        try:
+            return {'int': int, 'float': float}[kind](value)
+        except (KeyError, ValueError):
+            return UNRESOLVED
+
+    # -- statements -------------------------------------------------------
+
+    def run(self) -> Dict[str, Any]:
+        import ast
+        with open(self.path, 'rb') as f:
+            tree = ast.parse(f.read(), filename=self.path)
+        self.files[self.path] = _mtime_ns(self.path)
+        self._block(tree.body)
+        return self.names
+
+    def _block(self, body):
+        for node in body:
+            self._statement(node)
+
+    def _assigned_names(self, nodes) -> set:
+        import ast
+        names = set()
+        for node in nodes:
+            for child in ast.walk(node):
+                if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+                    names.add(child.id)
+        return names
+
+    def _statement(self, node):
+        import ast
+        if isinstance(node, ast.Assign):
+            value = self.eval(node.value)
+            for target in node.targets:
+                self._assign(target, value)
+        elif isinstance(node, ast.AnnAssign) and node.value is not None:
+            self._assign(node.target, self.eval(node.value))
+        elif isinstance(node, ast.AugAssign):
+            current = self.eval(node.target)
+            self._assign(node.target, self._binop(node.op, current, self.eval(node.value)))
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                local = alias.asname or alias.name.split('.')[0]
+                self.names[local] = _Ref(alias.name if alias.asname else alias.name.split('.')[0])
+        elif isinstance(node, ast.ImportFrom):
+            if any(alias.name == '*' for alias in node.names):
+                self._star_import(node)
+            else:
+                for alias in node.names:
+                    self.names[alias.asname or alias.name] = _Ref(f"{node.module or ''}.{alias.name}".lstrip('.'))
+        elif isinstance(node, ast.If):
+            test = self.eval(node.test)
+            if test is UNRESOLVED:
+                for name in self._assigned_names(node.body + node.orelse):
+                    self.names[name] = UNRESOLVED
+            else:
+                self._block(node.body if test else node.orelse)
+        elif isinstance(node, ast.Try):
+            # assume the happy path: the body runs without raising
+            self.in_try += 1
+            self._block(node.body)
+            self.in_try -= 1
+            self._block(node.orelse)
+            self._block(node.finalbody)
+        elif isinstance(node, ast.With):
+            self._block(node.body)
+        elif isinstance(node, ast.Expr):
+            self.eval(node.value)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            self.names[node.name] = UNRESOLVED
+        else:
+            for name in self._assigned_names([node]):
+                self.names[name] = UNRESOLVED
+
+    def _assign(self, target, value):
+        import ast
+        if isinstance(target, ast.Name):
+            self.names[target.id] = value
+        elif isinstance(target, ast.Subscript):
+            container = self.eval(target.value)
+            key = self.eval(self._subscript_index(target))
+            if isinstance(container, dict) and key is not UNRESOLVED:
+                container[key] = value
+        else:
+            for name in self._assigned_names([target]):
+                self.names[name] = UNRESOLVED
+
+    def _star_import(self, node):
+        """Follow `from .base import *` / `from project.settings.base import *` into the module's file"""
+        module = (node.module or '').split('.')
+        directory = os.path.dirname(self.path)
+        if node.level:
+            for _ in range(node.level - 1):
+                directory = os.path.dirname(directory)
+            roots = [directory]
+        else:
+            # absolute import: try the settings directory and its ancestors as sys.path entries
+            roots = [directory]
+            for _ in range(3):
+                directory = os.path.dirname(directory)
+                roots.append(directory)
+        candidate = next((path for path in (os.path.join(root, *module) + ".py" for root in roots) if os.path.isfile(path)), None)
+        if candidate is None and self.in_try:
+            # `try: from .local_settings import * / except ImportError: pass` with no local file
+            return
+        if self.depth >= 5 or candidate is None:
+            # a star import we cannot follow may rebind anything
+            self.names['DATABASES'] = UNRESOLVED
+            return
+        child = StaticSettings(candidate, depth=self.depth + 1)
+        child.dotenv = self.dotenv
+        child.run()
+        self.names.update({k: v for k, v in child.names.items() if not k.startswith('_')})
+        self.environ.update(child.environ)
+        self.files.update(child.files)
+        self.dotenv = child.dotenv
+        self.env_scheme.update(child.env_scheme)
+
+    # -- expressions ------------------------------------------------------
+
+    @staticmethod
+    def _subscript_index(node):
+        index = node.slice
+        # Python < 3.9 wraps plain subscripts in ast.Index
+        return getattr(index, 'value', index) if type(index).__name__ == 'Index' else index
+
+    def eval(self, node):
+        import ast
+        try:
+            return self._eval(node, ast)
+        except Exception as e:
+            logger.debug(f"static settings: cannot evaluate line {getattr(node, 'lineno', '?')}: {e}")
+            return UNRESOLVED
+
+    def _eval(self, node, ast):
+        kind = type(node).__name__
+        if kind == 'Constant':
+            return node.value
+        if kind in ('Str', 'Bytes'):
+            return node.s
+        if kind == 'Num':
+            return node.n
+        if kind == 'NameConstant':
+            return node.value
+        if kind == 'Name':
+            return self.names.get(node.id, UNRESOLVED)
+        if kind == 'Dict':
+            result = {}
+            for key, value in zip(node.keys, node.values):
+                value = self.eval(value)
+                if key is None:
+                    if not isinstance(value, dict):
+                        return UNRESOLVED
+                    result.update(value)
+                else:
+                    result[self.eval(key)] = value
+            return result
+        if kind in ('List', 'Tuple', 'Set'):
+            items = [self.eval(item) for item in node.elts]
+            if kind == 'Set':
+                return UNRESOLVED if any(item is UNRESOLVED for item in items) else set(items)
+            return list(items) if kind == 'List' else tuple(items)
+        if kind == 'JoinedStr':
+            parts = []
+            for part in node.values:
+                if type(part).__name__ == 'FormattedValue':
+                    if part.format_spec is not None:
+                        return UNRESOLVED
+                    value = self.eval(part.value)
+                    if value is UNRESOLVED:
+                        return UNRESOLVED
+                    parts.append(str(value))
+                else:
+                    value = self.eval(part)
+                    parts.append(value)
+            return "".join(parts)
+        if kind == 'BinOp':
+            return self._binop(node.op, self.eval(node.left), self.eval(node.right))
+        if kind == 'BoolOp':
+            values = [self.eval(v) for v in node.values]
+            for value in values[:-1]:
+                if value is UNRESOLVED:
+                    return UNRESOLVED
+                if isinstance(node.op, ast.Or) == bool(value):
+                    return value
+            return values[-1]
+        if kind == 'UnaryOp' and isinstance(node.op, ast.Not):
+            value = self.eval(node.operand)
+            return UNRESOLVED if value is UNRESOLVED else not value
+        if kind == 'IfExp':
+            test = self.eval(node.test)
+            if test is UNRESOLVED:
+                return UNRESOLVED
+            return self.eval(node.body if test else node.orelse)
+        if kind == 'Compare' and len(node.ops) == 1:
+            left, right = self.eval(node.left), self.eval(node.comparators[0])
+            if left is UNRESOLVED or right is UNRESOLVED:
+                return UNRESOLVED
+            op = type(node.ops[0]).__name__
+            compare = {'Eq': lambda a, b: a == b, 'NotEq': lambda a, b: a != b, 'In': lambda a, b: a in b,
+                       'NotIn': lambda a, b: a not in b, 'Is': lambda a, b: a is b, 'IsNot': lambda a, b: a is not b}
+            return compare[op](left, right) if op in compare else UNRESOLVED
+        if kind == 'Subscript':
+            container = self.eval(node.value)
+            key = self.eval(self._subscript_index(node))
+            if isinstance(container, _Ref) and container.name == 'os.environ':
+                return self.getenv(key)
+            if isinstance(container, (dict, list, tuple, str)) and key is not UNRESOLVED:
+                return container[key]
+            return UNRESOLVED
+        if kind == 'Attribute':
+            value = self.eval(node.value)
+            if isinstance(value, _Ref):
+                return _Ref(f"{value.name}.{node.attr}")
+            from pathlib import PurePath
+            if isinstance(value, PurePath) and node.attr in self.PATH_ATTRIBUTES:
+                return getattr(value, node.attr)
+            if type(value) in self.SAFE_METHODS and node.attr in self.SAFE_METHODS[type(value)]:
+                return getattr(value, node.attr)
+            return UNRESOLVED
+        if kind == 'Call':
+            return self._call(node)
+        return UNRESOLVED
+
+    def _binop(self, op, left, right):
+        if left is UNRESOLVED or right is UNRESOLVED:
+            return UNRESOLVED
+        name = type(op).__name__
+        if name == 'Add':
+            return left + right
+        if name == 'Mod' and isinstance(left, str):
+            return left % right
+        if name == 'Div':
+            return left / right
+        if name == 'Mult':
+            return left * right
+        return UNRESOLVED
+
+    def _call(self, node):
+        func = self.eval(node.func)
+        args = [self.eval(a) for a in node.args]
+        kwargs = {k.arg: self.eval(k.value) for k in node.keywords if k.arg}
+        if callable(func) and not isinstance(func, _Ref):
+            # bound str/Path methods from the whitelist above
+            if any(a is UNRESOLVED for a in args) or any(v is UNRESOLVED for v in kwargs.values()):
+                return UNRESOLVED
+            return func(*args, **kwargs)
+        if not isinstance(func, _Ref):
+            return UNRESOLVED
+        name = func.name
+        if name in ('os.getenv', 'os.environ.get'):
+            return self.getenv(*args[:2]) if args else UNRESOLVED
+        if name == 'os.environ.setdefault' and len(args) == 2:
+            if isinstance(args[0], str) and os.environ.get(args[0]) is None and isinstance(args[1], str):
+                self.dotenv = dict(self.dotenv or {}, **{args[0]: args[1]})
+            return self.getenv(args[0])
+        if name in ('os.path.join', 'os.path.dirname', 'os.path.abspath', 'os.path.realpath', 'os.path.basename',
+                    'os.path.expanduser', 'pathlib.Path', 'pathlib.PurePath'):
+            if not args or any(not isinstance(a, (str, os.PathLike)) for a in args):
+                return UNRESOLVED
+            import pathlib
+            return pathlib.Path(*args) if name.startswith('pathlib') else getattr(os.path, name.rsplit('.', 1)[1])(*args)
+        if name in ('str', 'int', 'float', 'bool') and len(args) == 1 and args[0] is not UNRESOLVED:
+            return {'str': str, 'int': int, 'float': float, 'bool': bool}[name](args[0])
+        if name in ('dotenv.load_dotenv', 'dotenv.read_dotenv', 'environ.Env.read_env', 'environ.environ.Env.read_env',
+                    '<env>.read_env'):
+            path = args[0] if args else kwargs.get('dotenv_path', kwargs.get('env_file'))
+            self._load_dotenv(None if path is UNRESOLVED or path is None else path)
+            return True
+        if name in ('environ.Env', 'environ.environ.Env'):
+            for key, spec in kwargs.items():
+                if isinstance(spec, tuple) and len(spec) == 2:
+                    cast = spec[0].name if isinstance(spec[0], _Ref) else None
+                    self.env_scheme[key] = (cast if cast in self.ENV_CASTS else None, spec[1])
+            return _Ref('<env>')
+        if name == 'decouple.config' or name.startswith('<env>'):
+            if name == 'decouple.config' and self.dotenv is None:
+                self._load_dotenv()
+            method = name.split('.', 1)[1] if '.' in name and name.startswith('<env>') else 'str'
+            cast = kwargs.get('cast')
+            if isinstance(cast, _Ref) and cast.name in self.ENV_CASTS:
+                method = cast.name
+            if method not in self.ENV_CASTS:
+                return UNRESOLVED
+            kind = 'db' if self.ENV_CASTS[method] == 'db' else method
+            key = args[0] if args else kwargs.get('var', 'DATABASE_URL' if kind == 'db' else None)
+            default = args[1] if len(args) > 1 else kwargs.get('default', UNRESOLVED)
+            return self._env_value(key, kind, default)
+        if name == 'dj_database_url.parse' and args and isinstance(args[0], str):
+            return database_url_to_django(args[0])
+        if name == 'dj_database_url.config':
+            url = self.getenv(kwargs.get('env', 'DATABASE_URL'), kwargs.get('default'))
+            return database_url_to_django(url) if isinstance(url, str) and url else {}
+        return UNRESOLVED
+
+
+def static_databases(path: str):
+    """Read DATABASES from a settings.py without executing it.
+
+    Returns (databases, complete, depends): `databases` is None when DATABASES
+    cannot be evaluated, unresolved values inside it become None and clear
+    `complete`. `depends` lists the environment variables and files read.
+    """
+    parser = StaticSettings(path)
+    try:
+        names = parser.run()
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.debug(f"static settings: cannot parse {path}: {e}")
+        return None, False, None
+    depends = {"environ": parser.environ, "files": parser.files}
+    databases = names.get('DATABASES', UNRESOLVED)
+    if not isinstance(databases, dict):
+        return None, False, depends
+    complete = True
+    cleaned = {}
+    for alias, cfg in databases.items():
+        if not isinstance(cfg, dict):
+            complete = False
+            continue
+        cleaned[alias] = {}
+        for key, value in cfg.items():
+            if value is UNRESOLVED:
+                complete = False
+                logger.notice(f"static settings: DATABASES[{alias!r}][{key!r}] needs code execution to resolve")
+                value = None
+            cleaned[alias][key] = value
+    return cleaned, complete, depends
+
+
+# ============================================================================
+# DATABASE CONNECTION
+# ============================================================================
+
+def resolve_connection_params(host: str, port: int, user: str, password: str,
+                              database: str = "postgres", auto_settings: bool = True, settings_path = None, max_depth_up: int = 0, max_depth_down: str = 1) -> Optional[Dict[str, Any]]:
+    """Resolve host/port/user/password/database from settings, env config files and environment"""
+    params = {'host': host, 'port': port, 'user': user, 'password': password, 'database': database}
+    if auto_settings:
+        overlay_config(params, parse_django_settings(settings_path, max_depth_up=max_depth_up, max_depth_down=max_depth_down))
+    else:
+        settings_path, env_config = find_env_engine_config(max_depth_up=max_depth_up, max_depth_down=max_depth_down)
+        if env_config:
+            rich_print(f"📄 Found config at: {settings_path}", color="#00CED1")
+            overlay_config(params, env_config, ('password', 'database', 'host', 'port'))
+        elif not settings_path:
+            logger.debug('no env file (".env", ".json", ".yaml") found')
+
+    overlay_config(params, ENVIRON_ALIASES.resolve(os.environ, "environment", key_format="${}"))
+
+    rich_print(f"🔍 Using host={params['host']}, user={params['user']}, db={params['database']}, passwd={'*'*len(params['password'] or '')}", color="#00CED1")
+    if SHOW_CONFIG_SOURCES:
+        print_config_sources(params)
+    return params
+
+
+async def get_connection(host: str, port: int, user: str, password: str, 
+                        database: str = "postgres", auto_settings: bool = True, settings_path = None, max_depth_up: int = 0, max_depth_down: str = 1,
+                        use_daemon: bool = True):
+    """Create async database connection (routed through `psqlc serve` when it is running)"""
+    import asyncpg
+
+    params = resolve_connection_params(host, port, user, password, database, auto_settings=auto_settings, settings_path=settings_path,
+                                       max_depth_up=max_depth_up, max_depth_down=max_depth_down)
+    if params is None:
+        return None
+    
+    with TIMINGS.phase("connect"):
+        if use_daemon:
+            conn = await daemon_connect(**params)
+            if conn:
+                return instrument_connection(conn)
+
+        try:
+            if TIMINGS.enabled:
+                conn, _phases = await connect_with_phases(params, timeout=10)
+                return instrument_connection(conn)
+            return instrument_connection(await asyncpg.connect(**params, timeout=10))
+        except Exception as e:
+            rich_print(f"❌ Connection failed: {e}", color="#FF4500", bold=True)
+            sys.exit(1)
+
+
+async def connect_with_phases(params: Dict[str, Any], timeout: float = 10, probe_tcp: bool = False):
+    """asyncpg.connect with its phases timed separately; returns (conn, {phase: seconds}).
+
+    The host is resolved first (booked as the "dns" phase) and asyncpg is handed
+    the address, so the lookup is not repeated inside connect(). With `probe_tcp`
+    a bare TCP connect to that address is timed as "tcp" and closed before any byte
+    is sent (the server does not log those), and "auth" is the rest of connect():
+    TLS negotiation, startup and authentication. "connect" is always the whole of
+    connect(). Unix sockets and PGSSLMODE=verify-full, which checks the host name,
+    are connected to as given.
+    """
+    import asyncpg
+    import socket
+
+    phases = {}
+    target = dict(params)
+    host, port = params.get('host'), int(params.get('port') or DEFAULT_PORT)
+    if host and not str(host).startswith('/') and str(os.getenv('PGSSLMODE', '')).lower() != 'verify-full':
+        started = time.perf_counter()
+        with TIMINGS.phase("dns"):
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        phases['dns'] = time.perf_counter() - started
+        target['host'] = infos[0][4][0]
+        if probe_tcp:
+            started = time.perf_counter()
+            _reader, writer = await asyncio.wait_for(asyncio.open_connection(target['host'], port), timeout)
+            phases['tcp'] = time.perf_counter() - started
+            writer.close()
+            await writer.wait_closed()
+
+    started = time.perf_counter()
+    conn = await asyncpg.connect(**target, timeout=timeout)
+    phases['connect'] = time.perf_counter() - started
+    if 'tcp' in phases:
+        phases['auth'] = max(phases['connect'] - phases['tcp'], 0.0)
+    return conn, phases
+
+
+async def get_pool(host: str, port: int, user: str, password: str,
+                   database: str = "postgres", auto_settings: bool = True, settings_path = None, max_depth_up: int = 0, max_depth_down: str = 1,
+                   min_size: int = 1, max_size: int = 10):
+    """Create an asyncpg pool, resolving parameters the same way as get_connection"""
+    import asyncpg
+
+    params = resolve_connection_params(host, port, user, password, database, auto_settings=auto_settings, settings_path=settings_path,
+                                       max_depth_up=max_depth_up, max_depth_down=max_depth_down)
+    if params is None:
+        return None
+
+    try:
+        return await asyncpg.create_pool(**params, min_size=min_size, max_size=max_size, timeout=10)
+    except Exception as e:
+        rich_print(f"❌ Connection failed: {e}", color="#FF4500", bold=True)
+        sys.exit(1)
+
+
+def get_db_config_or_args(args):
+    """Get database config from settings or args"""
+    db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
+    params = {'host': args.hostname, 'port': args.port, 'user': args.user, 'password': None}
+    for param, flag in (('host', '-H/--hostname'), ('port', '--port'), ('user', '-U/--user')):
+        CONFIG_SOURCES.setdefault(param, (flag, 'command line or default', params[param]))
+    overlay_config(params, db_config, tuple(params), keep_equal=False)
+    if args.passwd:
+        params['password'] = args.passwd
+        CONFIG_SOURCES['password'] = ('-P/--passwd', 'command line', args.passwd)
+    return params
+
+
+# ============================================================================
+# DAEMON (psqlc serve)
+# ============================================================================
+
+DAEMON_ENV_DISABLE = "PSQLC_NO_DAEMON"
+
+
+def get_socket_path() -> str:
+    """Return the Unix socket path used by `psqlc serve` ($PSQLC_SOCKET overrides)"""
+    return os.getenv("PSQLC_SOCKET") or os.path.join(get_cache_dir(), "psqlc.sock")
+
+
+FRAME_TAG = "__psqlc__"
+
+
+class DaemonRecord:
+    """Read-only row returned through the daemon, indexable by position or column name like asyncpg.Record"""
+
+    __slots__ = ("_keys", "_values", "_index")
+
+    def __init__(self, keys, values):
+        self._keys = list(keys)
+        self._values = list(values)
+        self._index = None
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, slice)):
+            return self._values[key]
+        if self._index is None:
+            self._index = {name: i for i, name in reversed(list(enumerate(self._keys)))}
+        return self._values[self._index[key]]
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return iter(self._keys)
+
+    def values(self):
+        return iter(self._values)
+
+    def items(self):
+        return zip(self._keys, self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __eq__(self, other):
+        if isinstance(other, DaemonRecord):
+            return self._keys == other._keys and self._values == other._values
+        return NotImplemented
+
+    def __repr__(self):
+        return "<DaemonRecord " + " ".join(f"{k}={v!r}" for k, v in self.items()) + ">"
+
+
+def _frame_default(obj):
+    """json.dumps hook tagging values JSON has no type for, so they decode back to the same type"""
+    import datetime
+    import decimal
+    import uuid
+
+    if isinstance(obj, decimal.Decimal):
+        return {FRAME_TAG: "decimal", "v": str(obj)}
+    if isinstance(obj, datetime.datetime):
+        return {FRAME_TAG: "datetime", "v": obj.isoformat()}
+    if isinstance(obj, datetime.date):
+        return {FRAME_TAG: "date", "v": obj.isoformat()}
+    if isinstance(obj, datetime.time):
+        return {FRAME_TAG: "time", "v": obj.isoformat()}
+    if isinstance(obj, datetime.timedelta):
+        return {FRAME_TAG: "timedelta", "v": [obj.days, obj.seconds, obj.microseconds]}
+    if isinstance(obj, uuid.UUID):
+        return {FRAME_TAG: "uuid", "v": str(obj)}
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        import base64
+        return {FRAME_TAG: "bytes", "v": base64.b64encode(bytes(obj)).decode("ascii")}
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "keys") and hasattr(obj, "values") and not isinstance(obj, dict):
+        # asyncpg.Record (composite values) and DaemonRecord
+        return {FRAME_TAG: "record", "v": [list(obj.keys()), list(obj.values())]}
+    module = type(obj).__module__
+    if module == "ipaddress":
+        return {FRAME_TAG: type(obj).__name__, "v": str(obj)}
+    return {FRAME_TAG: "str", "v": str(obj)}
+
+
+def _frame_object_hook(obj: dict):
+    """json.loads hook reversing _frame_default"""
+    tag = obj.get(FRAME_TAG)
+    if tag is None or len(obj) != 2:
+        return obj
+    value = obj["v"]
+    if tag == "decimal":
+        import decimal
+        return decimal.Decimal(value)
+    if tag in ("datetime", "date", "time"):
+        import datetime
+        return getattr(datetime, tag).fromisoformat(value)
+    if tag == "timedelta":
+        import datetime
+        return datetime.timedelta(days=value[0], seconds=value[1], microseconds=value[2])
+    if tag == "uuid":
+        import uuid
+        return uuid.UUID(value)
+    if tag == "bytes":
+        import base64
+        return base64.b64decode(value)
+    if tag == "record":
+        return DaemonRecord(value[0], value[1])
+    if tag in ("IPv4Address", "IPv6Address", "IPv4Network", "IPv6Network", "IPv4Interface", "IPv6Interface"):
+        import ipaddress
+        return getattr(ipaddress, tag)(value)
+    return value
+
+
+def encode_frame(obj) -> bytes:
+    """Serialise one frame: a 4-byte big-endian length followed by typed JSON"""
+    import json
+    payload = json.dumps(obj, default=_frame_default, separators=(",", ":")).encode("utf-8")
+    return len(payload).to_bytes(4, "big") + payload
+
+
+def decode_frame(payload: bytes):
+    """Parse the JSON body of one frame, restoring the values tagged by encode_frame"""
+    import json
+    return json.loads(payload.decode("utf-8"), object_hook=_frame_object_hook)
+
+
+async def _send_frame(writer, obj):
+    """Write one length-prefixed JSON frame"""
+    writer.write(encode_frame(obj))
+    await writer.drain()
+
+
+async def _recv_frame(reader):
+    """Read one length-prefixed JSON frame, None on EOF"""
+    try:
+        header = await reader.readexactly(4)
+        payload = await reader.readexactly(int.from_bytes(header, "big"))
+    except asyncio.IncompleteReadError:
+        return None
+    TIMINGS.count(bytes_received=4 + len(payload))
+    return decode_frame(payload)
+
+
+class DaemonError(Exception):
+    """Error raised by the daemon while running a statement"""
+
+
+def error_response(exc: Exception) -> dict:
+    """Describe a failed statement for the client, keeping the PostgreSQL error fields"""
+    response = {"ok": False, "error": str(exc)}
+    if getattr(exc, "sqlstate", None) and hasattr(exc, "as_dict"):
+        response["fields"] = exc.as_dict()
+    return response
+
+
+def daemon_exception(response: dict) -> Exception:
+    """Rebuild the asyncpg exception class for the SQLSTATE of a failed response, DaemonError otherwise"""
+    fields = response.get("fields") or {}
+    if not fields.get("sqlstate"):
+        return DaemonError(response.get("error"))
+    import asyncpg
+    exc_class = type(asyncpg.PostgresError).get_message_class_for_sqlstate(fields["sqlstate"])
+    exc = exc_class(fields.get("message") or response.get("error") or "")
+    exc.__dict__.update(fields)
+    return exc
+
+
+class DaemonConnection:
+    """Connection-like proxy that runs statements on a pooled connection inside `psqlc serve`.
+
+    Only the subset of the asyncpg API used by the command handlers is provided:
+    fetch, fetchrow, fetchval, execute and close. Rows come back as DaemonRecord and
+    PostgreSQL errors are raised as the asyncpg exception class for their SQLSTATE.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+
+    async def _request(self, op: str, query: str, args, **options):
+        await _send_frame(self._writer, {"op": op, "query": query, "args": list(args), **options})
+        response = await _recv_frame(self._reader)
+        if response is None:
+            raise DaemonError("psqlc daemon closed the connection")
+        if not response.get("ok"):
+            raise daemon_exception(response)
+        return response
+
+    async def fetch(self, query: str, *args):
+        response = await self._request("fetch", query, args)
+        columns = response["columns"]
+        return [DaemonRecord(columns, row) for row in response["rows"]]
+
+    async def fetch_limited(self, query: str, *args, limit: int, prefetch: int = 1000, readonly: bool = False):
+        response = await self._request("fetch", query, args, limit=limit, prefetch=prefetch, readonly=readonly)
+        columns = response["columns"]
+        return [DaemonRecord(columns, row) for row in response["rows"]]
+
+    async def fetchrow(self, query: str, *args):
+        rows = await self.fetch(query, *args)
+        return rows[0] if rows else None
+
+    async def fetchval(self, query: str, *args):
+        response = await self._request("fetchval", query, args)
+        return response["value"]
+
+    async def execute(self, query: str, *args):
+        response = await self._request("execute", query, args)
+        return response["status"]
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except Exception:
+            pass
+
+
+async def daemon_connect(host: str, port: int, user: str, password: str, database: str) -> Optional[DaemonConnection]:
+    """Open a session on the running daemon, or return None so the caller connects directly"""
+    if str(os.getenv(DAEMON_ENV_DISABLE, "")).lower() in ("1", "true", "yes"):
+        return None
+    if not hasattr(asyncio, "open_unix_connection"):
+        return None
+    socket_path = get_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(socket_path), timeout=1)
+        await _send_frame(writer, {
+            "host": host,
+            "port": int(port) if port else DEFAULT_PORT,
+            "user": user,
+            "password": password,
+            "database": database,
+        })
+        response = await _recv_frame(reader)
+    except (OSError, asyncio.TimeoutError) as e:
+        logger.debug(f"daemon not reachable at {socket_path}: {e}")
+        return None
+
+    if not response or not response.get("ok"):
+        logger.debug(f"daemon refused session: {response and response.get('error')}")
+        writer.close()
+        return None
+
+    logger.debug(f"using psqlc daemon at {socket_path}")
+    return DaemonConnection(reader, writer)
+
+
+async def _daemon_run(conn, request: dict) -> dict:
+    """Run one client request on an acquired pool connection"""
+    op = request.get("op")
+    query = request.get("query")
+    args = request.get("args") or []
+
+    if op == "fetch":
+        limit = request.get("limit")
+        if limit is not None:
+            records = await fetch_limited(conn, query, *args, limit=limit,
+                                          prefetch=request.get("prefetch") or 1000,
+                                          readonly=bool(request.get("readonly")))
+        else:
+            records = await conn.fetch(query, *args)
+        columns = list(records[0].keys()) if records else []
+        return {"columns": columns, "rows": [list(r.values()) for r in records]}
+    if op == "fetchval":
+        return {"value": await conn.fetchval(query, *args)}
+    if op == "execute":
+        return {"status": await conn.execute(query, *args)}
+    raise DaemonError(f"unknown op: {op}")
+
+
+async def serve_daemon(args):
+    """Run a local daemon keeping an asyncpg pool per (host, port, user, database)"""
+    import asyncpg
+    import signal
+
+    if not hasattr(asyncio, "start_unix_server"):
+        rich_print("❌ `psqlc serve` needs Unix domain sockets, not available on this platform", color="#FF4500", bold=True)
+        return
+
+    socket_path = args.socket or get_socket_path()
+    os.makedirs(os.path.dirname(socket_path) or ".", mode=0o700, exist_ok=True)
+
+    if os.path.exists(socket_path):
+        try:
+            _, writer = await asyncio.open_unix_connection(socket_path)
+            writer.close()
+            rich_print(f"⚠️ psqlc daemon already running at {socket_path}", color="#FFFF00", bold=True)
+            return
+        except OSError:
+            os.unlink(socket_path)
+
+    pools = {}
+    pools_lock = asyncio.Lock()
+
+    async def get_pool(params: dict):
+        key = (params.get("host"), params.get("port"), params.get("user"), params.get("database"), params.get("password"))
+        async with pools_lock:
+            pool = pools.get(key)
+            if pool is None:
+                pool = await asyncpg.create_pool(
+                    host=params.get("host"),
+                    port=params.get("port"),
+                    user=params.get("user"),
+                    password=params.get("password"),
+                    database=params.get("database"),
+                    min_size=args.pool_min,
+                    max_size=args.pool_max,
+                    max_inactive_connection_lifetime=args.idle_timeout,
+                    timeout=10,
+                )
+                pools[key] = pool
+                rich_print(f"🔌 New pool {params.get('user')}@{params.get('host')}:{params.get('port')}/{params.get('database')}", color="#00CED1")
+            return pool
+
+    async def handle_client(reader, writer):
+        pool = conn = None
+        try:
+            hello = await _recv_frame(reader)
+            if hello is None:
+                return
+            try:
+                pool = await get_pool(hello)
+                conn = await pool.acquire()
+            except Exception as e:
+                await _send_frame(writer, {"ok": False, "error": str(e)})
+                return
+            await _send_frame(writer, {"ok": True})
+
+            while True:
+                request = await _recv_frame(reader)
+                if request is None:
+                    break
+                try:
+                    response = {"ok": True, **(await _daemon_run(conn, request))}
+                except Exception as e:
+                    response = error_response(e)
+                await _send_frame(writer, response)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if conn is not None:
+                await pool.release(conn)
+            writer.close()
+
+    # the socket must never exist with wider permissions, even briefly: create it under a 0177 umask
+    previous_umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(handle_client, path=socket_path)
+    finally:
+        os.umask(previous_umask)
+
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    rich_print(f"🚀 psqlc daemon listening on {socket_path} (pool {args.pool_min}-{args.pool_max})", color="#00FF7F", bold=True)
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        for pool in pools.values():
+            await pool.close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        rich_print("🔒 psqlc daemon stopped", color="#00CED1")
+
+
+# ============================================================================
+# FAN-OUT (--all-databases / --databases)
+# ============================================================================
+
+def fan_out_requested(args) -> bool:
+    """True when a show command should run against several databases"""
+    return bool(getattr(args, 'all_databases', False) or getattr(args, 'databases', None))
+
+
+async def gather_targets(targets: Dict[str, Dict[str, Any]], fetch, concurrency: int, timeout: float):
+    """Connect to every target and run `fetch(conn)` concurrently.
+
+    `targets` maps a label (database or host) to connection parameters. Each target
+    gets `timeout` seconds for connect + fetch, at most `concurrency` run at once, so
+    the total runtime follows the slowest target rather than the sum of all of them.
+    Returns (results, failures) keyed by label in input order; one failing target
+    never aborts the others.
+    """
+    import asyncpg
+
+    semaphore = asyncio.Semaphore(max(1, concurrency or 1))
+    results, failures = {}, {}
+
+    async def run(params):
+        conn = instrument_connection(await daemon_connect(**params) or await asyncpg.connect(**params, timeout=min(10, timeout)))
+        try:
+            return await fetch(conn)
+        finally:
+            try:
+                await conn.close()
+            except Exception:
+                pass
+
+    async def one(label, params):
+        async with semaphore:
+            try:
+                results[label] = await asyncio.wait_for(run(params), timeout=timeout)
+            except asyncio.TimeoutError:
+                failures[label] = f"timed out after {timeout:g}s"
+            except Exception as e:
+                failures[label] = str(e) or e.__class__.__name__
+
+    await asyncio.gather(*(one(label, params) for label, params in targets.items()))
+    return ({label: results[label] for label in targets if label in results},
+            {label: failures[label] for label in targets if label in failures})
+
+
+def render_merged(title: str, key_header: str, results: dict, failures: dict, columns: list = None, sort_key=None):
+    """Print rows from several targets as one table with a leading `key_header` column.
+
+    `columns` is a list of (key, header, style); when omitted the keys of the first row are used.
+    Failures are listed as warnings under the table.
+    """
+    from rich.table import Table
+
+    merged = [(label, dict(row)) for label, rows in results.items() for row in rows]
+    if sort_key:
+        merged.sort(key=lambda item: sort_key(item[1]))
+    if columns is None:
+        columns = [(key, key, "cyan") for key in (merged[0][1].keys() if merged else [])]
+
+    noun = key_header.lower()
+    if merged:
+        table = Table(title=f"{title} across {len(results)} {noun}(s)", show_header=True, header_style="bold magenta")
+        table.add_column(key_header, style="bold white")
+        for _, header, style in columns:
+            table.add_column(header, style=style)
+        for label, row in merged:
+            table.add_row(label, *("-" if row.get(key) is None else str(row.get(key)) for key, _, _ in columns))
+        print_table(table)
+    elif results:
+        rich_print(f"📭 Nothing found in {len(results)} {noun}(s)", color="#FFFF00")
+
+    for label, error in failures.items():
+        rich_print(f"⚠️  {label}: {error}", color="#FFA500")
+
+
+async def run_across_databases(args, fetch):
+    """Run `fetch(conn)` in every selected database concurrently; returns (results, failures) by database"""
+    import asyncpg
+
+    config = get_db_config_or_args(args)
+    params = resolve_connection_params(**config, database="postgres", auto_settings=False,
+                                       max_depth_up=args.up_level, max_depth_down=args.down_level)
+    if params is None:
+        return {}, {}
+
+    if getattr(args, 'databases', None):
+        databases = [name.strip() for name in args.databases.split(",") if name.strip()]
+    else:
+        conn = await daemon_connect(**params) or await asyncpg.connect(**params, timeout=10)
+        try:
+            rows = await conn.fetch("""
+                SELECT datname FROM pg_database
+                WHERE datallowconn AND NOT datistemplate
+                ORDER BY datname;
+            """)
+        finally:
+            await conn.close()
+        databases = [row['datname'] for row in rows]
+
+    targets = {database: dict(params, database=database) for database in databases}
+    return await gather_targets(targets, fetch, args.concurrency, args.db_timeout)
+
+
+async def show_across_databases(args, title: str, fetch, columns: list, sort_key=None):
+    """Render the merged rows of run_across_databases as one table with a Database column"""
+    results, failures = await run_across_databases(args, fetch)
+    render_merged(title, "Database", results, failures, columns, sort_key=sort_key)
+
+
+# ============================================================================
+# FLEET (--hosts / --inventory)
+# ============================================================================
+
+FLEET_COMMANDS = ("show dbs", "show connections", "show size", "query")
+
+
+def fleet_requested(args) -> bool:
+    """True when the command should run against a list of hosts"""
+    return bool(getattr(args, 'hosts', None) or getattr(args, 'inventory', None))
+
+
+def split_host_port(spec: str, default_port: int = DEFAULT_PORT) -> tuple:
+    """Split 'host', 'host:port' or '[v6addr]:port' into (host, port)"""
+    spec = spec.strip()
+    if spec.startswith('['):
+        host, _, rest = spec[1:].partition(']')
+        port = rest.lstrip(':')
+        return host, int(port) if port else default_port
+    if spec.count(':') == 1:
+        host, port = spec.split(':')
+        return host, int(port) if port else default_port
+    return spec, default_port
+
+
+def read_inventory_file(path: str) -> Any:
+    """Parse an inventory file as YAML, TOML or JSON, chosen by its extension"""
+    lower = path.lower()
+    with open(path, 'rb') as f:
+        raw = f.read()
+
+    if lower.endswith('.toml'):
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise RuntimeError("TOML inventories need Python 3.11+ or the 'tomli' package (pip install tomli)")
+        return tomllib.loads(raw.decode('utf-8'))
+    if lower.endswith(('.yaml', '.yml')):
+        try:
+            import yaml
+        except ImportError:
+            raise RuntimeError("YAML inventories need the 'PyYAML' package (pip install pyyaml)")
+        return yaml.safe_load(raw)
+    import json
+    return json.loads(raw.decode('utf-8'))
+
+
+def load_inventory(path: str) -> List[Dict[str, Any]]:
+    """Read a host inventory (YAML, TOML or JSON).
+
+    Accepted shapes, with optional `defaults` applied to every host::
+
+        defaults: {user: monitor, port: 5432}
+        hosts:
+          db01: {host: 10.0.0.1, database: app}
+          db02: 10.0.0.2:5433
+
+    `hosts` may also be a list of "host[:port]" strings or mappings, or a comma
+    separated string. Raises ValueError when the file does not have this shape.
+    """
+    data = read_inventory_file(path)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a mapping with a 'hosts' key, got {type(data).__name__}")
+    lowered = {str(key).lower(): value for key, value in data.items()}
+    defaults = lowered.get('defaults') or {}
+    hosts = lowered.get('hosts') or lowered.get('servers')
+    if not isinstance(defaults, dict):
+        raise ValueError(f"{path}: 'defaults' must be a mapping")
+    if not hosts:
+        raise ValueError(f"{path}: no 'hosts' listed")
+
+    if isinstance(hosts, str):
+        hosts = [item.strip() for item in hosts.split(',') if item.strip()]
+    elif isinstance(hosts, dict):
+        hosts = [dict(spec, name=name) if isinstance(spec, dict) else {'name': name, 'host': spec}
+                 for name, spec in hosts.items()]
+    elif not isinstance(hosts, list):
+        raise ValueError(f"{path}: 'hosts' must be a mapping, a list or a comma separated string")
+
+    entries = []
+    for n, spec in enumerate(hosts, 1):
+        if isinstance(spec, (str, int)):
+            spec = {'host': str(spec)}
+        if not isinstance(spec, dict):
+            raise ValueError(f"{path}: host #{n} must be a mapping or a 'host[:port]' string")
+        entry = dict(defaults)
+        entry.update(spec)
+        if not (entry.get('host') or entry.get('hostname')):
+            raise ValueError(f"{path}: host #{n}{' (' + str(entry['name']) + ')' if entry.get('name') else ''} has no 'host'")
+        entries.append(entry)
+    return entries
+
+
+def fleet_targets(args) -> Dict[str, Dict[str, Any]]:
+    """Build host label -> connection parameters from --hosts and --inventory"""
+    base = get_db_config_or_args(args)
+    database = getattr(args, 'database', None) or 'postgres'
+
+    entries = [{'host': spec} for spec in (args.hosts or '').split(',') if spec.strip()]
+    if args.inventory:
+        entries.extend(load_inventory(args.inventory))
+
+    targets = {}
+    for entry in entries:
+        host_spec = str(entry.get('host') or entry.get('hostname') or '')
+        if not host_spec:
+            continue
+        host, port = split_host_port(host_spec, int(entry.get('port') or base.get('port') or DEFAULT_PORT))
+        label = str(entry.get('name') or (host if port == DEFAULT_PORT else f"{host}:{port}"))
+        targets[label] = {
+            'host': host,
+            'port': port,
+            'user': entry.get('user') or entry.get('username') or base.get('user'),
+            'password': entry.get('password') or base.get('password'),
+            'database': entry.get('database') or entry.get('dbname') or database,
+        }
+    return targets
+
+
+async def run_fleet(args):
+    """Run a supported command on every inventory host and print one result keyed by host"""
+    command = f"{args.command} {getattr(args, 'show_command', '') or ''}".strip()
+    if command not in FLEET_COMMANDS:
+        rich_print(f"❌ --hosts/--inventory supports: {', '.join(FLEET_COMMANDS)}", color="#FF4500", bold=True)
+        return
+
+    try:
+        targets = fleet_targets(args)
+    except Exception as e:
+        rich_print(f"❌ Cannot read inventory: {e}", color="#FF4500", bold=True)
+        return
+    if not targets:
+        rich_print("❌ No hosts given. Use --hosts h1,h2:5433 or --inventory FILE", color="#FF4500", bold=True)
+        return
+
+    columns, sort_key = None, None
+    if command == "show dbs":
+        title, fetch = "Databases", fetch_databases
+        columns = [("database", "Database", "cyan"), ("size", "Size", "green"), ("encoding", "Encoding", "yellow"), ("collation", "Collation", "blue")]
+    elif command == "show connections":
+        title, fetch = "Active Connections", fetch_connections
+        columns = [("database", "Database", "cyan"), ("username", "User", "green"), ("client", "Client", "yellow"),
+                   ("state", "State", "blue"), ("query_start", "Query Start", "magenta")]
+    elif command == "show size":
+        sort_key = lambda row: -(row.get('size_bytes') or 0)
+        if args.table:
+            title, fetch = f"Size of table '{args.table}'", lambda conn: fetch_table_sizes(conn, args.table)
+            columns = [("total_size", "Total Size", "green"), ("table_size", "Table Size", "yellow"), ("indexes_size", "Indexes Size", "magenta")]
+        elif args.database:
+            title, fetch = f"Table Sizes in '{args.database}'", fetch_table_sizes
+            columns = [("schema", "Schema", "cyan"), ("table", "Table", "green"), ("total_size", "Total Size", "yellow")]
+        else:
+            title, fetch = "Database Sizes", fetch_database_sizes
+            columns = [("database", "Database", "cyan"), ("size", "Size", "green")]
+    else:
+        if not args.readonly:
+            rich_print("❌ query across hosts requires --readonly", color="#FF4500", bold=True)
+            return
+        queries = query_list(args)
+        if len(queries) != 1:
+            rich_print("❌ query across hosts takes exactly one query", color="#FF4500", bold=True)
+            return
+        if not is_readonly_query(queries[0]):
+            rich_print("❌ Destructive queries not allowed in read-only mode", color="#FF4500", bold=True)
+            return
+        max_rows = args.limit or 100
+        title = "Query Results"
+        fetch = lambda conn: fetch_limited(conn, queries[0], limit=max_rows, prefetch=min(max_rows, 1000), readonly=True)
+
+    rich_print(f"🌐 Running '{command}' on {len(targets)} host(s), {args.host_concurrency} at a time", color="#00CED1")
+    results, failures = await gather_targets(targets, fetch, args.host_concurrency, args.host_timeout)
+    render_merged(title, "Host", results, failures, columns, sort_key=sort_key)
+    rich_print(f"✅ {len(results)} ok, {len(failures)} failed", color="#00FF7F" if not failures else "#FFFF00", bold=True)
+
+
+# ============================================================================
+# CATALOG CACHE
+# ============================================================================
+
+CATALOG_SYSTEM_FILTER = "n.nspname NOT IN ('pg_catalog', 'information_schema') AND n.nspname NOT LIKE 'pg_toast%'"
+
+CATALOG_RELKINDS = "('r', 'p', 'v', 'm', 'f')"
+
+# identity of the database plus one stamp per relation named $1 (in schema $2, NULL for any).
+# DDL on a relation rewrites or deletes at least one of its pg_class, pg_attribute, pg_attrdef
+# or index rows, which moves the highest xmin or the row count of that catalog.
+# The lookups use the per-relation catalog indexes, so the cost does not grow with the catalog.
+CATALOG_STAMPS_SQL = f"""
+    SELECT ident.*, r.oid, r.schema, r.table, r.stamp
+    FROM (SELECT current_database() AS database,
+                 coalesce(host(inet_server_addr()), 'local') AS host,
+                 coalesce(inet_server_port(), 0) AS port) ident
+    LEFT JOIN LATERAL (
+        SELECT c.oid, n.nspname AS schema, c.relname AS table,
+               concat_ws(':', c.xmin, c.relfilenode,
+                   (SELECT max(a.xmin::text::bigint) || '/' || count(*) FROM pg_attribute a WHERE a.attrelid = c.oid),
+                   (SELECT max(d.xmin::text::bigint) || '/' || count(*) FROM pg_attrdef d WHERE d.adrelid = c.oid),
+                   (SELECT max(greatest(i.xmin::text::bigint, ic.xmin::text::bigint)) || '/' || count(*)
+                      FROM pg_index i JOIN pg_class ic ON ic.oid = i.indexrelid WHERE i.indrelid = c.oid)) AS stamp
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN {CATALOG_RELKINDS}
+          AND c.relname = $1
+          AND ($2::name IS NULL OR n.nspname = $2)
+          AND {CATALOG_SYSTEM_FILTER}
+    ) r ON true;
+"""
+
+CATALOG_COLUMNS_SQL = f"""
+    SELECT n.nspname AS schema, c.relname AS table, a.attnum AS ordinal,
+           a.attname AS column_name,
+           format_type(a.atttypid, NULL) AS data_type,
+           CASE WHEN a.atttypid IN ('bpchar'::regtype, 'varchar'::regtype) AND a.atttypmod > 0
+                THEN a.atttypmod - 4 END AS character_maximum_length,
+           CASE WHEN a.attnotnull THEN 'NO' ELSE 'YES' END AS is_nullable,
+           pg_get_expr(d.adbin, d.adrelid) AS column_default
+    FROM pg_attribute a
+    JOIN pg_class c ON c.oid = a.attrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+    WHERE a.attnum > 0 AND NOT a.attisdropped
+      AND c.relkind IN {CATALOG_RELKINDS}
+      AND {CATALOG_SYSTEM_FILTER};
+"""
+
+CATALOG_INDEXES_SQL = f"""
+    SELECT n.nspname AS schema, c.relname AS table,
+           ic.relname AS index_name, pg_get_indexdef(i.indexrelid) AS definition
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indrelid
+    JOIN pg_class ic ON ic.oid = i.indexrelid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE {CATALOG_SYSTEM_FILTER};
+"""
+
+CATALOG_CACHE_SCHEMA = """
+    DROP TABLE IF EXISTS snapshots;
+    DROP TABLE IF EXISTS constraints;
+    CREATE TABLE IF NOT EXISTS relations (key TEXT, schema TEXT, "table" TEXT, oid INTEGER, stamp TEXT NOT NULL,
+                                          built_at REAL NOT NULL, PRIMARY KEY (key, oid));
+    CREATE TABLE IF NOT EXISTS columns (key TEXT, schema TEXT, "table" TEXT, ordinal INTEGER, column_name TEXT,
+                                        data_type TEXT, character_maximum_length INTEGER, is_nullable TEXT, column_default TEXT);
+    CREATE TABLE IF NOT EXISTS indexes (key TEXT, schema TEXT, "table" TEXT, index_name TEXT, definition TEXT);
+    CREATE INDEX IF NOT EXISTS relations_lookup ON relations (key, "table");
+    CREATE INDEX IF NOT EXISTS columns_lookup ON columns (key, "table");
+    CREATE INDEX IF NOT EXISTS indexes_lookup ON indexes (key, "table");
+"""
+
+CATALOG_TABLES = {
+    'columns': ('schema', 'table', 'ordinal', 'column_name', 'data_type', 'character_maximum_length', 'is_nullable', 'column_default'),
+    'indexes': ('schema', 'table', 'index_name', 'definition'),
+}
+
+
+def _catalog_cache_file() -> str:
+    return os.path.join(get_cache_dir(), "catalog.sqlite")
+
+
+def _open_catalog_cache():
+    """Open (creating if needed) the local catalog cache database"""
+    import sqlite3
+
+    path = _catalog_cache_file()
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    db = sqlite3.connect(path, timeout=5)
+    db.row_factory = sqlite3.Row
+    db.executescript(CATALOG_CACHE_SCHEMA)
+    try:
+        os.chmod(path, 0o600)
+    except OSError:
+        pass
+    return db
+
+
+def _catalog_for_oids(sql: str) -> str:
+    """Restrict one of the CATALOG_*_SQL snapshot queries to the relations in $1 (an oid array)"""
+    return sql.rstrip().rstrip(';') + "\n      AND c.oid = ANY($1::oid[]);"
+
+
+async def catalog_snapshot(conn, name: str, schema: str = None):
+    """Return (cache_db, key) with the cached catalog rows of relation `name` up to date.
+
+    One stamp query per lookup compares the matching relations with the stamps
+    stored next to their rows; only relations whose stamp changed (or that
+    appeared or disappeared) have their columns and indexes read again.
+    Returns None when the cache is disabled ($PSQLC_NO_CACHE) or unusable,
+    in which case callers query the server directly.
+    """
+    import time
+    import sqlite3
+
+    if str(os.getenv("PSQLC_NO_CACHE", "")).lower() in ("1", "true", "yes"):
+        return None
+
+    rows = await conn.fetch(CATALOG_STAMPS_SQL, name, schema)
+    key = f"{rows[0]['host']}:{rows[0]['port']}/{rows[0]['database']}"
+    current = {row['oid']: (row['schema'], row['table'], row['stamp']) for row in rows if row['oid'] is not None}
+
+    try:
+        db = _open_catalog_cache()
+    except (OSError, sqlite3.Error) as e:
+        logger.debug(f"catalog cache unavailable: {e}")
+        return None
+
+    sql, params = 'SELECT oid, schema, "table", stamp FROM relations WHERE key = ? AND "table" = ?', [key, name]
+    if schema:
+        sql += ' AND schema = ?'
+        params.append(schema)
+    stored = {row['oid']: (row['schema'], row['table'], row['stamp']) for row in db.execute(sql, params)}
+
+    changed = [oid for oid in set(current) | set(stored) if current.get(oid) != stored.get(oid)]
+    if not changed:
+        logger.debug(f"catalog cache hit for {key} ({len(current)} relation(s))")
+        return db, key
+
+    refresh = [oid for oid in changed if oid in current]
+    logger.debug(f"catalog cache refreshing {len(changed)} relation(s) for {key}")
+    fetched = {'columns': [], 'indexes': []}
+    if refresh:
+        fetched = {
+            'columns': await conn.fetch(_catalog_for_oids(CATALOG_COLUMNS_SQL), refresh),
+            'indexes': await conn.fetch(_catalog_for_oids(CATALOG_INDEXES_SQL), refresh),
+        }
+    names = {stored[oid][:2] for oid in changed if oid in stored} | {current[oid][:2] for oid in refresh}
+    try:
+        with db:
+            for rel_schema, rel_table in names:
+                for kind in CATALOG_TABLES:
+                    db.execute(f'DELETE FROM {kind} WHERE key = ? AND schema = ? AND "table" = ?', (key, rel_schema, rel_table))
+                db.execute('DELETE FROM relations WHERE key = ? AND schema = ? AND "table" = ?', (key, rel_schema, rel_table))
+            db.executemany('DELETE FROM relations WHERE key = ? AND oid = ?', ((key, oid) for oid in changed))
+            for kind, fields in CATALOG_TABLES.items():
+                placeholders = ", ".join("?" * (len(fields) + 1))
+                db.executemany(
+                    f"INSERT INTO {kind} VALUES ({placeholders})",
+                    ((key, *(row[field] for field in fields)) for row in fetched[kind])
+                )
+            now = time.time()
+            db.executemany("INSERT INTO relations VALUES (?, ?, ?, ?, ?, ?)",
+                           ((key, *current[oid][:2], oid, current[oid][2], now) for oid in refresh))
+    except sqlite3.Error as e:
+        logger.debug(f"catalog cache write failed: {e}")
+        db.close()
+        return None
+    return db, key
+
+
+CATALOG_ORDER = {
+    'columns': 'schema, ordinal',
+    'indexes': 'schema, "table", index_name',
+}
+
+
+def split_qualified(table: Optional[str]) -> tuple:
+    """Split 'schema.table' into (schema, table); schema is None for a bare name"""
+    if table and '.' in table:
+        schema, name = table.split('.', 1)
+        return schema, name
+    return None, table
+
+
+async def catalog_lookup(conn, table: str = None, kinds: tuple = ('columns',)) -> Optional[Dict[str, list]]:
+    """Read columns/indexes rows for `table` ('name' or 'schema.name') from the snapshot.
+
+    The relation's stamp is checked once for all `kinds`. Returns None when the cache
+    cannot be used, and for `table=None`: stamping every relation of the database costs
+    more than the single catalog query it would save.
+    """
+    if not table:
+        return None
+    schema, name = split_qualified(table)
+    try:
+        snapshot = await catalog_snapshot(conn, name, schema)
+    except Exception as e:
+        logger.debug(f"catalog cache skipped: {e}")
+        return None
+    if snapshot is None:
+        return None
+
+    db, key = snapshot
+    found = {}
+    try:
+        for kind in kinds:
+            fields = ", ".join(f'"{field}"' for field in CATALOG_TABLES[kind])
+            sql, params = f'SELECT {fields} FROM {kind} WHERE key = ? AND "table" = ?', [key, name]
+            if schema:
+                sql += ' AND schema = ?'
+                params.append(schema)
+            found[kind] = [dict(row) for row in db.execute(f'{sql} ORDER BY {CATALOG_ORDER[kind]}', params)]
+    finally:
+        db.close()
+    return found
+
+
+# ============================================================================
+# SHOW COMMANDS
+# ============================================================================
+
+async def fetch_databases(conn) -> list:
+    """Return non-template databases with size, encoding and collation"""
+    return await conn.fetch("""
+        SELECT 
+            datname AS database,
+            pg_size_pretty(pg_database_size(datname)) AS size,
+            pg_encoding_to_char(encoding) AS encoding,
+            datcollate AS collation
+        FROM pg_database
+        WHERE datistemplate = false
+        ORDER BY datname;
+    """)
+
+
+async def show_databases(args):
+    """List all databases"""
+    from rich.table import Table
+    
+    config = get_db_config_or_args(args)
+    conn = await get_connection(**config, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+    
+    try:
+        results = await fetch_databases(conn)
+        
+        if not results:
+            rich_print("📭 No databases found", color="#FFFF00")
+            return
+        
+        table = Table(title="PostgreSQL Databases", show_header=True, header_style="bold magenta")
+        table.add_column("Database", style="cyan")
+        table.add_column("Size", style="green")
+        table.add_column("Encoding", style="yellow")
+        table.add_column("Collation", style="blue")
+        
+        for row in results:
+            table.add_row(row['database'], row['size'], row['encoding'], row['collation'])
+        
+        print_table(table)
+    
+    except Exception as e:
+        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+    finally:
+        await conn.close()
+
+
+SHOW_TABLES_FILTER = """
+    c.relkind IN ('r', 'p')
+    AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+    AND n.nspname NOT LIKE 'pg_toast%'
+    AND ($1::text IS NULL OR n.nspname = $1)
+    AND ($2::text IS NULL OR c.relname LIKE $2)
+"""
+
+# page by (schema, table); sizes and column counts only for the rows on the page
+SHOW_TABLES_BY_NAME_SQL = f"""
+    SELECT t.schema, t.table, t.oid,
+           pg_size_pretty(pg_total_relation_size(t.oid)) AS size,
+           pg_total_relation_size(t.oid) AS size_bytes,
+           (SELECT count(*) FROM pg_attribute a
+             WHERE a.attrelid = t.oid AND a.attnum > 0 AND NOT a.attisdropped) AS columns
+    FROM (
+        SELECT n.nspname AS schema, c.relname AS table, c.oid
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE {SHOW_TABLES_FILTER}
+          AND ($3::name IS NULL OR (n.nspname, c.relname) > ($3::name, $4::name))
+        ORDER BY n.nspname, c.relname
+        LIMIT $5
+    ) t
+    ORDER BY t.schema, t.table;
+"""
+
+# page by (size, oid) descending; every matching relation has to be sized to sort
+SHOW_TABLES_BY_SIZE_SQL = f"""
+    SELECT t.schema, t.table, t.oid,
+           pg_size_pretty(t.size_bytes) AS size,
+           t.size_bytes,
+           (SELECT count(*) FROM pg_attribute a
+             WHERE a.attrelid = t.oid AND a.attnum > 0 AND NOT a.attisdropped) AS columns
+    FROM (
+        SELECT n.nspname AS schema, c.relname AS table, c.oid, pg_total_relation_size(c.oid) AS size_bytes
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE {SHOW_TABLES_FILTER}
+    ) t
+    WHERE ($3::bigint IS NULL OR (t.size_bytes, t.oid) < ($3::bigint, $4::oid))
+    ORDER BY t.size_bytes DESC, t.oid DESC
+    LIMIT $5;
+"""
+
+
+def like_pattern(pattern: Optional[str]) -> Optional[str]:
+    """Turn a glob ('user_*', '?' for one character) into a LIKE pattern.
+
+    A pattern containing % is taken as LIKE and passed through unchanged. Otherwise
+    _ is literal and escaped, so 'user_1' matches only that name.
+    """
+    if not pattern:
+        return None
+    if '%' in pattern:
+        return pattern
+    return pattern.replace('_', '\\_').replace('*', '%').replace('?', '_')
+
+
+_NAME_TOKEN = None
+
+
+def name_page_token(schema: str, table: str) -> str:
+    """Page token for sorting by name: both parts as quoted identifiers, so dots in names stay unambiguous"""
+    return f"{quote_ident(schema)}.{quote_ident(table)}"
+
+
+def parse_name_page_token(token: str) -> tuple:
+    """Return (schema, table) from a name_page_token; a bare "schema.table" is split on its first dot"""
+    global _NAME_TOKEN
+    if _NAME_TOKEN is None:
+        import re
+        _NAME_TOKEN = re.compile(r'"((?:[^"]|"")*)"\."((?:[^"]|"")*)"')
+    m = _NAME_TOKEN.fullmatch(token)
+    if m:
+        return m.group(1).replace('""', '"'), m.group(2).replace('""', '"')
+    if '.' not in token:
+        raise ValueError(f"invalid page token: {token}")
+    schema, table = token.split('.', 1)
+    return schema, table
+
+
+async def fetch_tables_page(conn, schema: str = None, pattern: str = None, sort: str = 'name',
+                            after: str = None, limit: int = 1000) -> tuple:
+    """Fetch one keyset page of tables; return (rows, next_after) where next_after is None on the last page.
+
+    `after` is the token printed for the previous page: '"schema"."table"'
+    when sorting by name, "size_bytes:oid" when sorting by size. One row more
+    than `limit` is fetched to tell whether another page exists.
+    """
+    like = like_pattern(pattern)
+    if sort == 'size':
+        size_key = oid_key = None
+        if after:
+            size_key, oid_key = (int(part) for part in after.split(':', 1))
+        rows = await conn.fetch(SHOW_TABLES_BY_SIZE_SQL, schema, like, size_key, oid_key, limit + 1)
+        rows, more = rows[:limit], len(rows) > limit
+        next_after = f"{rows[-1]['size_bytes']}:{rows[-1]['oid']}" if more else None
+    else:
+        schema_key = table_key = None
+        if after:
+            schema_key, table_key = parse_name_page_token(after)
+        rows = await conn.fetch(SHOW_TABLES_BY_NAME_SQL, schema, like, schema_key, table_key, limit + 1)
+        rows, more = rows[:limit], len(rows) > limit
+        next_after = name_page_token(rows[-1]['schema'], rows[-1]['table']) if more else None
+    return rows, next_after
+
+
+async def show_tables(args):
+    """List tables in a database, one keyset page at a time"""
+    from rich.table import Table
+    
+    if fan_out_requested(args):
+        async def fetch(conn):
+            rows, _ = await fetch_tables_page(conn, schema=args.schema, pattern=args.pattern, sort=args.sort, limit=args.limit or 1000)
+            return rows
+
+        await show_across_databases(
+            args, "Tables", fetch,
+            [("schema", "Schema", "cyan"), ("table", "Table", "green"), ("size", "Size", "yellow"), ("columns", "Columns", "blue")],
+            sort_key=(lambda row: -(row.get('size_bytes') or 0)) if args.sort == 'size' else None
+        )
+        return
+
+    if not args.database:
+        db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
+        if db_config and db_config.get('database'):
+            args.database = db_config.get('database')
+            rich_print(f"📄 Using database: {args.database}", color="#00CED1")
+        else:
+            rich_print("❌ Database name required. Use -d/--database", color="#FF4500", bold=True)
+            return
+    
+    config = get_db_config_or_args(args)
+    conn = await get_connection(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+    
+    try:
+        results, next_after = await fetch_tables_page(
+            conn, schema=getattr(args, 'schema', None), pattern=getattr(args, 'pattern', None),
+            sort=getattr(args, 'sort', None) or 'name', after=getattr(args, 'after', None),
+            limit=getattr(args, 'limit', None) or 1000
+        )
+        
+        if not results:
+            rich_print(f"📭 No tables found in '{args.database}'", color="#FFFF00")
+            return
+        
+        table = Table(title=f"Tables in '{args.database}'", show_header=True, header_style="bold magenta")
+        table.add_column("Schema", style="cyan")
+        table.add_column("Table", style="green")
+        table.add_column("Size", style="yellow")
+        table.add_column("Columns", style="blue")
+        
+        for row in results:
+            table.add_row(row['schema'], row['table'], row['size'], str(row['columns']))
+        
+        print_table(table)
+
+        if next_after:
+            import shlex
+            rich_print(f"⚠️ Showing {len(results)} tables. Next page: --after {shlex.quote(next_after)}", color="#FFFF00", bold=True)
+    
+    except Exception as e:
+        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+    finally:
+        await conn.close()
+
+
+async def show_users(args):
+    """List all database users/roles"""
+    from rich.table import Table
+    
+    config = get_db_config_or_args(args)
+    conn = await get_connection(**config, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+    
+    try:
+        results = await conn.fetch("""
+            SELECT 
+                rolname AS username,
+                rolsuper AS superuser,
+                rolcreatedb AS create_db,
+                rolcreaterole AS create_role,
+                rolcanlogin AS can_login,
+                rolreplication AS replication
+            FROM pg_roles
+            WHERE rolname NOT LIKE 'pg_%'
+            ORDER BY rolname;
+        """)
+        
+        table = Table(title="PostgreSQL Users", show_header=True, header_style="bold magenta")
+        table.add_column("Username", style="cyan")
+        table.add_column("Superuser", style="red")
+        table.add_column("Create DB", style="green")
+        table.add_column("Create Role", style="yellow")
+        table.add_column("Can Login", style="blue")
+        table.add_column("Replication", style="magenta")
+        
+        for row in results:
+            table.add_row(
+                row['username'], str(row['superuser']), str(row['create_db']),
+                str(row['create_role']), str(row['can_login']), str(row['replication'])
+            )
+        
+        print_table(table)
+    
+    except Exception as e:
+        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+    finally:
+        await conn.close()
+
+
+async def fetch_connections(conn) -> list:
+    """Return client sessions from pg_stat_activity, newest query first"""
+    return await conn.fetch("""
+        SELECT 
+            datname AS database,
+            usename AS username,
+            client_addr AS client,
+            state,
+            query_start,
+            state_change
+        FROM pg_stat_activity
+        WHERE datname IS NOT NULL
+        ORDER BY query_start DESC;
+    """)
+
+
+async def show_connections(args):
+    """Show active database connections"""
+    from rich.table import Table
+    
+    config = get_db_config_or_args(args)
+    conn = await get_connection(**config, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+    
+    try:
+        results = await fetch_connections(conn)
+        
+        if not results:
+            rich_print("📭 No active connections", color="#FFFF00")
+            return
+        
+        table = Table(title="Active Connections", show_header=True, header_style="bold magenta")
+        table.add_column("Database", style="cyan")
+        table.add_column("User", style="green")
+        table.add_column("Client", style="yellow")
+        table.add_column("State", style="blue")
+        table.add_column("Query Start", style="magenta")
+        table.add_column("State Change", style="red")
+        
+        for row in results:
+            table.add_row(
+                str(row['database'] or "-"), str(row['username'] or "-"),
+                str(row['client'] or "-"), str(row['state'] or "-"),
+                str(row['query_start'] or "-"), str(row['state_change'] or "-")
+            )
+        
+        print_table(table)
+    
+    except Exception as e:
+        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+    finally:
+        await conn.close()
+
+
+async def fetch_indexes(conn, table: str = None) -> list:
+    """Return indexes (schema, table, index_name, definition), optionally for one table"""
+    cached = await catalog_lookup(conn, table, ('indexes',))
+    if cached is not None:
+        return cached['indexes']
+    schema, name = split_qualified(table)
+    return await conn.fetch("""
+        SELECT schemaname AS schema, tablename AS table,
+               indexname AS index_name, indexdef AS definition
+        FROM pg_indexes
+        WHERE schemaname NOT IN ('pg_catalog', 'information_schema')
+          AND ($1::text IS NULL OR tablename = $1)
+          AND ($2::text IS NULL OR schemaname = $2)
+        ORDER BY schemaname, tablename, indexname;
+    """, name, schema)
+
+
+async def show_indexes(args):
+    """Show indexes in a table or database"""
+    from rich.table import Table
+    
+    if fan_out_requested(args):
+        await show_across_databases(
+            args, f"Indexes in table '{args.table}'" if args.table else "Indexes",
+            lambda conn: fetch_indexes(conn, args.table),
+            [("schema", "Schema", "cyan"), ("table", "Table", "green"), ("index_name", "Index Name", "yellow"), ("definition", "Definition", "blue")]
+        )
+        return
+
+    if not args.database:
+        db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
+        if db_config and db_config.get('database'):
+            args.database = db_config.get('database')
+            rich_print(f"📄 Using database: {args.database}", color="#00CED1")
+        else:
+            rich_print("❌ Database name required. Use -d/--database", color="#FF4500", bold=True)
+            return
+    
+    config = get_db_config_or_args(args)
+    conn = await get_connection(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+    
     try:
-        results = await conn.fetch("""
-            SELECT 
-                datname AS database,
-                pg_size_pretty(pg_database_size(datname)) AS size,
-                pg_encoding_to_char(encoding) AS encoding,
-                datcollate AS collation
-            FROM pg_database
-            WHERE datistemplate = false
-            ORDER BY datname;
-        """)
+        results = await fetch_indexes(conn, args.table)
+        title = f"Indexes in table '{args.table}'" if args.table else f"Indexes in database '{args.database}'"
         
         if not results:
-            rich_print("📭 No databases found", color="#FFFF00")
+            rich_print(f"📭 No indexes found", color="#FFFF00")
+            return
+        
+        table = Table(title=title, show_header=True, header_style="bold magenta")
+        
+        if args.table:
+            table.add_column("Index Name", style="cyan")
+            table.add_column("Definition", style="green")
+            for row in results:
+                table.add_row(row['index_name'], row['definition'])
+        else:
+            table.add_column("Schema", style="cyan")
+            table.add_column("Table", style="green")
+            table.add_column("Index Name", style="yellow")
+            table.add_column("Definition", style="blue")
+            for row in results:
+                table.add_row(row['schema'], row['table'], row['index_name'], row['definition'])
+        
+        print_table(table)
+    
+    except Exception as e:
+        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+    finally:
+        await conn.close()
+
+
+async def fetch_database_sizes(conn) -> list:
+    """Return non-template database sizes, largest first"""
+    return await conn.fetch("""
+        SELECT datname AS database,
+               pg_size_pretty(pg_database_size(datname)) AS size,
+               pg_database_size(datname) AS size_bytes
+        FROM pg_database
+        WHERE datistemplate = false
+        ORDER BY pg_database_size(datname) DESC;
+    """)
+
+
+async def fetch_table_sizes(conn, table: str = None) -> list:
+    """Return table sizes, largest first; with `table`, its total/table/indexes split (empty if missing)"""
+    if table:
+        return await conn.fetch("""
+            SELECT pg_size_pretty(pg_total_relation_size(r.oid)) AS total_size,
+                   pg_size_pretty(pg_relation_size(r.oid)) AS table_size,
+                   pg_size_pretty(pg_total_relation_size(r.oid) - pg_relation_size(r.oid)) AS indexes_size,
+                   pg_total_relation_size(r.oid) AS size_bytes
+            FROM (SELECT to_regclass($1) AS oid) r
+            WHERE r.oid IS NOT NULL;
+        """, table)
+    return await conn.fetch("""
+        SELECT n.nspname AS schema, c.relname AS table,
+               pg_size_pretty(pg_total_relation_size(c.oid)) AS total_size,
+               pg_total_relation_size(c.oid) AS size_bytes
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'p')
+          AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+          AND n.nspname NOT LIKE 'pg_toast%'
+        ORDER BY pg_total_relation_size(c.oid) DESC;
+    """)
+
+
+async def show_size(args):
+    """Show database or table sizes"""
+    from rich.table import Table
+    
+    if fan_out_requested(args):
+        if args.table:
+            columns = [("total_size", "Total Size", "green"), ("table_size", "Table Size", "yellow"), ("indexes_size", "Indexes Size", "magenta")]
+        else:
+            columns = [("schema", "Schema", "cyan"), ("table", "Table", "green"), ("total_size", "Total Size", "yellow")]
+        await show_across_databases(
+            args, f"Size of table '{args.table}'" if args.table else "Table Sizes",
+            lambda conn: fetch_table_sizes(conn, args.table), columns,
+            sort_key=lambda row: -(row.get('size_bytes') or 0)
+        )
+        return
+
+    if not args.database:
+        db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
+        if db_config and db_config.get('database'):
+            args.database = db_config.get('database')
+            rich_print(f"📄 Using database: {args.database}", color="#00CED1")
+        else:
+            # Show all database sizes
+            config = get_db_config_or_args(args)
+            conn = await get_connection(**config, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+            
+            try:
+                results = await fetch_database_sizes(conn)
+                
+                table = Table(title="Database Sizes", show_header=True, header_style="bold magenta")
+                table.add_column("Database", style="cyan")
+                table.add_column("Size", style="green")
+                
+                total_size = sum(row['size_bytes'] for row in results)
+                for row in results:
+                    table.add_row(row['database'], row['size'])
+                
+                print_table(table)
+                rich_print(f"\n📊 Total Size: {total_size / (1024**3):.2f} GB", color="#00CED1", bold=True)
+            
+            except Exception as e:
+                rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+            finally:
+                await conn.close()
+            return
+    
+    config = get_db_config_or_args(args)
+    conn = await get_connection(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+    
+    try:
+        if args.table:
+            sizes = await fetch_table_sizes(conn, args.table)
+            result = sizes[0] if sizes else None
+            
+            if result:
+                rich_print(f"\n📊 Size of table '{args.table}':", color="#00CED1", bold=True)
+                rich_print(f"   Total Size:   {result['total_size']}", color="#00FF7F")
+                rich_print(f"   Table Size:   {result['table_size']}", color="#FFFF00")
+                rich_print(f"   Indexes Size: {result['indexes_size']}", color="#FF69B4")
+            else:
+                rich_print(f"❌ Table '{args.table}' not found", color="#FF4500", bold=True)
+        else:
+            results = await fetch_table_sizes(conn)
+            
+            if not results:
+                rich_print(f"📭 No tables found in '{args.database}'", color="#FFFF00")
+                return
+            
+            table = Table(title=f"Table Sizes in '{args.database}'", show_header=True, header_style="bold magenta")
+            table.add_column("Schema", style="cyan")
+            table.add_column("Table", style="green")
+            table.add_column("Total Size", style="yellow")
+            
+            total_size = sum(row['size_bytes'] for row in results)
+            for row in results:
+                table.add_row(row['schema'], row['table'], row['total_size'])
+            
+            print_table(table)
+            rich_print(f"\n📊 Total Size: {total_size / (1024**3):.2f} GB", color="#00CED1", bold=True)
+    
+    except Exception as e:
+        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+    finally:
+        await conn.close()
+
+# delta field used to rank `show slow`, per --sort
+SLOW_SORT_KEYS = {"time": "total_ms", "mean": "mean_ms", "calls": "calls", "rows": "rows", "io": "reads", "hits": "hits"}
+SLOW_FIELDS = ("calls", "total_ms", "rows", "hits", "reads")
+
+
+async def fetch_statement_stats(conn) -> Dict[str, list]:
+    """Snapshot pg_stat_statements without query texts: {"userid:dbid:queryid": [calls, total_ms, rows, hits, reads]}.
+
+    Reading the texts means reading pg_stat_statements' whole external query file,
+    so snapshots skip them (showtext => false) and fetch_statement_texts() reads
+    only the few that are printed. Top-level and nested entries of one queryid
+    (pg_stat_statements.track = all) are added together.
+    """
+    schema = await conn.fetchval("SELECT extnamespace::regnamespace::text FROM pg_extension WHERE extname = 'pg_stat_statements'")
+    if schema is None:
+        raise LookupError("pg_stat_statements is not installed in this database")
+    time_column = "total_exec_time" if conn.get_server_version() >= (13,) else "total_time"
+    rows = await conn.fetch(f"""
+        SELECT userid, dbid, queryid, calls, {time_column} AS total_ms, rows,
+               shared_blks_hit AS hits, shared_blks_read AS reads
+        FROM {schema}.pg_stat_statements(false)
+        WHERE queryid IS NOT NULL;
+    """)
+    snapshot = {}
+    for row in rows:
+        values = snapshot.setdefault(f"{row['userid']}:{row['dbid']}:{row['queryid']}", [0, 0.0, 0, 0, 0])
+        for index, field in enumerate(SLOW_FIELDS):
+            values[index] += row[field]
+    return snapshot
+
+
+async def fetch_statement_texts(conn, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Query text, database and role for the given "userid:dbid:queryid" keys"""
+    schema = await conn.fetchval("SELECT extnamespace::regnamespace::text FROM pg_extension WHERE extname = 'pg_stat_statements'")
+    rows = await conn.fetch(f"""
+        SELECT DISTINCT ON (s.userid, s.dbid, s.queryid)
+               s.userid, s.dbid, s.queryid, d.datname AS database, r.rolname AS username, s.query
+        FROM {schema}.pg_stat_statements(true) s
+        LEFT JOIN pg_database d ON d.oid = s.dbid
+        LEFT JOIN pg_roles r ON r.oid = s.userid
+        WHERE s.queryid = ANY($1::bigint[]);
+    """, [int(key.rsplit(":", 1)[1]) for key in keys])
+    return {f"{row['userid']}:{row['dbid']}:{row['queryid']}": dict(row) for row in rows}
+
+
+def statement_deltas(before: Dict[str, list], after: Dict[str, list]) -> List[Dict[str, Any]]:
+    """Per-entry difference of two snapshots, for entries called in between.
+
+    An entry missing from `before`, or with fewer calls than before (evicted or
+    reset and created again), counts in full.
+    """
+    deltas = []
+    for key, values in after.items():
+        previous = before.get(key)
+        if previous is None or values[0] < previous[0]:
+            previous = (0, 0.0, 0, 0, 0)
+        delta = dict(zip(SLOW_FIELDS, (value - old for value, old in zip(values, previous))))
+        if delta["calls"] > 0:
+            delta["key"] = key
+            delta["mean_ms"] = delta["total_ms"] / delta["calls"]
+            deltas.append(delta)
+    return deltas
+
+
+async def show_slow(args):
+    """Rank the statements that ran during a window by pg_stat_statements deltas.
+
+    The window is --interval seconds between two snapshots, or the time since a
+    snapshot saved earlier with --save when --since is given, so the numbers show
+    what is expensive now rather than totals since the last stats reset.
+    """
+    import json
+    import time
+    from rich.table import Table
+
+    config = get_db_config_or_args(args)
+    conn = await get_connection(**config, database=args.database or "postgres", auto_settings=False,
+                                max_depth_up=args.up_level, max_depth_down=args.down_level, use_daemon=False)
+    if conn is None:
+        return
+
+    try:
+        if args.since:
+            try:
+                with open(args.since, "r", encoding="utf-8") as f:
+                    saved = json.load(f)
+                before, window = saved["statements"], time.time() - saved["taken_at"]
+            except (OSError, ValueError, KeyError) as e:
+                rich_print(f"❌ Cannot read snapshot {args.since}: {e}", color="#FF4500", bold=True)
+                return
+            after = await fetch_statement_stats(conn)
+        else:
+            started = time.monotonic()
+            before = await fetch_statement_stats(conn)
+            rich_print(f"⏳ Sampling pg_stat_statements for {args.interval:g}s ...", color="#00CED1")
+            await asyncio.sleep(args.interval)
+            after = await fetch_statement_stats(conn)
+            window = time.monotonic() - started
+
+        if args.save:
+            with open(args.save, "w", encoding="utf-8") as f:
+                json.dump({"taken_at": time.time(), "statements": after}, f)
+            rich_print(f"💾 Snapshot saved to {args.save}", color="#00CED1")
+
+        deltas = statement_deltas(before, after)
+        if not deltas:
+            rich_print(f"📭 No statements ran in the last {window:.1f}s", color="#FFFF00")
+            return
+        sort_key = SLOW_SORT_KEYS[args.sort]
+        deltas.sort(key=lambda delta: delta[sort_key], reverse=True)
+        top = deltas[:args.limit]
+        texts = await fetch_statement_texts(conn, [delta["key"] for delta in top])
+
+        total_ms = sum(delta["total_ms"] for delta in deltas) or 1e-9
+        table = Table(title=f"Top statements over {window:.1f}s by {args.sort}", show_header=True, header_style="bold magenta")
+        table.add_column("#", style="cyan", justify="right")
+        table.add_column("Database", style="cyan")
+        table.add_column("Calls", style="green", justify="right")
+        table.add_column("Total ms", style="yellow", justify="right")
+        table.add_column("Mean ms", style="yellow", justify="right")
+        table.add_column("% Time", style="magenta", justify="right")
+        table.add_column("Rows", style="green", justify="right")
+        table.add_column("Hit %", style="blue", justify="right")
+        table.add_column("Reads", style="red", justify="right")
+        table.add_column("Query", style="white")
+        for rank, delta in enumerate(top, 1):
+            info = texts.get(delta["key"], {})
+            query = " ".join(str(info.get("query") or "?").split())
+            blocks = delta["hits"] + delta["reads"]
+            table.add_row(
+                str(rank), str(info.get("database") or "-"), f"{delta['calls']:,}",
+                f"{delta['total_ms']:,.1f}", f"{delta['mean_ms']:,.2f}", f"{delta['total_ms'] / total_ms * 100:.1f}",
+                f"{delta['rows']:,}", f"{delta['hits'] / blocks * 100:.1f}" if blocks else "-", f"{delta['reads']:,}",
+                query[:80] + ("..." if len(query) > 80 else "")
+            )
+        print_table(table)
+        calls = sum(delta["calls"] for delta in deltas)
+        rich_print(f"\n📊 {len(deltas)} statements, {calls:,} calls, {total_ms / 1000:,.2f}s execution time "
+                   f"({calls / max(window, 1e-9):,.1f} calls/s)", color="#00CED1", bold=True)
+
+    except LookupError as e:
+        rich_print(f"❌ {e} ('{args.database or 'postgres'}'). Add it to shared_preload_libraries "
+                   f"and run CREATE EXTENSION pg_stat_statements", color="#FF4500", bold=True)
+    except Exception as e:
+        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+    finally:
+        await conn.close()
+
+async def connect(database="template1", user='postgres', password='', host='127.0.0.1', port=5432):
+    import asyncpg
+    try:
+        conn = await asyncpg.connect(database=database, user=user, password=password, host=host, port=port)
+        return conn
+    except Exception as e:
+        if str(os.getenv("TRACEBACK", "0")).lower() in ["1", "true", "yes"]:
+            if tprint:
+                tprint(e)
+            else:
+                import traceback
+                print(traceback.format_exc())
+        else:
+            rich_print(f"❌ Error (new user connection): {e}", color="#FF4500", bold=True)
+    return
+
+# ============================================================================
+# TOP (live dashboard)
+# ============================================================================
+
+TOP_SESSIONS_SQL = """
+    SELECT pid, datname AS database, usename AS username, client_addr AS client,
+           state, wait_event_type, wait_event,
+           date_trunc('second', clock_timestamp() - coalesce(xact_start, query_start)) AS duration,
+           left(regexp_replace(query, '\\s+', ' ', 'g'), 80) AS query
+    FROM pg_stat_activity
+    WHERE pid <> pg_backend_pid()
+      AND backend_type = 'client backend'
+      AND state IS DISTINCT FROM 'idle'
+    ORDER BY coalesce(xact_start, query_start) NULLS LAST
+    LIMIT $1;
+"""
+
+TOP_WAITS_SQL = """
+    SELECT wait_event_type, wait_event, count(*) AS sessions
+    FROM pg_stat_activity
+    WHERE pid <> pg_backend_pid()
+      AND wait_event IS NOT NULL
+      AND state IS DISTINCT FROM 'idle'
+    GROUP BY wait_event_type, wait_event
+    ORDER BY count(*) DESC
+    LIMIT 10;
+"""
+
+TOP_BLOCKING_SQL = """
+    SELECT blocked.pid AS blocked_pid, blocked.usename AS blocked_user,
+           blocker.pid AS blocking_pid, blocker.usename AS blocking_user,
+           date_trunc('second', clock_timestamp() - blocked.query_start) AS waiting,
+           left(regexp_replace(blocked.query, '\\s+', ' ', 'g'), 60) AS blocked_query,
+           left(regexp_replace(blocker.query, '\\s+', ' ', 'g'), 60) AS blocking_query
+    FROM pg_stat_activity blocked
+    CROSS JOIN LATERAL unnest(pg_blocking_pids(blocked.pid)) AS b(pid)
+    JOIN pg_stat_activity blocker ON blocker.pid = b.pid
+    ORDER BY blocked.query_start
+    LIMIT 20;
+"""
+
+TOP_COUNTERS_SQL = """
+    SELECT current_database() AS database,
+           sum(xact_commit)::bigint AS commits,
+           sum(xact_rollback)::bigint AS rollbacks,
+           sum(tup_returned + tup_fetched)::bigint AS reads,
+           sum(tup_inserted + tup_updated + tup_deleted)::bigint AS writes,
+           sum(blks_read)::bigint AS blks_read,
+           sum(blks_hit)::bigint AS blks_hit,
+           (SELECT count(*) FROM pg_stat_activity WHERE backend_type = 'client backend') AS connections
+    FROM pg_stat_database;
+"""
+
+
+def counter_rates(previous: Optional[Dict[str, Any]], current: Dict[str, Any], elapsed: float) -> Dict[str, float]:
+    """Per-second rates between two pg_stat_database samples (empty for the first sample)"""
+    if not previous or elapsed <= 0:
+        return {}
+    delta = {key: (current[key] or 0) - (previous[key] or 0) for key in ('commits', 'rollbacks', 'reads', 'writes', 'blks_read', 'blks_hit')}
+    blocks = delta['blks_read'] + delta['blks_hit']
+    return {
+        'tps': (delta['commits'] + delta['rollbacks']) / elapsed,
+        'commits': delta['commits'] / elapsed,
+        'rollbacks': delta['rollbacks'] / elapsed,
+        'reads': delta['reads'] / elapsed,
+        'writes': delta['writes'] / elapsed,
+        'hit_ratio': (delta['blks_hit'] / blocks * 100) if blocks else None,
+    }
+
+
+def render_top(database: str, interval: float, rates: Dict[str, float], counters: Dict[str, Any], sessions, waits, blocking):
+    """Build the renderable shown by `psqlc top` for one sample"""
+    import time
+    from rich.console import Group
+    from rich.table import Table
+    from rich.text import Text
+
+    if rates:
+        hit = f"{rates['hit_ratio']:.1f}%" if rates['hit_ratio'] is not None else "-"
+        summary = (f"TPS {rates['tps']:,.1f}  (commit {rates['commits']:,.1f}/s, rollback {rates['rollbacks']:,.1f}/s)   "
+                   f"rows read {rates['reads']:,.0f}/s   rows written {rates['writes']:,.0f}/s   cache hit {hit}")
+    else:
+        summary = "TPS -  (waiting for a second sample)"
+    header = Text.assemble(
+        ("psqlc top", "bold #00CED1"), f"  {database}  every {interval:g}s  {time.strftime('%H:%M:%S')}  ",
+        (f"{counters['connections']} connections", "bold"), "\n", (summary, "#00FF7F"),
+    )
+
+    sessions_table = Table(title=f"Active sessions ({len(sessions)})", show_header=True, header_style="bold magenta", expand=True)
+    for name, style in (("PID", "cyan"), ("Database", "green"), ("User", "yellow"), ("State", "blue"),
+                        ("Wait", "red"), ("Duration", "magenta"), ("Query", "white")):
+        sessions_table.add_column(name, style=style, overflow="ellipsis", no_wrap=(name == "Query"))
+    for row in sessions:
+        wait = f"{row['wait_event_type']}:{row['wait_event']}" if row['wait_event'] else "-"
+        sessions_table.add_row(str(row['pid']), str(row['database'] or "-"), str(row['username'] or "-"), str(row['state'] or "-"),
+                               wait, str(row['duration'] or "-"), row['query'] or "")
+
+    waits_table = Table(title="Wait events", show_header=True, header_style="bold magenta")
+    waits_table.add_column("Type", style="cyan")
+    waits_table.add_column("Event", style="yellow")
+    waits_table.add_column("Sessions", style="green", justify="right")
+    for row in waits:
+        waits_table.add_row(row['wait_event_type'], row['wait_event'], str(row['sessions']))
+
+    parts = [header, sessions_table, waits_table]
+    if blocking:
+        blocking_table = Table(title=f"Blocking locks ({len(blocking)})", show_header=True, header_style="bold red", expand=True)
+        for name, style in (("Blocked", "yellow"), ("By", "red"), ("Waiting", "magenta"), ("Blocked query", "white"), ("Blocking query", "white")):
+            blocking_table.add_column(name, style=style, overflow="ellipsis", no_wrap=name.endswith("query"))
+        for row in blocking:
+            blocking_table.add_row(f"{row['blocked_pid']} ({row['blocked_user']})", f"{row['blocking_pid']} ({row['blocking_user']})",
+                                   str(row['waiting'] or "-"), row['blocked_query'] or "", row['blocking_query'] or "")
+        parts.append(blocking_table)
+    return Group(*parts)
+
+
+async def top_dashboard(args):
+    """Refresh sessions, wait events, blocking locks and TPS on one connection until interrupted"""
+    import time
+    import signal
+    from rich.live import Live
+
+    config = get_db_config_or_args(args)
+    conn = await get_connection(**config, database=args.database or "postgres", auto_settings=False,
+                                max_depth_up=args.up_level, max_depth_down=args.down_level, use_daemon=False)
+    if conn is None:
+        return
+
+    interval = max(args.interval, 0.1)
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+    try:
+        statements = {
+            'sessions': await conn.prepare(TOP_SESSIONS_SQL),
+            'waits': await conn.prepare(TOP_WAITS_SQL),
+            'blocking': await conn.prepare(TOP_BLOCKING_SQL),
+            'counters': await conn.prepare(TOP_COUNTERS_SQL),
+        }
+        previous, previous_at, samples = None, None, 0
+        with Live(auto_refresh=False, screen=not args.no_screen, redirect_stderr=False) as live:
+            while not stop.is_set():
+                started = time.monotonic()
+                counters = dict(await statements['counters'].fetchrow())
+                sessions = await statements['sessions'].fetch(args.limit)
+                waits = await statements['waits'].fetch()
+                blocking = await statements['blocking'].fetch()
+
+                rates = counter_rates(previous, counters, started - previous_at if previous_at else 0)
+                previous, previous_at = counters, started
+                live.update(render_top(counters['database'], interval, rates, counters, sessions, waits, blocking), refresh=True)
+
+                samples += 1
+                if args.iterations and samples >= args.iterations:
+                    break
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=max(0.0, interval - (time.monotonic() - started)))
+                except asyncio.TimeoutError:
+                    pass
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+    except Exception as e:
+        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+    finally:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.remove_signal_handler(sig)
+            except (NotImplementedError, RuntimeError):
+                pass
+        await conn.close()
+
+
+# ============================================================================
+# PING (connection and round-trip latency)
+# ============================================================================
+
+def percentile(ordered: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list (0.0 when empty)"""
+    if not ordered:
+        return 0.0
+    rank = -(-pct * len(ordered) // 100)
+    return ordered[min(max(int(rank), 1), len(ordered)) - 1]
+
+
+def latency_table(title: str, samples: Dict[str, List[float]]):
+    """Rich table of min/p50/p95/p99/max in ms for each named list of seconds"""
+    from rich.table import Table
+
+    table = Table(title=title, show_header=True, header_style="bold magenta")
+    table.add_column("Phase", style="cyan")
+    for column in ("min", "p50", "p95", "p99", "max"):
+        table.add_column(column, style="green" if column != "p99" else "yellow", justify="right")
+    table.add_column("n", style="blue", justify="right")
+    for name, values in samples.items():
+        ordered = sorted(values)
+        if not ordered:
+            continue
+        cells = [ordered[0], percentile(ordered, 50), percentile(ordered, 95), percentile(ordered, 99), ordered[-1]]
+        table.add_row(name, *(f"{value * 1000:.2f}" for value in cells), str(len(ordered)))
+    return table
+
+
+async def ping_database(args):
+    """Time --count fresh connections (DNS, TCP, auth, first query) and --count queries
+    on already open connections, --concurrency at a time, and report percentiles.
+
+    Fresh probes show what a short-lived client pays per connection; reused probes are
+    the bare round trip of --query, so comparing the two separates connection setup
+    from server and network latency.
+    """
+    import time
+
+    config = get_db_config_or_args(args)
+    params = resolve_connection_params(**config, database=args.database or "postgres", auto_settings=False,
+                                       max_depth_up=args.up_level, max_depth_down=args.down_level)
+    if params is None:
+        return
+
+    count = max(1, args.count)
+    concurrency = max(1, min(args.concurrency, count))
+    fresh = {"dns": [], "tcp": [], "auth": [], "query": [], "total": []}
+    reused = {"query": []}
+    failed = []
+
+    def show(mode: str, seq: int, phases: Dict[str, float]):
+        if not args.quiet:
+            detail = "  ".join(f"{name}={seconds * 1000:.2f}" for name, seconds in phases.items())
+            rich_print(f"  {mode:<6} seq={seq:<4} {detail} ms", color="#AAAAAA")
+
+    async def fresh_probe(sequence):
+        for seq in sequence:
+            started = time.perf_counter()
+            try:
+                conn, phases = await connect_with_phases(params, timeout=args.timeout, probe_tcp=True)
+                try:
+                    query_started = time.perf_counter()
+                    await conn.fetchval(args.query)
+                    phases['query'] = time.perf_counter() - query_started
+                finally:
+                    await conn.close()
+            except Exception as e:
+                failed.append(e)
+                rich_print(f"  fresh  seq={seq:<4} ❌ {e.__class__.__name__}: {e}", color="#FF4500")
+            else:
+                phases.pop('connect', None)
+                phases['total'] = time.perf_counter() - started
+                for name, seconds in phases.items():
+                    fresh[name].append(seconds)
+                show("fresh", seq, phases)
+            if args.interval:
+                await asyncio.sleep(args.interval)
+
+    async def reused_probe(conn, sequence):
+        for seq in sequence:
+            started = time.perf_counter()
+            try:
+                await conn.fetchval(args.query)
+            except Exception as e:
+                failed.append(e)
+                rich_print(f"  reused seq={seq:<4} ❌ {e.__class__.__name__}: {e}", color="#FF4500")
+            else:
+                reused["query"].append(time.perf_counter() - started)
+                show("reused", seq, {"query": reused["query"][-1]})
+            if args.interval:
+                await asyncio.sleep(args.interval)
+
+    rich_print(f"📡 Pinging {params['host']}:{params['port']}/{params['database']} "
+               f"({count} probes per mode, {concurrency} at a time)", color="#00CED1")
+    started = time.perf_counter()
+    if args.mode in ("both", "fresh"):
+        # workers share one iterator, so each sequence number is probed once
+        sequence = iter(range(1, count + 1))
+        await asyncio.gather(*(fresh_probe(sequence) for _ in range(concurrency)))
+    if args.mode in ("both", "reused"):
+        try:
+            conns = [(await connect_with_phases(params, timeout=args.timeout))[0] for _ in range(concurrency)]
+        except Exception as e:
+            rich_print(f"❌ Connection failed: {e}", color="#FF4500", bold=True)
+            return
+        try:
+            sequence = iter(range(1, count + 1))
+            await asyncio.gather(*(reused_probe(conn, sequence) for conn in conns))
+        finally:
+            await asyncio.gather(*(conn.close() for conn in conns), return_exceptions=True)
+    wall = time.perf_counter() - started
+
+    samples = {f"fresh {name}": values for name, values in fresh.items()}
+    samples["reused query"] = reused["query"]
+    if any(samples.values()):
+        print_table(latency_table("Ping latency (ms)", samples))
+
+    if fresh["total"] and reused["query"]:
+        setup = percentile(sorted(fresh["total"]), 50) - percentile(sorted(fresh["query"]), 50)
+        round_trip = percentile(sorted(reused["query"]), 50)
+        rich_print(f"🔍 p50 connection setup {setup * 1000:.2f} ms vs query round trip {round_trip * 1000:.2f} ms "
+                   f"({setup / max(round_trip, 1e-9):.0f}x)", color="#00CED1")
+    probes = sum(len(values) for values in (fresh["total"], reused["query"]))
+    rich_print(f"{'✅' if not failed else '⚠️'} {probes} ok, {len(failed)} failed in {wall:.2f}s",
+               color="#00FF7F" if not failed else "#FFFF00", bold=True)
+
+
+# ============================================================================
+# BENCH (pgbench-style load generator)
+# ============================================================================
+
+BENCH_BUILTINS = {
+    "tpcb-like": """
+\\set aid random(1, 100000 * :scale)
+\\set bid random(1, 1 * :scale)
+\\set tid random(1, 10 * :scale)
+\\set delta random(-5000, 5000)
+BEGIN;
+UPDATE pgbench_accounts SET abalance = abalance + :delta WHERE aid = :aid;
+SELECT abalance FROM pgbench_accounts WHERE aid = :aid;
+UPDATE pgbench_tellers SET tbalance = tbalance + :delta WHERE tid = :tid;
+UPDATE pgbench_branches SET bbalance = bbalance + :delta WHERE bid = :bid;
+INSERT INTO pgbench_history (tid, bid, aid, delta, mtime) VALUES (:tid, :bid, :aid, :delta, CURRENT_TIMESTAMP);
+END;
+""",
+    "simple-update": """
+\\set aid random(1, 100000 * :scale)
+\\set bid random(1, 1 * :scale)
+\\set tid random(1, 10 * :scale)
+\\set delta random(-5000, 5000)
+BEGIN;
+UPDATE pgbench_accounts SET abalance = abalance + :delta WHERE aid = :aid;
+SELECT abalance FROM pgbench_accounts WHERE aid = :aid;
+INSERT INTO pgbench_history (tid, bid, aid, delta, mtime) VALUES (:tid, :bid, :aid, :delta, CURRENT_TIMESTAMP);
+END;
+""",
+    "select-only": """
+\\set aid random(1, 100000 * :scale)
+SELECT abalance FROM pgbench_accounts WHERE aid = :aid;
+""",
+}
+
+BENCH_INIT_SQL = (
+    "DROP TABLE IF EXISTS pgbench_history, pgbench_tellers, pgbench_accounts, pgbench_branches",
+    "CREATE TABLE pgbench_branches (bid int NOT NULL, bbalance int, filler char(88)) WITH (fillfactor = 100)",
+    "CREATE TABLE pgbench_tellers (tid int NOT NULL, bid int, tbalance int, filler char(84)) WITH (fillfactor = 100)",
+    "CREATE TABLE pgbench_accounts (aid int NOT NULL, bid int, abalance int, filler char(84)) WITH (fillfactor = 100)",
+    "CREATE TABLE pgbench_history (tid int, bid int, aid int, delta int, mtime timestamp, filler char(22))",
+    "INSERT INTO pgbench_branches (bid, bbalance) SELECT bid, 0 FROM generate_series(1, $1) AS bid",
+    "INSERT INTO pgbench_tellers (tid, bid, tbalance) SELECT tid, (tid - 1) / 10 + 1, 0 FROM generate_series(1, $1 * 10) AS tid",
+    "INSERT INTO pgbench_accounts (aid, bid, abalance, filler) "
+    "SELECT aid, (aid - 1) / 100000 + 1, 0, '' FROM generate_series(1, $1::bigint * 100000) AS aid",
+    "ALTER TABLE pgbench_branches ADD PRIMARY KEY (bid)",
+    "ALTER TABLE pgbench_tellers ADD PRIMARY KEY (tid)",
+    "ALTER TABLE pgbench_accounts ADD PRIMARY KEY (aid)",
+    "VACUUM ANALYZE pgbench_branches, pgbench_tellers, pgbench_accounts, pgbench_history",
+)
+
+BENCH_FUNCTIONS = ("random", "abs", "min", "max", "int")
+# upper bounds of the latency histogram buckets in ms; the last bucket is open
+BENCH_HISTOGRAM_MS = (0.25, 0.5, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+def bench_div(a, b):
+    """pgbench's /: integer division truncating toward zero (C semantics), float division if either side is a float"""
+    if isinstance(a, float) or isinstance(b, float):
+        return a / b
+    quotient = abs(a) // abs(b)
+    return quotient if (a < 0) == (b < 0) else -quotient
+
+
+def bench_mod(a, b):
+    """pgbench's %: the remainder takes the sign of the dividend (C semantics)"""
+    if isinstance(a, float) or isinstance(b, float):
+        import math
+        return math.fmod(a, b)
+    return a - b * bench_div(a, b)
+
+
+# names the compiled / and % call; passed to eval() next to BENCH_FUNCTIONS
+BENCH_OPERATORS = {"_bench_div": bench_div, "_bench_mod": bench_mod}
+
+
+def compile_bench_expression(text: str):
+    """Compile a \\set expression: integers, + - * / %, :variables and random(lo, hi),
+    abs(), min(), max(). / and % follow pgbench (C) semantics, see bench_div and bench_mod;
+    evaluate the result with BENCH_OPERATORS in the globals."""
+    import ast
+    import re
+
+    tree = ast.parse(re.sub(r"(?<![:\w]):([A-Za-z_]\w*)", r"\1", text.strip()), mode="eval")
+    allowed = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Constant, ast.Name, ast.Load, ast.Call,
+               ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.USub, ast.UAdd)
+    for node in ast.walk(tree):
+        if not isinstance(node, allowed):
+            raise ValueError(f"unsupported expression: {text.strip()}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"unsupported constant in: {text.strip()}")
+        if isinstance(node, ast.Call) and (node.keywords or not isinstance(node.func, ast.Name)
+                                           or node.func.id not in BENCH_FUNCTIONS):
+            raise ValueError(f"unknown function in: {text.strip()}")
+
+    class COperators(ast.NodeTransformer):
+        def visit_BinOp(self, node):
+            self.generic_visit(node)
+            if isinstance(node.op, (ast.Div, ast.Mod)):
+                helper = "_bench_div" if isinstance(node.op, ast.Div) else "_bench_mod"
+                return ast.copy_location(ast.Call(ast.Name(helper, ast.Load()), [node.left, node.right], []), node)
+            return node
+
+    return compile(ast.fix_missing_locations(COperators().visit(tree)), "<\\set>", "eval")
+
+
+def parse_bench_script(text: str) -> List[tuple]:
+    """Turn a bench script into steps: ("set", name, code), ("sleep", code, unit) and
+    ("sql", statement with $n placeholders, [variable names], label)."""
+    import io
+    import re
+
+    steps = []
+    units = {"s": 1.0, "ms": 0.001, "us": 0.000001}
+    for kind, statement, line, offset in SqlScriptReader(io.BytesIO(text.encode("utf-8")), "utf-8"):
+        statement = statement[offset:].strip()
+        if kind == "meta":
+            command, _, rest = statement.partition(" ")
+            if command == "\\set":
+                name, _, expression = rest.strip().partition(" ")
+                steps.append(("set", name, compile_bench_expression(expression)))
+            elif command == "\\sleep":
+                parts = rest.split()
+                if not parts or (len(parts) > 1 and parts[1] not in units):
+                    raise ValueError(f"line {line}: \\sleep takes a duration and an optional unit (s, ms, us)")
+                steps.append(("sleep", compile_bench_expression(parts[0]), units[parts[1] if len(parts) > 1 else "s"]))
+            else:
+                raise ValueError(f"line {line}: unsupported meta-command {command}")
+            continue
+        names = []
+
+        def placeholder(match):
+            if match.group(1) not in names:
+                names.append(match.group(1))
+            return f"${names.index(match.group(1)) + 1}"
+
+        sql = re.sub(r"(?<![:\w]):([A-Za-z_]\w*)", placeholder, statement)
+        steps.append(("sql", sql, names, " ".join(statement.split())[:60]))
+    if not any(step[0] == "sql" for step in steps):
+        raise ValueError("script has no SQL statements")
+    return steps
+
+
+def latency_histogram(latencies) -> Any:
+    """Rich table counting latencies (seconds) per BENCH_HISTOGRAM_MS bucket, with a bar"""
+    import bisect
+    from rich.table import Table
+
+    counts = [0] * (len(BENCH_HISTOGRAM_MS) + 1)
+    for seconds in latencies:
+        counts[bisect.bisect_left(BENCH_HISTOGRAM_MS, seconds * 1000)] += 1
+    used = [index for index, count in enumerate(counts) if count]
+    table = Table(title="Latency histogram", show_header=True, header_style="bold magenta")
+    table.add_column("Latency", style="cyan", justify="right")
+    table.add_column("Transactions", style="green", justify="right")
+    table.add_column("%", style="yellow", justify="right")
+    table.add_column("", style="blue")
+    if not used:
+        return table
+    total, peak = sum(counts), max(counts)
+    for index in range(used[0], used[-1] + 1):
+        label = f"≤ {BENCH_HISTOGRAM_MS[index]:g} ms" if index < len(BENCH_HISTOGRAM_MS) else f"> {BENCH_HISTOGRAM_MS[-1]:g} ms"
+        table.add_row(label, f"{counts[index]:,}", f"{counts[index] / total * 100:.1f}", "█" * round(counts[index] / peak * 40))
+    return table
+
+
+async def init_bench_tables(conn, scale: int):
+    """Create and fill the pgbench_* tables server-side (like `pgbench -i -I dtGvp`)"""
+    import re
+    import time
+    started = time.perf_counter()
+    for statement in BENCH_INIT_SQL:
+        label = statement[:re.search(r"pgbench_\w+", statement).end()]
+        rich_print(f"  {label}", color="#AAAAAA")
+        if "$1" in statement:
+            await conn.execute(statement, scale)
+        else:
+            await conn.execute(statement)
+    rich_print(f"✅ Initialized scale {scale} ({scale * 100000:,} accounts) in {time.perf_counter() - started:.1f}s",
+               color="#00FF7F", bold=True)
+
+
+async def bench_database(args):
+    """Run a built-in TPC-B-like workload or a custom script from --clients connections.
+
+    Each client holds one pooled connection and runs the script as one transaction
+    after another until --time runs out or --transactions are done. With --rate the
+    starts follow a Poisson schedule shared across clients, and latency is measured
+    from the scheduled start, so falling behind the schedule shows up as latency
+    (the lag is reported separately). Progress lines every --progress seconds give
+    TPS and latency of that interval.
+    """
+    import time
+    import random
+    import signal
+    from array import array
+
+    if args.file:
+        try:
+            with open(args.file, "r", encoding="utf-8") as f:
+                script_text = f.read()
+        except OSError as e:
+            rich_print(f"❌ Cannot read {args.file}: {e}", color="#FF4500", bold=True)
             return
-        
-        table = Table(title="PostgreSQL Databases", show_header=True, header_style="bold magenta")
-        table.add_column("Database", style="cyan")
-        table.add_column("Size", style="green")
-        table.add_column("Encoding", style="yellow")
-        table.add_column("Collation", style="blue")
-        
-        for row in results:
-            table.add_row(row['database'], row['size'], row['encoding'], row['collation'])
-        
-        Console().print(table)
-    
-    except Exception as e:
-        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+    else:
+        script_text = BENCH_BUILTINS[args.builtin]
+    try:
+        steps = parse_bench_script(script_text)
+    except (ValueError, SyntaxError) as e:
+        rich_print(f"❌ Invalid bench script: {e}", color="#FF4500", bold=True)
+        return
+
+    clients = max(1, args.clients)
+    config = get_db_config_or_args(args)
+    pool = await get_pool(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level,
+                          min_size=clients, max_size=clients)
+    if pool is None:
+        return
+
+    try:
+        async with pool.acquire() as conn:
+            if args.init:
+                await init_bench_tables(conn, max(1, args.scale or 1))
+                return
+            scale = args.scale
+            if not scale:
+                try:
+                    scale = await conn.fetchval("SELECT count(*) FROM pgbench_branches") or 1
+                except Exception:
+                    if not args.file:
+                        rich_print("❌ pgbench_* tables not found. Run `psqlc bench --init -s SCALE` first", color="#FF4500", bold=True)
+                        return
+                    scale = 1
+
+        statements = [step for step in steps if step[0] == "sql"]
+        latencies = array("d")
+        statement_totals = [[0.0, 0, 0.0] for _ in statements]   # seconds, calls, max
+        window = array("d")
+        failed = [0]
+        errors = {}
+        lags = array("d")
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+
+        rate_per_client = args.rate / clients if args.rate else 0
+        started = time.perf_counter()
+        deadline = started + args.time if not args.transactions else float("inf")
+
+        async def client(client_id: int):
+            rng = random.Random()
+            functions = {"__builtins__": {}, "random": rng.randint, "abs": abs, "min": min, "max": max, "int": int,
+                         **BENCH_OPERATORS}
+            variables = {"scale": scale, "client_id": client_id}
+            done = 0
+            scheduled = time.perf_counter()
+            async with pool.acquire() as conn:
+                while not stop.is_set() and (not args.transactions or done < args.transactions):
+                    if rate_per_client:
+                        scheduled += rng.expovariate(rate_per_client)
+                        delay = scheduled - time.perf_counter()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    begin = scheduled if rate_per_client else time.perf_counter()
+                    if begin >= deadline:
+                        break
+                    if rate_per_client:
+                        lags.append(max(time.perf_counter() - scheduled, 0.0))
+                    index = 0
+                    try:
+                        for step in steps:
+                            if step[0] == "set":
+                                variables[step[1]] = eval(step[2], functions, variables)
+                            elif step[0] == "sleep":
+                                await asyncio.sleep(eval(step[1], functions, variables) * step[2])
+                            else:
+                                statement_started = time.perf_counter()
+                                if step[2]:
+                                    await conn.execute(step[1], *(variables[name] for name in step[2]))
+                                else:
+                                    await conn.execute(step[1])
+                                elapsed = time.perf_counter() - statement_started
+                                totals = statement_totals[index]
+                                totals[0] += elapsed
+                                totals[1] += 1
+                                if elapsed > totals[2]:
+                                    totals[2] = elapsed
+                                index += 1
+                    except Exception as e:
+                        failed[0] += 1
+                        message = f"{e.__class__.__name__}: {e}"
+                        errors[message] = errors.get(message, 0) + 1
+                        if conn.is_in_transaction():
+                            await conn.execute("ROLLBACK")
+                        continue
+                    finally:
+                        done += 1
+                    latency = time.perf_counter() - begin
+                    latencies.append(latency)
+                    window.append(latency)
+
+        async def progress():
+            last = started
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), args.progress)
+                except asyncio.TimeoutError:
+                    pass
+                if stop.is_set():
+                    break
+                now = time.perf_counter()
+                sample = sorted(window)
+                del window[:]
+                rich_print(f"⏱  {now - started:6.1f} s  {len(sample) / max(now - last, 1e-9):9.1f} tps  "
+                           f"lat {sum(sample) / max(len(sample), 1) * 1000:7.2f} ms avg  {percentile(sample, 95) * 1000:7.2f} ms p95  "
+                           f"{failed[0]} failed", color="#00CED1")
+                last = now
+
+        label = args.file or f"builtin: {args.builtin}"
+        limit = f"{args.transactions} transactions per client" if args.transactions else f"{args.time}s"
+        rich_print(f"🏋️ {label} · scale {scale} · {clients} clients · {limit}"
+                   + (f" · rate {args.rate} tps" if args.rate else ""), color="#00CED1", bold=True)
+        reporter = asyncio.ensure_future(progress()) if args.progress else None
+        try:
+            await asyncio.gather(*(client(i) for i in range(clients)))
+        finally:
+            stop.set()
+            if reporter:
+                await reporter
+        wall = time.perf_counter() - started
     finally:
-        await conn.close()
+        await pool.close()
 
+    ordered = sorted(latencies)
+    print_table(latency_table("Transaction latency (ms)", {"transaction": ordered}))
+    print_table(latency_histogram(ordered))
 
-async def show_tables(args):
-    """List all tables in a database"""
-    from rich.console import Console
+    from rich.table import Table
+    from rich.text import Text
+    per_statement = Table(title="Per-statement latency", show_header=True, header_style="bold magenta")
+    per_statement.add_column("Statement", style="white")
+    per_statement.add_column("avg ms", style="green", justify="right")
+    per_statement.add_column("max ms", style="yellow", justify="right")
+    per_statement.add_column("Calls", style="blue", justify="right")
+    for (_kind, _sql, _names, head), (seconds, calls, worst) in zip(statements, statement_totals):
+        # Text: the SQL is not rich markup, and ":a::int" would otherwise render as an emoji
+        per_statement.add_row(Text(head), f"{seconds / max(calls, 1) * 1000:.3f}", f"{worst * 1000:.3f}", f"{calls:,}")
+    print_table(per_statement)
+
+    for message, count in sorted(errors.items(), key=lambda item: -item[1])[:5]:
+        rich_print(f"❌ {count:,} × {message}", color="#FF4500")
+    if lags:
+        rich_print(f"📅 Schedule lag: avg {sum(lags) / len(lags) * 1000:.2f} ms, max {max(lags) * 1000:.2f} ms", color="#00CED1")
+    rich_print(f"{'✅' if not failed[0] else '⚠️'} {len(latencies):,} transactions, {failed[0]} failed in {wall:.2f}s · "
+               f"{len(latencies) / max(wall, 1e-9):,.1f} tps · avg latency {sum(ordered) / max(len(ordered), 1) * 1000:.2f} ms",
+               color="#00FF7F" if not failed[0] else "#FFFF00", bold=True)
+
+
+# ============================================================================
+# DESCRIBE & QUERY COMMANDS
+# ============================================================================
+
+def _catalog_filtered(sql: str, order_by: str) -> str:
+    """Restrict one of the CATALOG_*_SQL snapshot queries to relation $1 (and schema $2 when given)"""
+    return (sql.rstrip().rstrip(';')
+            + f"\n      AND c.relname = $1 AND ($2::text IS NULL OR n.nspname = $2)\n    ORDER BY {order_by};")
+
+
+async def fetch_table_columns(conn, table: str) -> list:
+    """Return the column layout of `table` in ordinal order"""
+    cached = await catalog_lookup(conn, table, ('columns',))
+    if cached is not None:
+        return cached['columns']
+    schema, name = split_qualified(table)
+    return await conn.fetch(_catalog_filtered(CATALOG_COLUMNS_SQL, "n.nspname, a.attnum"), name, schema)
+
+
+async def describe_table(args):
+    """Show table structure"""
     from rich.table import Table
     
+    if fan_out_requested(args):
+        if not args.table:
+            rich_print("❌ Table name required. Use -t/--table", color="#FF4500", bold=True)
+            return
+        await show_across_databases(
+            args, f"Structure of '{args.table}'",
+            lambda conn: fetch_table_columns(conn, args.table),
+            [("column_name", "Column", "cyan"), ("data_type", "Type", "green"), ("character_maximum_length", "Max Length", "yellow"),
+             ("is_nullable", "Nullable", "blue"), ("column_default", "Default", "magenta")]
+        )
+        return
+
     if not args.database:
         db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
         if db_config and db_config.get('database'):
@@ -683,36 +3972,36 @@ async def show_tables(args):
             rich_print("❌ Database name required. Use -d/--database", color="#FF4500", bold=True)
             return
     
+    if not args.table:
+        rich_print("❌ Table name required. Use -t/--table", color="#FF4500", bold=True)
+        return
+    
     config = get_db_config_or_args(args)
     conn = await get_connection(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
     
     try:
-        results = await conn.fetch("""
-            SELECT 
-                schemaname AS schema,
-                tablename AS table,
-                pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) AS size,
-                (SELECT COUNT(*) FROM information_schema.columns 
-                 WHERE table_schema = schemaname AND table_name = tablename) AS columns
-            FROM pg_tables
-            WHERE schemaname NOT IN ('pg_catalog', 'information_schema')
-            ORDER BY schemaname, tablename;
-        """)
+        results = await fetch_table_columns(conn, args.table)
         
         if not results:
-            rich_print(f"📭 No tables found in '{args.database}'", color="#FFFF00")
+            rich_print(f"❌ Table '{args.table}' not found", color="#FF4500", bold=True)
             return
         
-        table = Table(title=f"Tables in '{args.database}'", show_header=True, header_style="bold magenta")
-        table.add_column("Schema", style="cyan")
-        table.add_column("Table", style="green")
-        table.add_column("Size", style="yellow")
-        table.add_column("Columns", style="blue")
+        table = Table(title=f"Structure of '{args.table}'", show_header=True, header_style="bold magenta")
+        table.add_column("Column", style="cyan")
+        table.add_column("Type", style="green")
+        table.add_column("Max Length", style="yellow")
+        table.add_column("Nullable", style="blue")
+        table.add_column("Default", style="magenta")
         
         for row in results:
-            table.add_row(row['schema'], row['table'], row['size'], str(row['columns']))
+            table.add_row(
+                row['column_name'], row['data_type'],
+                str(row['character_maximum_length']) if row['character_maximum_length'] else "-",
+                row['is_nullable'],
+                str(row['column_default']) if row['column_default'] else "-"
+            )
         
-        Console().print(table)
+        print_table(table)
     
     except Exception as e:
         rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
@@ -720,104 +4009,707 @@ async def show_tables(args):
         await conn.close()
 
 
-async def show_users(args):
-    """List all database users/roles"""
-    from rich.console import Console
-    from rich.table import Table
-    
-    config = get_db_config_or_args(args)
-    conn = await get_connection(**config, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
-    
+async def fetch_limited(conn, query: str, *args, limit: int, prefetch: int = 1000, readonly: bool = False) -> list:
+    """Fetch at most `limit` rows without pulling the rest of the result to the client"""
+    if hasattr(conn, 'fetch_limited'):
+        return await conn.fetch_limited(query, *args, limit=limit, prefetch=prefetch, readonly=readonly)
+    # the cursor is iterated inline: breaking out of an async generator would defer the
+    # ROLLBACK to a finalizer task that races the next query on this connection
+    rows = []
+    async with conn.transaction(readonly=readonly):
+        async for record in conn.cursor(query, *args, prefetch=prefetch):
+            rows.append(record)
+            if len(rows) >= limit:
+                break
+    return rows
+
+
+def _json_duration(value) -> str:
+    """ISO 8601 duration for a timedelta, e.g. P1DT7200.5S"""
+    seconds = value.seconds + value.microseconds / 1e6
+    return f'"P{value.days}DT{seconds:g}S"' if value.days else f'"PT{seconds:g}S"'
+
+
+_JSON_FRAGMENTS = None
+
+
+def _json_fragments() -> dict:
+    """Python type -> JSON text encoder table for json_fragment, built on first use"""
+    global _JSON_FRAGMENTS
+    if _JSON_FRAGMENTS is None:
+        import base64
+        import datetime
+        import decimal
+        import json
+        import uuid
+
+        quote = json.JSONEncoder(ensure_ascii=False).encode
+
+        def number(value) -> str:
+            # NaN and infinities have no JSON number form
+            return str(value) if value == value and value not in (float('inf'), float('-inf')) else f'"{value}"'
+
+        def iso(value) -> str:
+            return '"' + value.isoformat() + '"'
+
+        _JSON_FRAGMENTS = {
+            type(None): lambda value: 'null',
+            bool: lambda value: 'true' if value else 'false',
+            int: int.__repr__,
+            float: number,
+            str: quote,
+            decimal.Decimal: number,
+            datetime.datetime: iso,
+            datetime.date: iso,
+            datetime.time: iso,
+            datetime.timedelta: _json_duration,
+            bytes: lambda value: '"' + base64.b64encode(value).decode('ascii') + '"',
+            uuid.UUID: lambda value: '"' + str(value) + '"',
+            list: lambda value: '[' + ','.join(map(json_fragment, value)) + ']',
+            tuple: lambda value: '[' + ','.join(map(json_fragment, value)) + ']',
+            dict: lambda value: '{' + ','.join(quote(str(k)) + ':' + json_fragment(v) for k, v in value.items()) + '}',
+        }
+    return _JSON_FRAGMENTS
+
+
+def json_fragment(value) -> str:
+    """JSON text for one value, dispatching on its Python type.
+
+    Numerics stay numbers (Decimal keeps every digit), bytea becomes base64,
+    temporal values ISO 8601 strings and records objects.
+    """
+    fragments = _JSON_FRAGMENTS or _json_fragments()
+    encode = fragments.get(type(value))
+    if encode is None:
+        # subclasses such as asyncpg's UUID: remember the match for the next row
+        encode = next((fn for kind, fn in fragments.items() if isinstance(value, kind)), None)
+        if encode is None:
+            if isinstance(value, (bytearray, memoryview)):
+                return fragments[bytes](bytes(value))
+            if hasattr(value, 'items'):
+                return fragments[dict](value)
+            return fragments[str](str(value))
+        fragments[type(value)] = encode
+    return encode(value)
+
+
+def jsonl_encoder(attributes):
+    """Build a record -> JSON line function from prepared statement attributes.
+
+    Most columns go through json_fragment. json values are parsed and
+    re-serialised onto one line; jsonb output is already single-line JSON and
+    is embedded as is.
+    """
+    import json
+
+    quote = json.JSONEncoder(ensure_ascii=False).encode
+    by_type = {
+        'json': lambda value: 'null' if value is None else json_fragment(json.loads(value)),
+        'jsonb': lambda value: 'null' if value is None else value,
+    }
+    keys = [quote(attr.name) + ':' for attr in attributes]
+    columns = list(zip(keys, [by_type.get(attr.type.name, json_fragment) for attr in attributes]))
+
+    def encode(record) -> str:
+        return '{' + ','.join([key + encode_value(value) for (key, encode_value), value in zip(columns, record)]) + '}'
+
+    return encode
+
+
+async def export_query(conn, query: str, fmt: str, output: str = '-', prefetch: int = 1000, readonly: bool = False) -> Dict[str, Any]:
+    """Export query results to a file or stdout ('-').
+
+    csv, tsv and binary use COPY (`copy_from_query`): PostgreSQL serializes the
+    rows and the raw bytes go straight to the file. jsonl encodes rows from a
+    server-side cursor in batches of `prefetch` rows (see `jsonl_encoder`).
+    """
+    import time
+
+    if fmt == 'binary' and output == '-' and sys.stdout.isatty():
+        rich_print("❌ Refusing to write binary COPY data to a terminal. Use --output FILE", color="#FF4500", bold=True)
+        return {}
+
+    out = sys.stdout.buffer if output == '-' else open(output, 'wb')
+    written = 0
+    rows = 0
+    started = time.monotonic()
+
+    async def sink(data):
+        nonlocal written
+        written += len(data)
+        out.write(data)
+
     try:
-        results = await conn.fetch("""
-            SELECT 
-                rolname AS username,
-                rolsuper AS superuser,
-                rolcreatedb AS create_db,
-                rolcreaterole AS create_role,
-                rolcanlogin AS can_login,
-                rolreplication AS replication
-            FROM pg_roles
-            WHERE rolname NOT LIKE 'pg_%'
-            ORDER BY rolname;
-        """)
+        if fmt in ('csv', 'tsv', 'binary'):
+            copy_options = {'format': 'binary'} if fmt == 'binary' else {'format': 'csv', 'header': True}
+            async with conn.transaction(readonly=readonly):
+                if fmt == 'tsv':
+                    # COPY text format, which `psqlc load` reads back; HEADER needs PostgreSQL 15
+                    copy_options = {'format': 'text'}
+                    if conn.get_server_version() >= (15,):
+                        copy_options['header'] = True
+                    else:
+                        statement = await conn.prepare(query)
+                        await sink(("\t".join(a.name for a in statement.get_attributes()) + "\n").encode("utf-8"))
+                status = await conn.copy_from_query(query, output=sink, **copy_options)
+            rows = int(status.split()[-1]) if status and status.split()[-1].isdigit() else 0
+        elif fmt == 'jsonl':
+            batch = []
+            async with conn.transaction(readonly=readonly):
+                statement = await conn.prepare(query)
+                encode = jsonl_encoder(statement.get_attributes())
+                async for record in statement.cursor(prefetch=prefetch):
+                    batch.append(encode(record))
+                    if len(batch) >= prefetch:
+                        await sink(("\n".join(batch) + "\n").encode("utf-8"))
+                        rows += len(batch)
+                        batch = []
+            if batch:
+                await sink(("\n".join(batch) + "\n").encode("utf-8"))
+                rows += len(batch)
+        else:
+            raise ValueError(f"unknown export format: {fmt}")
+    finally:
+        out.flush()
+        if out is not sys.stdout.buffer:
+            out.close()
+
+    elapsed = max(time.monotonic() - started, 1e-9)
+    stats = {'rows': rows, 'bytes': written, 'seconds': elapsed}
+    rich_print(
+        f"✅ Exported {rows} rows, {written / (1024**2):.2f} MB in {elapsed:.2f}s "
+        f"({rows / elapsed:,.0f} rows/s, {written / (1024**2) / elapsed:.2f} MB/s)"
+        + (f" → {output}" if output != '-' else ""),
+        color="#00FF7F", bold=True
+    )
+    return stats
+
+
+READONLY_DENIED_KEYWORDS = ['DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'CREATE', 'INSERT', 'UPDATE']
+
+
+def is_readonly_query(query: str) -> bool:
+    """Best-effort check used by --readonly: reject statements containing destructive keywords"""
+    return not any(keyword in query.upper() for keyword in READONLY_DENIED_KEYWORDS)
+
+
+_ROWS_KEYWORD = None
+# statements whose first keyword means a result set comes back
+ROW_RETURNING_KEYWORDS = ('SELECT', 'WITH', 'VALUES', 'TABLE', 'SHOW', 'EXPLAIN')
+
+
+def returns_rows(query: str) -> bool:
+    """Whether `query` returns rows, judged by its first keyword after comments and parentheses"""
+    global _ROWS_KEYWORD
+    if _ROWS_KEYWORD is None:
+        import re
+        _ROWS_KEYWORD = re.compile(r"(?:\s+|--[^\n]*|/\*.*?\*/|\()*([A-Za-z]+)", re.DOTALL)
+    m = _ROWS_KEYWORD.match(query)
+    return bool(m) and m.group(1).upper() in ROW_RETURNING_KEYWORDS
+
+
+def query_list(args) -> List[str]:
+    """Queries given with repeated -q and/or --queries-file (split like `psqlc run` scripts)"""
+    queries = [q for q in (args.query or []) if q.strip()]
+    path = getattr(args, 'queries_file', None)
+    if path:
+        stream = sys.stdin.buffer if path == '-' else open(path, 'rb')
+        try:
+            queries.extend(text[offset:] for kind, text, _, offset in SqlScriptReader(stream) if kind == 'sql')
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+    return queries
+
+
+def print_rows(rows: list, max_rows: int, title: str = "Query Results"):
+    """Show fetched rows: a rich table for small results, PlainWriter for --plain or more than RICH_MAX_ROWS rows"""
+    from rich.table import Table
+
+    columns = list(rows[0].keys())
+    shown = rows[:max_rows]
+    if PLAIN_OUTPUT or len(shown) > RICH_MAX_ROWS:
+        import shutil
+        with TIMINGS.phase("render"), PagedOutput(enabled=len(shown) + 2 > shutil.get_terminal_size().lines) as out:
+            writer = PlainWriter(columns, PLAIN_OUTPUT or 'aligned', out)
+            for row in shown:
+                writer.write(row[col] for col in columns)
+            writer.close()
+    else:
+        table = Table(title=title, show_header=True, header_style="bold magenta")
         
-        table = Table(title="PostgreSQL Users", show_header=True, header_style="bold magenta")
-        table.add_column("Username", style="cyan")
-        table.add_column("Superuser", style="red")
-        table.add_column("Create DB", style="green")
-        table.add_column("Create Role", style="yellow")
-        table.add_column("Can Login", style="blue")
-        table.add_column("Replication", style="magenta")
+        for col in columns:
+            table.add_column(col, style="cyan")
         
-        for row in results:
-            table.add_row(
-                row['username'], str(row['superuser']), str(row['create_db']),
-                str(row['create_role']), str(row['can_login']), str(row['replication'])
-            )
+        for row in shown:
+            table.add_row(*[str(row[col]) if row[col] is not None else "NULL" for col in columns])
         
-        Console().print(table)
+        print_table(table)
     
-    except Exception as e:
-        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
-    finally:
-        await conn.close()
+    if len(rows) > max_rows:
+        rich_print(f"⚠️ Showing first {max_rows} rows (use --limit N or --no-limit for more)", color="#FFFF00", bold=True)
 
 
-async def show_connections(args):
-    """Show active database connections"""
-    from rich.console import Console
-    from rich.table import Table
+async def execute_query(args):
+    """Execute a custom SQL query"""
+    if not args.database:
+        db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
+        if db_config and db_config.get('database'):
+            args.database = db_config.get('database')
+            rich_print(f"📄 Using database: {args.database}", color="#00CED1")
+        else:
+            rich_print("❌ Database name required. Use -d/--database", color="#FF4500", bold=True)
+            return
+    
+    queries = query_list(args)
+    if not queries:
+        rich_print("❌ Query required. Use -q/--query or --queries-file", color="#FF4500", bold=True)
+        return
+    
+    if args.readonly:
+        if not all(is_readonly_query(q) for q in queries):
+            rich_print("❌ Destructive queries not allowed in read-only mode", color="#FF4500", bold=True)
+            return
     
+    no_limit = getattr(args, 'no_limit', False)
+    export_format = getattr(args, 'format', None)
+    if len(queries) > 1:
+        if no_limit or export_format:
+            rich_print("❌ --no-limit and --format take a single query", color="#FF4500", bold=True)
+            return
+        await execute_queries(args, queries)
+        return
+    query = queries[0]
+
     config = get_db_config_or_args(args)
-    conn = await get_connection(**config, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+    conn = await get_connection(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level,
+                                use_daemon=not (no_limit or export_format))
     
     try:
-        results = await conn.fetch("""
-            SELECT 
-                datname AS database,
-                usename AS username,
-                client_addr AS client,
-                state,
-                query_start,
-                state_change
-            FROM pg_stat_activity
-            WHERE datname IS NOT NULL
-            ORDER BY query_start DESC;
-        """)
-        
-        if not results:
-            rich_print("📭 No active connections", color="#FFFF00")
-            return
-        
-        table = Table(title="Active Connections", show_header=True, header_style="bold magenta")
-        table.add_column("Database", style="cyan")
-        table.add_column("User", style="green")
-        table.add_column("Client", style="yellow")
-        table.add_column("State", style="blue")
-        table.add_column("Query Start", style="magenta")
-        table.add_column("State Change", style="red")
-        
-        for row in results:
-            table.add_row(
-                str(row['database'] or "-"), str(row['username'] or "-"),
-                str(row['client'] or "-"), str(row['state'] or "-"),
-                str(row['query_start'] or "-"), str(row['state_change'] or "-")
-            )
-        
-        Console().print(table)
+        if export_format:
+            await export_query(conn, query, export_format, args.output or '-',
+                               prefetch=getattr(args, 'prefetch', None) or 1000, readonly=args.readonly)
+        elif returns_rows(query):
+            if no_limit:
+                prefetch = getattr(args, 'prefetch', None) or 1000
+                writer = None
+                total = 0
+                with PagedOutput() as out:
+                    # inline rather than through an async generator, so a closed pipe still
+                    # ends the transaction here instead of in a finalizer racing conn.close()
+                    async with conn.transaction(readonly=args.readonly):
+                        async for row in conn.cursor(query, prefetch=prefetch):
+                            if writer is None:
+                                writer = PlainWriter(row.keys(), PLAIN_OUTPUT or 'tsv', out)
+                            writer.write(row.values())
+                    if writer:
+                        writer.close()
+                total = writer.rows if writer else 0
+                if total:
+                    rich_print(f"✅ {total} rows", color="#00FF7F", bold=True)
+                else:
+                    rich_print("✅ Query executed. No rows returned.", color="#00FF7F")
+                return
+
+            max_rows = getattr(args, 'limit', 100) or 100
+            prefetch = getattr(args, 'prefetch', None) or min(max_rows + 1, 1000)
+            # fetch one extra row to know whether the result was truncated
+            results = await fetch_limited(conn, query, limit=max_rows + 1, prefetch=prefetch, readonly=args.readonly)
+            
+            if not results:
+                rich_print("✅ Query executed. No rows returned.", color="#00FF7F")
+                return
+            
+            print_rows(results, max_rows)
+        else:
+            await conn.execute(query)
+            rich_print("✅ Query executed successfully", color="#00FF7F", bold=True)
     
     except Exception as e:
-        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+        rich_print(f"❌ Query error: {e}", color="#FF4500", bold=True)
     finally:
         await conn.close()
 
 
-async def show_indexes(args):
-    """Show indexes in a table or database"""
-    from rich.console import Console
+async def execute_queries(args, queries: List[str]):
+    """Run independent queries concurrently over a pool of --concurrency connections.
+
+    Results are printed in input order once all queries are done, each with its own
+    latency (time on its connection, excluding the wait for a free one), followed by
+    a summary table.
+    """
+    import time
     from rich.table import Table
-    
+
+    concurrency = max(1, min(args.concurrency, len(queries)))
+    max_rows = args.limit or 100
+    prefetch = args.prefetch or min(max_rows + 1, 1000)
+    config = get_db_config_or_args(args)
+    pool = await get_pool(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level,
+                          min_size=concurrency, max_size=concurrency)
+    if pool is None:
+        return
+
+    outcomes = [None] * len(queries)
+
+    async def run(index: int, query: str):
+        async with pool.acquire() as conn:
+            started = time.perf_counter()
+            try:
+                if returns_rows(query):
+                    rows, status = await fetch_limited(conn, query, limit=max_rows + 1, prefetch=prefetch, readonly=args.readonly), None
+                else:
+                    rows, status = None, await conn.execute(query)
+                outcomes[index] = (rows, status, None, time.perf_counter() - started)
+            except Exception as e:
+                outcomes[index] = (None, None, e, time.perf_counter() - started)
+
+    rich_print(f"🚀 Running {len(queries)} queries, {concurrency} at a time", color="#00CED1")
+    started = time.perf_counter()
+    try:
+        # one phase around the batch: concurrent tasks cannot share the phase stack
+        with TIMINGS.phase("query"):
+            await asyncio.gather(*(run(i, q) for i, q in enumerate(queries)))
+    finally:
+        await pool.close()
+    wall = time.perf_counter() - started
+    TIMINGS.count(queries=len(queries), rows=sum(len(rows) for rows, _, _, _ in outcomes if rows))
+
+    summary = Table(title="Query latency", show_header=True, header_style="bold magenta")
+    summary.add_column("#", style="cyan", justify="right")
+    summary.add_column("Query", style="white")
+    summary.add_column("Rows", style="green", justify="right")
+    summary.add_column("ms", style="yellow", justify="right")
+    summary.add_column("Status", style="white")
+    failed = 0
+    for index, (query, (rows, status, error, seconds)) in enumerate(zip(queries, outcomes), 1):
+        head = " ".join(query.split())
+        head = head[:60] + ("..." if len(head) > 60 else "")
+        if error is not None:
+            failed += 1
+            rich_print(f"❌ [{index}] {head} · {seconds * 1000:.1f} ms: {error}", color="#FF4500", bold=True)
+            summary.add_row(str(index), head, "-", f"{seconds * 1000:.1f}", f"[red]{error.__class__.__name__}[/red]")
+            continue
+        if rows is None:
+            rich_print(f"✅ [{index}] {head} · {seconds * 1000:.1f} ms: {status}", color="#00FF7F")
+            summary.add_row(str(index), head, "-", f"{seconds * 1000:.1f}", status or "ok")
+            continue
+        shown = min(len(rows), max_rows)
+        rich_print(f"🧾 [{index}] {head} · {shown}{'+' if len(rows) > max_rows else ''} rows · {seconds * 1000:.1f} ms", color="#00CED1", bold=True)
+        if rows:
+            print_rows(rows, max_rows, title=None)
+        summary.add_row(str(index), head, f"{shown}{'+' if len(rows) > max_rows else ''}", f"{seconds * 1000:.1f}", "ok")
+
+    print_table(summary)
+    total = sum(seconds for _, _, _, seconds in outcomes)
+    rich_print(
+        f"{'✅' if not failed else '⚠️'} {len(queries) - failed} ok, {failed} failed in {wall:.2f}s wall "
+        f"({total:.2f}s of query time, {total / max(wall, 1e-9):.1f}x overlap)",
+        color="#00FF7F" if not failed else "#FFFF00", bold=True
+    )
+
+
+# ============================================================================
+# RUN COMMAND (SQL scripts)
+# ============================================================================
+
+_SQL_PATTERNS = None
+
+
+def _sql_patterns() -> Dict[str, Any]:
+    global _SQL_PATTERNS
+    if _SQL_PATTERNS is None:
+        import re
+        _SQL_PATTERNS = {
+            # whole line comments and strings ('', E'' with backslashes, "") match as one token;
+            # an unterminated one runs to the end of the buffer and is rescanned after the next read
+            # (the leading lookahead lets the regex engine skip ahead to candidate characters)
+            'token': re.compile(
+                r"(?=[-'\"/$;eE])(?:(?P<comment>--[^\n]*\n?)"
+                r"|(?P<string>[eE](?<![\w$].)'[^'\\]*(?:(?:\\.|'')[^'\\]*)*'?"
+                r"|'[^']*(?:''[^']*)*'?|\"[^\"]*(?:\"\"[^\"]*)*\"?)"
+                r"|(?P<block>/\*)|(?P<dollar>\$(?<![\w$].)(?:[^\W\d]\w*)?\$)|;)", re.DOTALL),
+            'comment': re.compile(r"/\*|\*/"),
+            # statements that cannot share a multi-statement round trip (its implicit transaction)
+            'solo': re.compile(
+                r"(BEGIN|START\s+TRANSACTION|COMMIT|END|ROLLBACK|ABORT|SAVEPOINT|RELEASE|PREPARE\s+TRANSACTION"
+                r"|VACUUM|CLUSTER|REINDEX|ALTER\s+SYSTEM|(CREATE|DROP)\s+(DATABASE|TABLESPACE)"
+                r"|(CREATE\s+(UNIQUE\s+)?|DROP\s+)INDEX\s+CONCURRENTLY)\b", re.IGNORECASE),
+            'copy_from_stdin': re.compile(r"COPY\b.*\bFROM\s+STDIN\b", re.IGNORECASE | re.DOTALL),
+        }
+    return _SQL_PATTERNS
+
+
+class SqlScriptReader:
+    """Split a SQL script into statements while reading it in chunks.
+
+    Understands '' and E'' strings, quoted identifiers, dollar quotes, -- comments
+    and nested /* */ comments. Iterating yields (kind, text, line, offset) tuples:
+    kind is 'sql' or 'meta' (a psql backslash command), line is where the statement
+    starts and text[offset:] is the statement without its leading comments. After a
+    COPY ... FROM stdin statement, copy_data() yields its data lines. Only the
+    statement being scanned and one input chunk are held in memory.
+    """
+
+    def __init__(self, stream, encoding: str = "utf-8", chunk_size: int = 1 << 20):
+        import codecs
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+        self.line = 1
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer; False at end of input"""
+        if self.eof:
+            return False
+        data = self.stream.read(self.chunk_size)
+        self.bytes_read += len(data)
+        if not data:
+            self.eof = True
+            self.buffer += self.decoder.decode(b"", final=True)
+            return False
+        self.buffer += self.decoder.decode(data)
+        return True
+
+    def _scan(self, pattern, start: int):
+        """Next match of `pattern` from `start`, reading on while the match could run into the next chunk"""
+        while True:
+            m = pattern.search(self.buffer, start)
+            # a match this close to the end may continue ('' vs ', -- vs -, $tag$)
+            if (m is None or m.end() + 64 >= len(self.buffer)) and self._fill():
+                continue
+            return m
+
+    def _find(self, needle: str, start: int) -> int:
+        while True:
+            found = self.buffer.find(needle, start)
+            if found >= 0 or not self._fill():
+                return found
+
+    def _end_of_block_comment(self, start: int) -> int:
+        pattern = _sql_patterns()['comment']
+        depth = 1
+        i = start
+        while depth:
+            m = self._scan(pattern, i)
+            if m is None:
+                return len(self.buffer)
+            depth += 1 if m.group() == "/*" else -1
+            i = m.end()
+        return i
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        token = _sql_patterns()['token']
+        if self.pos >= self.chunk_size:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        start = i = self.pos
+        code = None
+        while True:
+            m = self._scan(token, i)
+            buf = self.buffer
+            end = m.start() if m else len(buf)
+            kind = m.lastgroup if m else None
+            if code is None:
+                segment = buf[i:end]
+                gap = len(segment) - len(segment.lstrip())
+                if gap < len(segment) or kind in ('string', 'dollar'):
+                    code = i + gap
+                    if buf.startswith("\\", code):
+                        newline = self._find("\n", code)
+                        stop = newline if newline >= 0 else len(self.buffer)
+                        return self._emit("meta", start, code, stop, stop + 1)
+            if m is None:
+                if code is None:
+                    self.line += buf.count("\n", start)
+                    self.pos = len(buf)
+                    raise StopIteration
+                return self._emit("sql", start, code, len(buf), len(buf))
+            if kind is None:
+                if code is None:
+                    # empty statement
+                    self.line += buf.count("\n", start, m.end())
+                    start = i = self.pos = m.end()
+                    continue
+                return self._emit("sql", start, code, m.start(), m.end())
+            if kind == 'block':
+                i = self._end_of_block_comment(m.end())
+            elif kind == 'dollar':
+                closing = self._find(m.group(), m.end())
+                i = closing + len(m.group()) if closing >= 0 else len(self.buffer)
+            else:
+                i = m.end()
+
+    def _emit(self, kind: str, start: int, code: int, stop: int, resume: int):
+        text = self.buffer[start:stop]
+        line = self.line + self.buffer.count("\n", start, code)
+        self.line += self.buffer.count("\n", start, min(resume, len(self.buffer)))
+        self.pos = min(resume, len(self.buffer))
+        return kind, text, line, code - start
+
+    def copy_data(self, block_size: int = 1 << 16):
+        """Yield the data of the COPY ... FROM stdin just read, as UTF-8 blocks, up to the \\. line"""
+        newline = self._find("\n", self.pos)
+        self.pos = newline + 1 if newline >= 0 else len(self.buffer)
+        self.line += 1
+        pending = []
+        size = 0
+        while True:
+            newline = self._find("\n", self.pos)
+            if newline < 0:
+                newline = len(self.buffer)
+                if self.pos >= newline:
+                    break
+            row = self.buffer[self.pos:newline + 1]
+            self.pos = newline + 1
+            self.line += 1
+            if row.rstrip("\r\n") == "\\.":
+                break
+            pending.append(row)
+            size += len(row)
+            if size >= block_size:
+                yield "".join(pending).encode("utf-8")
+                pending = []
+                size = 0
+            if self.pos >= self.chunk_size:
+                self.buffer = self.buffer[self.pos:]
+                self.pos = 0
+        if pending:
+            yield "".join(pending).encode("utf-8")
+        self.pos = min(self.pos, len(self.buffer))
+
+
+# COPY ... FROM STDIN options that map onto copy_to_table keywords
+COPY_OPTIONS = {'format': 'format', 'freeze': 'freeze', 'delimiter': 'delimiter', 'null': 'null', 'header': 'header',
+                'quote': 'quote', 'escape': 'escape', 'force_not_null': 'force_not_null', 'force_null': 'force_null',
+                'encoding': 'encoding'}
+
+
+def parse_copy_from_stdin(statement: str) -> Dict[str, Any]:
+    """Split `COPY [schema.]table [(columns)] FROM STDIN [options]` into copy_to_table arguments.
+
+    Identifiers come back unquoted (unquoted ones lower-cased), options as keywords,
+    in both the parenthesized and the pre-9.0 syntax (CSV HEADER, DELIMITER 'x').
+    Raises ValueError for what copy_to_table cannot express, such as WHERE or binary data.
+    """
+    import re
+
+    tokens = []
+    for m in re.finditer(r"""\s+|--[^\n]*|/\*.*?\*/|"((?:[^"]|"")*)"|[eE]'((?:[^'\\]|''|\\.)*)'|'((?:[^']|'')*)'"""
+                         r"""|([^\W\d][\w$]*|[\d.]+|\*)|([().,;])|(.)""", statement, re.DOTALL):
+        quoted, escaped, string, word, punct, other = m.groups()
+        if quoted is not None:
+            tokens.append(('ident', quoted.replace('""', '"')))
+        elif escaped is not None:
+            tokens.append(('string', re.sub(r"\\(?:([0-7]{1,3})|x([0-9a-fA-F]{1,2})|(.))", _unescape_copy_text,
+                                            escaped.replace("''", "'"))))
+        elif string is not None:
+            tokens.append(('string', string.replace("''", "'")))
+        elif word is not None:
+            tokens.append(('word', word.lower()))
+        elif punct is not None:
+            if punct != ';':
+                tokens.append(('punct', punct))
+        elif other is not None:
+            tokens.append(('other', other))
+    tokens.append(('end', None))
+    position = 0
+
+    def take(*expected):
+        nonlocal position
+        kind, value = tokens[position]
+        if expected and value not in expected:
+            raise ValueError(f"expected {' or '.join(expected).upper()}, found {str(value or 'end').upper()}")
+        position += 1
+        return kind, value
+
+    def peek(value) -> bool:
+        return tokens[position][1] == value and tokens[position][0] in ('word', 'punct')
+
+    def name() -> str:
+        kind, value = take()
+        if kind not in ('ident', 'word'):
+            raise ValueError(f"expected a name, found {value!r}")
+        return value
+
+    def names() -> list:
+        take('(')
+        result = [name()]
+        while peek(','):
+            take(',')
+            result.append(name())
+        take(')')
+        return result
+
+    take('copy')
+    schema, table = None, name()
+    if peek('.'):
+        take('.')
+        schema, table = table, name()
+    columns = names() if peek('(') else None
+    take('from')
+    take('stdin')
+    options = {}
+    if peek('with'):
+        take('with')
+    if peek('('):
+        take('(')
+        while True:
+            option = name()
+            if option not in COPY_OPTIONS:
+                raise ValueError(f"option {option.upper()} is not supported")
+            if peek('('):
+                options[option] = names()
+            elif peek(',') or peek(')'):
+                options[option] = True
+            else:
+                kind, value = take()
+                if option in ('freeze', 'header'):
+                    if value not in ('true', 'on', '1', 'false', 'off', '0'):
+                        raise ValueError(f"{option.upper()} {str(value).upper()} is not supported")
+                    value = value in ('true', 'on', '1')
+                options[option] = value
+            if not peek(','):
+                break
+            take(',')
+        take(')')
+    else:
+        # the syntax before PostgreSQL 9.0, still written by older dumps
+        while tokens[position][0] == 'word':
+            keyword = take()[1]
+            if keyword in ('binary', 'csv'):
+                options['format'] = keyword
+            elif keyword == 'header':
+                options['header'] = True
+            elif keyword in ('delimiter', 'null', 'quote', 'escape'):
+                if peek('as'):
+                    take('as')
+                kind, value = take()
+                if kind != 'string':
+                    raise ValueError(f"{keyword.upper()} needs a string")
+                options[keyword] = value
+            else:
+                raise ValueError(f"{keyword.upper()} is not supported")
+    if tokens[position][0] != 'end':
+        raise ValueError(f"{str(tokens[position][1]).upper()} is not supported")
+    if str(options.get('format', 'text')).lower() == 'binary':
+        raise ValueError("binary COPY data cannot be read from a script")
+    return {'table_name': table, 'schema_name': schema, 'columns': columns, **options}
+
+
+async def run_script(args):
+    """Run a SQL script from a file or stdin, statement by statement on one connection"""
+    import time
+    import asyncpg
+    from rich.progress import Progress, TextColumn, BarColumn, DownloadColumn, TransferSpeedColumn, TimeElapsedColumn
+
     if not args.database:
         db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
         if db_config and db_config.get('database'):
@@ -826,153 +4718,338 @@ async def show_indexes(args):
         else:
             rich_print("❌ Database name required. Use -d/--database", color="#FF4500", bold=True)
             return
-    
+
+    if args.FILE != '-' and not os.path.isfile(args.FILE):
+        rich_print(f"❌ File not found: {args.FILE}", color="#FF4500", bold=True)
+        return
+    if args.single_transaction and args.on_error == 'continue':
+        rich_print("❌ --on-error continue cannot be combined with --single-transaction", color="#FF4500", bold=True)
+        return
+
+    patterns = _sql_patterns()
+    batch_size = max(1, args.batch)
     config = get_db_config_or_args(args)
-    conn = await get_connection(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
-    
-    try:
-        if args.table:
-            results = await conn.fetch("""
-                SELECT indexname AS index_name, indexdef AS definition
-                FROM pg_indexes
-                WHERE schemaname NOT IN ('pg_catalog', 'information_schema')
-                AND tablename = $1
-                ORDER BY indexname;
-            """, args.table)
-            title = f"Indexes in table '{args.table}'"
-        else:
-            results = await conn.fetch("""
-                SELECT schemaname AS schema, tablename AS table,
-                       indexname AS index_name, indexdef AS definition
-                FROM pg_indexes
-                WHERE schemaname NOT IN ('pg_catalog', 'information_schema')
-                ORDER BY schemaname, tablename, indexname;
-            """)
-            title = f"Indexes in database '{args.database}'"
-        
-        if not results:
-            rich_print(f"📭 No indexes found", color="#FFFF00")
+    conn = await get_connection(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level,
+                                use_daemon=False)
+
+    stream = sys.stdin.buffer if args.FILE == '-' else open(args.FILE, 'rb')
+    total_bytes = None if args.FILE == '-' else os.path.getsize(args.FILE)
+    reader = SqlScriptReader(stream, encoding=args.encoding)
+    state = {'ok': 0, 'failed': 0, 'skipped': 0, 'copied': 0, 'stop': False}
+    batch = []
+    pending = None
+
+    def report(statements, error: Exception):
+        """Print the error with the statement it came from (found by the error position in a batch)"""
+        state['failed'] += 1
+        text, line, offset = statements[0]
+        position = str(getattr(error, 'position', None) or '')
+        if position.isdigit():
+            remaining = int(position) - 1
+            for candidate in statements:
+                if remaining < len(candidate[0]) + 2:
+                    text, line, offset = candidate
+                    line += text.count("\n", offset, max(offset, remaining))
+                    break
+                remaining -= len(candidate[0]) + 2
+        elif len(statements) > 1:
+            rich_print(f"❌ {error}\n   in a batch of {len(statements)} statements from line {line}, rolled back",
+                       color="#FF4500", bold=True)
             return
-        
-        table = Table(title=title, show_header=True, header_style="bold magenta")
-        
-        if args.table:
-            table.add_column("Index Name", style="cyan")
-            table.add_column("Definition", style="green")
-            for row in results:
-                table.add_row(row['index_name'], row['definition'])
+        head = " ".join(text[offset:].split())
+        rich_print(f"❌ line {line}: {error}\n   {head[:100]}{'...' if len(head) > 100 else ''}", color="#FF4500", bold=True)
+        if len(statements) > 1:
+            rich_print(f"   (the batch of {len(statements)} statements from line {statements[0][1]} was rolled back)", color="#FFFF00")
+
+    async def execute(statements):
+        """Run statements in one round trip; a failed batch rolls back and is replayed one by one with --on-error continue"""
+        try:
+            await conn.execute(";\n".join(text for text, _, _ in statements))
+            state['ok'] += len(statements)
+            return
+        except asyncpg.PostgresError as e:
+            if len(statements) > 1 and args.on_error == 'continue' and not conn.is_in_transaction():
+                for statement in statements:
+                    try:
+                        await conn.execute(statement[0])
+                        state['ok'] += 1
+                    except asyncpg.PostgresError as single:
+                        report([statement], single)
+                return
+            report(statements, e)
+            if args.on_error == 'stop':
+                state['stop'] = True
+
+    async def drain():
+        """Send the buffered batch; parsing of the next one overlaps with its execution"""
+        nonlocal batch, pending
+        if pending is not None:
+            await pending
+            pending = None
+        if batch and not state['stop']:
+            pending = asyncio.ensure_future(execute(batch))
+            batch = []
+            await asyncio.sleep(0)
+
+    async def finish():
+        await drain()
+        if pending is not None:
+            await pending
+
+    async def copy_in(statement):
+        text, line, offset = statement
+        data = reader.copy_data()
+
+        async def blocks():
+            for block in data:
+                yield block
+        try:
+            target = parse_copy_from_stdin(text[offset:])
+        except ValueError as e:
+            state['failed'] += 1
+            rich_print(f"❌ line {line}: cannot run this COPY FROM STDIN ({e}); its data was skipped", color="#FF4500", bold=True)
+            if args.on_error == 'stop':
+                state['stop'] = True
+            for _ in data:
+                pass
+            return
+        try:
+            status = await conn.copy_to_table(source=blocks(), **target)
+            state['ok'] += 1
+            state['copied'] += int(status.split()[-1]) if status and status.split()[-1].isdigit() else 0
+        except asyncpg.PostgresError as e:
+            report([statement], e)
+            if args.on_error == 'stop':
+                state['stop'] = True
+        for _ in data:
+            pass
+
+    started = time.monotonic()
+    transaction = conn.transaction() if args.single_transaction else None
+    try:
+        if transaction:
+            await transaction.start()
+        with Progress(
+            TextColumn("[bold cyan]{task.description}"), BarColumn(), DownloadColumn(), TransferSpeedColumn(),
+            TextColumn("[green]{task.fields[statements]:,} statements · {task.fields[rate]:,.0f}/s"), TimeElapsedColumn(),
+            transient=True,
+        ) as progress:
+            task = progress.add_task(f"Running {os.path.basename(args.FILE) if args.FILE != '-' else 'stdin'}",
+                                     total=total_bytes, statements=0, rate=0.0)
+            last_update = 0.0
+            for kind, text, line, offset in reader:
+                if kind == 'meta':
+                    await finish()
+                    state['skipped'] += 1
+                    rich_print(f"⚠️ line {line}: skipping psql meta-command {text[offset:].split()[0]}", color="#FFFF00")
+                elif patterns['copy_from_stdin'].match(text, offset):
+                    await finish()
+                    if not state['stop']:
+                        await copy_in((text, line, offset))
+                elif patterns['solo'].match(text, offset):
+                    await finish()
+                    if not state['stop']:
+                        await execute([(text, line, offset)])
+                else:
+                    batch.append((text, line, offset))
+                    if len(batch) >= batch_size:
+                        await drain()
+                if state['stop']:
+                    break
+                now = time.monotonic()
+                if now - last_update > 0.1:
+                    last_update = now
+                    done = state['ok'] + state['failed']
+                    progress.update(task, completed=reader.bytes_read, statements=done, rate=done / max(now - started, 1e-9))
+            await finish()
+
+        if transaction:
+            if state['stop']:
+                await transaction.rollback()
+                rich_print("↩️ Transaction rolled back", color="#FFFF00", bold=True)
+            else:
+                await transaction.commit()
+
+        elapsed = max(time.monotonic() - started, 1e-9)
+        done = state['ok'] + state['failed']
+        summary = (f"{state['ok']:,} statements" + (f", {state['failed']:,} failed" if state['failed'] else "")
+                   + (f", {state['skipped']:,} meta-commands skipped" if state['skipped'] else "")
+                   + (f", {state['copied']:,} rows copied" if state['copied'] else "")
+                   + f" in {elapsed:.2f}s ({done / elapsed:,.0f} statements/s, {reader.bytes_read / (1024**2) / elapsed:.2f} MB/s)")
+        if state['stop']:
+            rich_print(f"❌ Stopped at the first error: {summary}", color="#FF4500", bold=True)
         else:
-            table.add_column("Schema", style="cyan")
-            table.add_column("Table", style="green")
-            table.add_column("Index Name", style="yellow")
-            table.add_column("Definition", style="blue")
-            for row in results:
-                table.add_row(row['schema'], row['table'], row['index_name'], row['definition'])
-        
-        Console().print(table)
-    
+            rich_print(f"✅ Ran {summary}", color="#00FF7F" if not state['failed'] else "#FFFF00", bold=True)
+
     except Exception as e:
-        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+        rich_print(f"❌ Run error: {e}", color="#FF4500", bold=True)
     finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
         await conn.close()
 
 
-async def show_size(args):
-    """Show database or table sizes"""
-    from rich.console import Console
-    from rich.table import Table
+# ============================================================================
+# CREATE & DROP COMMANDS
+# ============================================================================
+
+async def create_user_db(args):
+    """Create PostgreSQL user and database"""
+    import asyncpg
+    from pwinput import pwinput
+    from configset import configset
+    from pathlib import Path
+    config = configset(str(Path(__file__).parent / 'psqlc.ini'))
     
-    if not args.database:
-        db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
-        if db_config and db_config.get('database'):
-            args.database = db_config.get('database')
-            rich_print(f"📄 Using database: {args.database}", color="#00CED1")
-        else:
-            # Show all database sizes
-            config = get_db_config_or_args(args)
-            conn = await get_connection(**config, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
-            
-            try:
-                results = await conn.fetch("""
-                    SELECT datname AS database,
-                           pg_size_pretty(pg_database_size(datname)) AS size,
-                           pg_database_size(datname) AS size_bytes
-                    FROM pg_database
-                    WHERE datistemplate = false
-                    ORDER BY pg_database_size(datname) DESC;
-                """)
-                
-                table = Table(title="Database Sizes", show_header=True, header_style="bold magenta")
-                table.add_column("Database", style="cyan")
-                table.add_column("Size", style="green")
-                
-                total_size = sum(row['size_bytes'] for row in results)
-                for row in results:
-                    table.add_row(row['database'], row['size'])
-                
-                Console().print(table)
-                rich_print(f"\n📊 Total Size: {total_size / (1024**3):.2f} GB", color="#00CED1", bold=True)
-            
-            except Exception as e:
-                rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
-            finally:
-                await conn.close()
-            return
+    logger.notice(f"args.CONFIG: {args.CONFIG}")
+    logger.notice(f"LEN args.CONFIG: {len(args.CONFIG)}")
+    logger.notice(f"args.up_level: {args.up_level}")
+    logger.notice(f"args.down_level: {args.down_level}")
+
+    if args.CONFIG:
+        args.up_level = 0
+        args.down_level = 0
+    db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
+
+    logger.debug(f"db_config: {db_config}")
+    logger.debug(f"config.get_config('server', 'host'): {config.get_config('server', 'host')}")
+    username = password = database = None
+    PORT = config.get_config('server', 'port') or args.port or DEFAULT_PORT
+    HOST = config.get_config('server', 'host') or args.hostname
     
-    config = get_db_config_or_args(args)
-    conn = await get_connection(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+    # Parse configuration
+    if args.CONFIG and len(args.CONFIG) == 3:
+        username, password, database = args.CONFIG
+        logger.debug(f"username: {username}, password: {'*****' if password else ''}, database: {database}, HOST: {HOST}, PORT: {PORT}")
+    elif not args.username and not args.password and not args.database:
+        if db_config:
+            username = db_config.get('username')
+            password = db_config.get('password')
+            database = db_config.get('database')
+            HOST = db_config.get('host') or HOST
+            PORT = db_config.get('port') or PORT
+    elif args.CONFIG and len(args.CONFIG) == 1:
+        if os.path.isfile(args.CONFIG[0]) and args.CONFIG[0].endswith("settings.py"):
+            db_config = parse_django_settings(args.CONFIG[0], max_depth_up=args.up_level, max_depth_down=args.down_level)
+        elif os.path.isdir(args.CONFIG[0]):
+            settings_path = os.path.join(args.CONFIG[0], "settings.py")
+            if os.path.isfile(settings_path):
+                db_config = parse_django_settings(settings_path, max_depth_up=args.up_level, max_depth_down=args.down_level)
+        
+        if db_config:
+            username = db_config.get('username')
+            password = db_config.get('password')
+            database = db_config.get('database')
+            HOST = db_config.get('host') or HOST
+            PORT = db_config.get('port') or PORT
+    
+    logger.debug(f"username: {username}, password: {'*****' if password else ''}, database: {database}, HOST: {HOST}, PORT: {PORT}")
+    # if not username or not password or not database:
+    username = username or args.username or (db_config.get('username') if db_config else None)
+    password = password or args.password or (db_config.get('password') if db_config else None)
+    database = database or args.database or (db_config.get('database') if db_config else None)
+    
+    logger.debug(f"username: {username}, password: {'*****' if password else ''}, database: {database}, HOST: {HOST}, PORT: {PORT}")
+
+    args.password = password if not args.password else args.password
+    args.user = username if not args.user else args.user
+    args.database = database if not args.database else args.database
+
+    logger.debug(f"username: {username}, password: {'*****' if password else ''}, database: {database}, HOST: {HOST}, PORT: {PORT}")
+    
+    if not all([username, password, database]):
+        rich_print("❌ Missing required info (username, password, database)", color="#FF4500", bold=True)
+        sys.exit(1)
+    
+    rich_print(f"🕵🏿 USERNAME: {username}", color="#00CED1", bold=True)
+    rich_print(f"🔑 PASSWORD: {'*****' if password else ''}", color="#FFFF00", bold=True)
+    rich_print(f"🧰 DATABASE: {database}", color="#00FF7F", bold=True)
+    rich_print(f"👻 HOSTNAME: {HOST}", color="#FFFFFF")
+    rich_print(f"🚢 PORT: {PORT}", color="#FFFFFF")
+    
+    async def start():
+        logger.info(f"args.user: {args.user}")
+        logger.info(f"args.password: {args.password}")
+        logger.info(f"HOST: {HOST}")
+        logger.info(f"PORT: {PORT}")
+
+        conn = await asyncpg.connect(database="postgres", user=args.user, host=HOST, port=PORT, password=args.passwd)
+        
+        try:
+            await conn.execute(f"CREATE USER {username} WITH PASSWORD '{password}'")
+            rich_print(f"✅ User '{username}' created", color="#00FF7F", bold=True)
+        except asyncpg.DuplicateObjectError:
+            rich_print(f"⚠️ User '{username}' already exists", color="#FFFF00", bold=True)
+        
+        await conn.execute(f"ALTER USER {username} WITH LOGIN CREATEDB REPLICATION BYPASSRLS")
+        rich_print(f"✅ User '{username}' updated with privileges", color="#00FF7F", bold=True)
+        
+        await conn.close()
+        rich_print("🔒 Logged out from postgres superuser", color="#00CED1")
+
+    # Create user
+    try:
+        await start()
+    except asyncpg.InvalidPasswordError:
+        rich_print("❌ Invalid PostgreSQL password", color="#FF4500", bold=True)
+        pwinput(f"[{os.getpid()}]Password for {args.user}: ")
+        return
+    
+    except Exception as e:
+        if str(os.getenv('TRACEBACK', '0')).lower() in ['1', 'yes', 'true']:
+            print_exception()
+        else:
+            rich_print(f"❌ Error (superuser connection): {e}", color="#FF4500", bold=True)
+            while 1:
+                args.password = pwinput(f"[{os.getpid()}]Password for {args.user} [q/x/quit/exit for exit]: ")
+                if args.password:
+                    if args.password in ['x', 'q', 'exit', 'quit']:
+                        rich_print(f"❌ exit/quit without password user '{args.user}' nedded !", color="#FF4500", bold=True)
+                        return
+                    else:
+                        break
+        return
     
+    # Create database
     try:
-        if args.table:
-            result = await conn.fetchrow("""
-                SELECT pg_size_pretty(pg_total_relation_size($1)) AS total_size,
-                       pg_size_pretty(pg_relation_size($1)) AS table_size,
-                       pg_size_pretty(pg_total_relation_size($1) - pg_relation_size($1)) AS indexes_size
-            """, args.table)
+        logger.warning(f"username = {username}")
+        logger.warning(f"password = {password}")
+        logger.warning(f"HOST = {HOST}")
+        logger.warning(f"PORT = {PORT}")
+
+        conn = await connect(database="template1", user=username, password=password, host=HOST, port=PORT)
+        if not conn:
+            rich_print(f"❌ Error (Failed connect to database server)", color="#FF4500", bold=True)
+            return
+
+        result = await conn.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", database)
+        if result:
+            rich_print(f"⚠️ Database '{database}' already exists.", color="#FFFF00", bold=True)
+            rich_print(f"❓ Drop and recreate '{database}'? [y/N]: ", color="#FFFF00", bold=True, end="")
+            choice = input().strip().lower()
             
-            if result:
-                rich_print(f"\n📊 Size of table '{args.table}':", color="#00CED1", bold=True)
-                rich_print(f"   Total Size:   {result['total_size']}", color="#00FF7F")
-                rich_print(f"   Table Size:   {result['table_size']}", color="#FFFF00")
-                rich_print(f"   Indexes Size: {result['indexes_size']}", color="#FF69B4")
+            if choice == "y":
+                try:
+                    await conn.execute(f"DROP DATABASE {database}")
+                    rich_print(f"🗑️ Database '{database}' dropped", color="#FF4500", bold=True)
+                    await conn.execute(f"CREATE DATABASE {database}")
+                    rich_print(f"✅ Database '{database}' recreated", color="#00FF7F", bold=True)
+                except Exception as e:
+                    rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
             else:
-                rich_print(f"❌ Table '{args.table}' not found", color="#FF4500", bold=True)
+                rich_print(f"⏭️ Skipping database creation", color="#FFFF00", bold=True)
         else:
-            results = await conn.fetch("""
-                SELECT schemaname AS schema, tablename AS table,
-                       pg_size_pretty(pg_total_relation_size(schemaname||'.'||tablename)) AS total_size,
-                       pg_total_relation_size(schemaname||'.'||tablename) AS size_bytes
-                FROM pg_tables
-                WHERE schemaname NOT IN ('pg_catalog', 'information_schema')
-                ORDER BY pg_total_relation_size(schemaname||'.'||tablename) DESC;
-            """)
-            
-            if not results:
-                rich_print(f"📭 No tables found in '{args.database}'", color="#FFFF00")
-                return
-            
-            table = Table(title=f"Table Sizes in '{args.database}'", show_header=True, header_style="bold magenta")
-            table.add_column("Schema", style="cyan")
-            table.add_column("Table", style="green")
-            table.add_column("Total Size", style="yellow")
-            
-            total_size = sum(row['size_bytes'] for row in results)
-            for row in results:
-                table.add_row(row['schema'], row['table'], row['total_size'])
-            
-            Console().print(table)
-            rich_print(f"\n📊 Total Size: {total_size / (1024**3):.2f} GB", color="#00CED1", bold=True)
-    
-    except Exception as e:
-        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
-    finally:
+            try:
+                await conn.execute(f"CREATE DATABASE {database}")
+                rich_print(f"✅ Database '{database}' created", color="#00FF7F", bold=True)
+            except Exception as e:
+                if "already exists" not in str(e):
+                    raise
+                rich_print(f"⚠️ Database '{database}' already exists", color="#FFFF00", bold=True)
+        
         await conn.close()
-
-async def connect(database="template1", user='postgres', password='', host='127.0.0.1', port=5432):
-    import asyncpg
-    try:
-        conn = await asyncpg.connect(database=database, user=user, password=password, host=host, port=port)
-        return conn
+        rich_print("🔒 Logged out from new user session", color="#00CED1")
+    
     except Exception as e:
         if str(os.getenv("TRACEBACK", "0")).lower() in ["1", "true", "yes"]:
             if tprint:
@@ -982,16 +5059,11 @@ async def connect(database="template1", user='postgres', password='', host='127.
                 print(traceback.format_exc())
         else:
             rich_print(f"❌ Error (new user connection): {e}", color="#FF4500", bold=True)
-    return
 
-# ============================================================================
-# DESCRIBE & QUERY COMMANDS
-# ============================================================================
 
-async def describe_table(args):
-    """Show table structure"""
-    from rich.console import Console
-    from rich.table import Table
+async def drop_database(args):
+    """Drop a database with confirmation"""
+    import asyncpg
     
     if not args.database:
         db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
@@ -1002,54 +5074,357 @@ async def describe_table(args):
             rich_print("❌ Database name required. Use -d/--database", color="#FF4500", bold=True)
             return
     
-    if not args.table:
-        rich_print("❌ Table name required. Use -t/--table", color="#FF4500", bold=True)
-        return
+    rich_print(f"⚠️ WARNING: You are about to DROP database '{args.database}'", color="#FFE713", bold=True)
+    rich_print(f"❓ Type the database name to confirm: ", color="#19CDFF", bold=True, end="")
+    confirmation = input().strip()
     
-    config = get_db_config_or_args(args)
-    conn = await get_connection(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+    if confirmation != args.database:
+        rich_print("❌ Database name mismatch. Aborted.", color="#FF0008", bold=True)
+        return
     
     try:
-        results = await conn.fetch("""
-            SELECT column_name, data_type, character_maximum_length,
-                   is_nullable, column_default
-            FROM information_schema.columns
-            WHERE table_name = $1
-            ORDER BY ordinal_position;
-        """, args.table)
-        
-        if not results:
-            rich_print(f"❌ Table '{args.table}' not found", color="#FF4500", bold=True)
-            return
+        logger.notice(f"database : postgres")
+        logger.notice(f"user     : {args.user}")
+        logger.notice(f"password : {args.passwd}")
+        logger.notice(f"host     : {args.hostname}")
+        logger.notice(f"port     : {args.port}")
+
+        conn = await asyncpg.connect(
+            database="postgres",
+            user=args.user,
+            host=args.hostname,
+            port=args.port,
+            password=args.passwd,
+        )
         
-        table = Table(title=f"Structure of '{args.table}'", show_header=True, header_style="bold magenta")
-        table.add_column("Column", style="cyan")
-        table.add_column("Type", style="green")
-        table.add_column("Max Length", style="yellow")
-        table.add_column("Nullable", style="blue")
-        table.add_column("Default", style="magenta")
+        await conn.execute("""
+            SELECT pg_terminate_backend(pid)
+            FROM pg_stat_activity
+            WHERE datname = $1 AND pid <> pg_backend_pid()
+        """, args.database)
         
-        for row in results:
-            table.add_row(
-                row['column_name'], row['data_type'],
-                str(row['character_maximum_length']) if row['character_maximum_length'] else "-",
-                row['is_nullable'],
-                str(row['column_default']) if row['column_default'] else "-"
-            )
+        await conn.execute(f"DROP DATABASE IF EXISTS {args.database}")
+        rich_print(f"✅ Database '{args.database}' dropped successfully", color="#00FF7F", bold=True)
         
-        Console().print(table)
+        await conn.close()
     
     except Exception as e:
-        rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
-    finally:
+        rich_print(f"❌ Error dropping database [0]: {e}", color="#FF4500", bold=True)
+
+        if str(os.getenv('TRACEBACK', '0')).lower() in ['1', 'yes', 'true']:
+            print_exception()
+
+
+async def drop_user(args):
+    """Drop a user/role with confirmation"""
+    import asyncpg
+    
+    if not args.username:
+        rich_print("❌ Username required. Use -u/--username", color="#FF4500", bold=True)
+        return
+    
+    rich_print(f"⚠️  WARNING: You are about to DROP user '{args.username}'", color="#FF4500", bold=True)
+    rich_print(f"❓ Type the username to confirm: ", color="#FFFF00", bold=True, end="")
+    confirmation = input().strip()
+    
+    if confirmation != args.username:
+        rich_print("❌ Username mismatch. Aborted.", color="#FF4500", bold=True)
+        return
+    
+    try:
+        conn = await asyncpg.connect(
+            database="postgres",
+            user=args.user,
+            host=args.hostname,
+            port=args.port,
+            password=args.passwd,
+        )
+        
+        await conn.execute(f"DROP USER IF EXISTS {args.username}")
+        rich_print(f"✅ User '{args.username}' dropped successfully", color="#00FF7F", bold=True)
+        
         await conn.close()
+    
+    except Exception as e:
+        rich_print(f"❌ Error dropping user [1]: {e}", color="#FF4500", bold=True)
+
+
+# ============================================================================
+# LOAD COMMAND
+# ============================================================================
+
+def quote_ident(name: str) -> str:
+    """Quote an SQL identifier"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def split_table_name(name: str, schema: str = None):
+    """Split 'schema.table' into (schema, table), defaulting the schema to public"""
+    if '.' in name and not schema:
+        schema, name = name.split('.', 1)
+    return schema or 'public', name
+
+
+async def table_column_types(conn, schema: str, table: str) -> Dict[str, str]:
+    """Return {column: type name} for a table, in attribute order"""
+    rows = await conn.fetch("""
+        SELECT a.attname AS name, t.typname AS type
+        FROM pg_attribute a
+        JOIN pg_type t ON t.oid = a.atttypid
+        WHERE a.attrelid = to_regclass($1) AND a.attnum > 0 AND NOT a.attisdropped
+        ORDER BY a.attnum;
+    """, f"{quote_ident(schema)}.{quote_ident(table)}")
+    return {row['name']: row['type'] for row in rows}
+
+
+def _parse_bool(value: str) -> bool:
+    return value.strip().lower() in ('t', 'true', '1', 'y', 'yes', 'on')
+
+
+def _parse_datetime(value: str):
+    from datetime import datetime
+    return datetime.fromisoformat(value.strip().replace('Z', '+00:00').replace(' ', 'T', 1))
+
+
+def _parse_bytea(value: str) -> bytes:
+    return bytes.fromhex(value[2:] if value.startswith('\\x') else value)
+
+
+def _copy_parsers() -> dict:
+    """Type name -> parser from text to the Python value asyncpg's binary COPY encodes"""
+    import uuid
+    from datetime import date, time
+    from decimal import Decimal
+
+    return {
+        'int2': int, 'int4': int, 'int8': int, 'oid': int,
+        'float4': float, 'float8': float, 'numeric': Decimal,
+        'bool': _parse_bool,
+        'date': date.fromisoformat, 'time': time.fromisoformat,
+        'timestamp': _parse_datetime, 'timestamptz': _parse_datetime,
+        'uuid': uuid.UUID, 'bytea': _parse_bytea,
+    }
+
+
+# types binary COPY can take straight from text or JSON values without a parser
+COPY_TEXT_TYPES = ('text', 'varchar', 'bpchar', 'name', 'json', 'jsonb')
+
+
+def binary_copy_supported(type_names) -> bool:
+    """Whether every column type can be loaded with binary COPY.
+
+    Arrays, interval, timetz, domains, enums and extension types have no
+    converter here; a load touching any of them goes through text COPY.
+    """
+    parsers = _copy_parsers()
+    return all(name in parsers or name in COPY_TEXT_TYPES for name in type_names)
+
+
+def make_copy_converter(type_name: str):
+    """Return a function converting a CSV/JSON value to what asyncpg's binary COPY expects for `type_name`"""
+    import json
+    from decimal import Decimal
+
+    parse = _copy_parsers().get(type_name)
+
+    def convert(value):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            return parse(value) if parse else value
+        if type_name in ('json', 'jsonb'):
+            return json.dumps(value)
+        if type_name == 'numeric' and isinstance(value, (int, float)):
+            return Decimal(str(value))
+        if type_name in ('text', 'varchar', 'bpchar', 'name'):
+            return str(value)
+        return value
+
+    return convert
+
+
+def _pg_array_literal(values) -> str:
+    """PostgreSQL array literal for a (nested) list, elements quoted"""
+    items = []
+    for value in values:
+        if value is None:
+            items.append('NULL')
+        elif isinstance(value, list):
+            items.append(_pg_array_literal(value))
+        else:
+            text = ('t' if value else 'f') if isinstance(value, bool) else str(value)
+            items.append('"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"')
+    return '{' + ','.join(items) + '}'
+
+
+def make_text_converter(type_name: str):
+    """Return a function converting a CSV/JSON value to its PostgreSQL text form, None for NULL"""
+    import json
+
+    def convert(value):
+        if value is None or isinstance(value, str):
+            return value
+        if type_name in ('json', 'jsonb'):
+            return json.dumps(value)
+        if isinstance(value, bool):
+            return 't' if value else 'f'
+        if isinstance(value, list):
+            return _pg_array_literal(value)
+        if isinstance(value, dict):
+            return json.dumps(value)
+        return str(value)
+
+    return convert
+
+
+def csv_copy_line(values) -> str:
+    """One line of COPY ... (FORMAT csv): NULL is an unquoted empty field, every other value is quoted"""
+    return ','.join('' if value is None else '"' + value.replace('"', '""') + '"' for value in values) + '\n'
+
+
+def _split_csv_record(raw: str, delimiter: str) -> list:
+    """Split one CSV record exactly, None for unquoted empty fields and '' for quoted ones"""
+    fields = []
+    i, end = 0, len(raw.rstrip('\r\n'))
+    while True:
+        if i < end and raw[i] == '"':
+            i += 1
+            parts = []
+            while i < end:
+                quote = raw.find('"', i)
+                if quote < 0:
+                    parts.append(raw[i:end])
+                    i = end
+                    break
+                parts.append(raw[i:quote])
+                if raw.startswith('""', quote):
+                    parts.append('"')
+                    i = quote + 2
+                else:
+                    i = quote + 1
+                    break
+            stop = raw.find(delimiter, i, end)
+            stop = end if stop < 0 else stop
+            fields.append(''.join(parts) + raw[i:stop])
+        else:
+            stop = raw.find(delimiter, i, end)
+            stop = end if stop < 0 else stop
+            fields.append(raw[i:stop] or None)
+        if stop >= end:
+            return fields
+        i = stop + len(delimiter)
+
+
+def csv_records(lines, delimiter: str = ','):
+    """Yield CSV records with None for unquoted empty fields and '' for quoted empty ones.
+
+    This is PostgreSQL's CSV rule for NULL. Python 3.12 csv does it with
+    QUOTE_NOTNULL; older versions re-split the few records containing `""`.
+    """
+    import csv
+
+    if hasattr(csv, 'QUOTE_NOTNULL'):
+        yield from csv.reader(lines, delimiter=delimiter, quoting=csv.QUOTE_NOTNULL)
+        return
+
+    consumed = []
+
+    def tap():
+        for line in lines:
+            consumed.append(line)
+            yield line
+
+    for row in csv.reader(tap(), delimiter=delimiter):
+        raw = ''.join(consumed)
+        consumed.clear()
+        if '""' in raw:
+            yield _split_csv_record(raw, delimiter)
+        else:
+            yield [field if field else None for field in row]
+
+
+_COPY_TEXT_ESCAPES = {'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t', 'v': '\v'}
+
+
+def _unescape_copy_text(match) -> str:
+    octal, hexa, char = match.groups()
+    if octal:
+        return chr(int(octal, 8))
+    if hexa:
+        return chr(int(hexa, 16))
+    return _COPY_TEXT_ESCAPES.get(char, char)
+
+
+def text_records(lines):
+    """Yield records of PostgreSQL's COPY text format, the TSV that COPY and `--format tsv` write.
+
+    Fields are split on tabs, \\N is NULL and backslash escapes (\\t, \\n, \\\\,
+    octal and \\x hex) are decoded. Quotes have no meaning. A \\. line ends the data.
+    """
+    import re
+
+    escape = re.compile(r'\\(?:([0-7]{1,3})|x([0-9a-fA-F]{1,2})|(.))')
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line == '\\.':
+            return
+        yield [None if field == '\\N' else escape.sub(_unescape_copy_text, field) if '\\' in field else field
+               for field in line.split('\t')]
+
+
+async def drop_table_indexes(conn, schema: str, table: str) -> List[str]:
+    """Drop indexes that back no constraint and return their definitions"""
+    rows = await conn.fetch("""
+        SELECT n.nspname AS schema, c.relname AS index_name, pg_get_indexdef(i.indexrelid) AS definition
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE i.indrelid = to_regclass($1)
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint con WHERE con.conindid = i.indexrelid);
+    """, f"{quote_ident(schema)}.{quote_ident(table)}")
+    for row in rows:
+        await conn.execute(f"DROP INDEX {quote_ident(row['schema'])}.{quote_ident(row['index_name'])}")
+        rich_print(f"🗑️ Dropped index {row['index_name']}", color="#FFFF00")
+    return [row['definition'] for row in rows]
+
+
+async def rebuild_indexes(pool, definitions: List[str]):
+    """Recreate indexes concurrently, one pooled connection per index"""
+    import time
+
+    async def build(definition: str):
+        started = time.monotonic()
+        async with pool.acquire() as conn:
+            await conn.execute(definition)
+        rich_print(f"🧱 {definition} ({time.monotonic() - started:.1f}s)", color="#00CED1")
+
+    await asyncio.gather(*(build(d) for d in definitions))
+
+
+def _detect_load_format(path: str) -> str:
+    lower = path.lower()
+    if lower.endswith(('.tsv', '.tab')):
+        return 'tsv'
+    if lower.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if lower.endswith('.json'):
+        return 'json'
+    return 'csv'
+
+
+async def load_data(args):
+    """Bulk load a CSV/TSV/JSON/JSONL file into a table with COPY.
 
+    With one connection (the default) the whole load is a single transaction and
+    a failure leaves the table as it was. With --parallel N each worker commits
+    its own batches, so a failed load keeps what the other workers copied.
+    """
+    import io
+    import json
+    import time
+    from itertools import chain, islice
+    from rich.progress import Progress, TextColumn, BarColumn, DownloadColumn, TransferSpeedColumn, TimeElapsedColumn
 
-async def execute_query(args):
-    """Execute a custom SQL query"""
-    from rich.console import Console
-    from rich.table import Table
-    
     if not args.database:
         db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
         if db_config and db_config.get('database'):
@@ -1058,320 +5433,1002 @@ async def execute_query(args):
         else:
             rich_print("❌ Database name required. Use -d/--database", color="#FF4500", bold=True)
             return
-    
-    if not args.query:
-        rich_print("❌ Query required. Use -q/--query", color="#FF4500", bold=True)
+
+    if args.FILE != '-' and not os.path.isfile(args.FILE):
+        rich_print(f"❌ File not found: {args.FILE}", color="#FF4500", bold=True)
         return
-    
-    if args.readonly:
-        dangerous_keywords = ['DROP', 'DELETE', 'TRUNCATE', 'ALTER', 'CREATE', 'INSERT', 'UPDATE']
-        if any(keyword in args.query.upper() for keyword in dangerous_keywords):
-            rich_print("❌ Destructive queries not allowed in read-only mode", color="#FF4500", bold=True)
-            return
-    
+
+    fmt = args.format or _detect_load_format(args.FILE)
+    schema, table = split_table_name(args.table, args.schema)
+    qualified = f"{quote_ident(schema)}.{quote_ident(table)}"
+    parallel = max(1, args.parallel)
+    mapping = {}
+    for pair in (args.map or '').split(','):
+        if ':' in pair:
+            src, dst = pair.split(':', 1)
+            mapping[src.strip()] = dst.strip()
+
     config = get_db_config_or_args(args)
-    conn = await get_connection(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
-    
+    pool = await get_pool(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level,
+                          min_size=parallel, max_size=parallel)
+    if pool is None:
+        return
+
+    stream = sys.stdin.buffer if args.FILE == '-' else open(args.FILE, 'rb')
+    total_bytes = None if args.FILE == '-' else os.path.getsize(args.FILE)
+    state = {'bytes': 0, 'rows': 0, 'error': None}
+    dropped_indexes = []
+
+    def counted_lines():
+        for raw in stream:
+            state['bytes'] += len(raw)
+            yield raw.decode(args.encoding)
+
     try:
-        if args.query.strip().upper().startswith('SELECT'):
-            results = await conn.fetch(args.query)
-            
-            if not results:
-                rich_print("✅ Query executed. No rows returned.", color="#00FF7F")
-                return
-            
-            columns = list(results[0].keys())
-            table = Table(title="Query Results", show_header=True, header_style="bold magenta")
-            
-            for col in columns:
-                table.add_column(col, style="cyan")
-            
-            max_rows = getattr(args, 'limit', 100) or 100
-            for row in results[:max_rows]:
-                table.add_row(*[str(row[col]) if row[col] is not None else "NULL" for col in columns])
-            
-            Console().print(table)
-            
-            if len(results) > max_rows:
-                rich_print(f"⚠️ Showing {max_rows} of {len(results)} rows", color="#FFFF00", bold=True)
+        async with pool.acquire() as conn:
+            column_types = await table_column_types(conn, schema, table)
+        if not column_types:
+            rich_print(f"❌ Table '{schema}.{table}' not found", color="#FF4500", bold=True)
+            return
+
+        explicit_columns = [c.strip() for c in args.columns.split(',')] if args.columns else None
+        if fmt in ('csv', 'tsv'):
+            reader = csv_records(counted_lines()) if fmt == 'csv' else text_records(counted_lines())
+            header = next(reader, None) if args.header else None
+            source_columns = explicit_columns or header or list(column_types)
+            first_record = None
         else:
-            await conn.execute(args.query)
-            rich_print("✅ Query executed successfully", color="#00FF7F", bold=True)
-    
+            if fmt == 'json':
+                # a JSON array has to be parsed whole before its first record is known
+                records = json.loads(''.join(counted_lines()) or '[]')
+                if not isinstance(records, list):
+                    rich_print("❌ A .json file must hold an array of objects; use --format jsonl for one object per line",
+                               color="#FF4500", bold=True)
+                    return
+                reader = iter(records)
+            else:
+                reader = (json.loads(line) for line in counted_lines() if line.strip())
+            first_record = next(reader, None)
+            source_columns = explicit_columns or (list(first_record) if first_record else [])
+
+        selected = [(i, mapping.get(src, src)) for i, src in enumerate(source_columns) if mapping.get(src, src)]
+        unknown = [dst for _, dst in selected if dst not in column_types]
+        if unknown:
+            rich_print(f"❌ Unknown column(s) in '{schema}.{table}': {', '.join(unknown)}", color="#FF4500", bold=True)
+            return
+
+        target_columns = [dst for _, dst in selected]
+        text_copy = not binary_copy_supported(column_types[dst] for dst in target_columns)
+        make_converter = make_text_converter if text_copy else make_copy_converter
+        if text_copy:
+            rich_print(f"📝 Using text COPY: not every column type of '{schema}.{table}' has a binary converter", color="#00CED1")
+        converters = [(i, make_converter(column_types[dst])) for i, dst in selected]
+        if fmt in ('csv', 'tsv'):
+            to_values = lambda row: tuple(conv(row[i]) if i < len(row) else None for i, conv in converters)
+        else:
+            keys = [(source_columns[i], conv) for i, conv in converters]
+            to_values = lambda obj: tuple(conv(obj.get(key)) for key, conv in keys)
+        to_record = (lambda item: csv_copy_line(to_values(item))) if text_copy else to_values
+
+        if args.drop_indexes:
+            async with pool.acquire() as conn:
+                dropped_indexes = await drop_table_indexes(conn, schema, table)
+
+        queue = asyncio.Queue(maxsize=parallel * 2)
+
+        async def worker():
+            async with pool.acquire() as conn:
+                transaction = conn.transaction() if parallel == 1 else None
+                if transaction:
+                    await transaction.start()
+                while True:
+                    batch = await queue.get()
+                    if batch is None:
+                        break
+                    if state['error']:
+                        continue
+                    try:
+                        if text_copy:
+                            await conn.copy_to_table(table, source=io.BytesIO(''.join(batch).encode('utf-8')),
+                                                     columns=target_columns, schema_name=schema, format='csv')
+                        else:
+                            await conn.copy_records_to_table(table, records=batch, columns=target_columns, schema_name=schema)
+                        state['rows'] += len(batch)
+                    except Exception as e:
+                        state['error'] = e
+                if transaction:
+                    if state['error']:
+                        await transaction.rollback()
+                    else:
+                        await transaction.commit()
+
+        started = time.monotonic()
+        with Progress(
+            TextColumn("[bold cyan]{task.description}"), BarColumn(), DownloadColumn(), TransferSpeedColumn(),
+            TextColumn("[green]{task.fields[rows]:,} rows · {task.fields[rate]:,.0f} rows/s"), TimeElapsedColumn(),
+        ) as progress:
+            task = progress.add_task(f"Loading {schema}.{table}", total=total_bytes, rows=0, rate=0.0)
+            workers = [asyncio.ensure_future(worker()) for _ in range(parallel)]
+
+            records = reader if first_record is None else chain([first_record], reader)
+
+            def read_batch() -> list:
+                return [to_record(item) for item in islice(records, args.batch_size)]
+
+            # decoding and converting run in a worker thread so COPY traffic keeps flowing meanwhile
+            loop = asyncio.get_running_loop()
+            try:
+                while not state['error']:
+                    batch = await loop.run_in_executor(None, read_batch)
+                    if not batch:
+                        break
+                    await queue.put(batch)
+                    elapsed = time.monotonic() - started
+                    progress.update(task, completed=state['bytes'], rows=state['rows'], rate=state['rows'] / max(elapsed, 1e-9))
+            except Exception as e:
+                # a bad input record: let the workers roll back or stop instead of waiting forever
+                state['error'] = e
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+            elapsed = time.monotonic() - started
+            progress.update(task, completed=state['bytes'], rows=state['rows'], rate=state['rows'] / max(elapsed, 1e-9))
+
+        if state['error'] and parallel == 1:
+            rich_print(f"❌ Load failed and was rolled back, no rows were loaded: {state['error']}", color="#FF4500", bold=True)
+        elif state['error']:
+            rich_print(f"❌ Load failed: {state['error']}", color="#FF4500", bold=True)
+            rich_print(f"⚠️ {state['rows']:,} rows from batches committed by the other workers remain in {schema}.{table}. "
+                       f"Delete them (or TRUNCATE {qualified} if it was empty) before loading again, "
+                       f"or rerun without --parallel for an all-or-nothing load", color="#FFFF00")
+        else:
+            rich_print(
+                f"✅ Loaded {state['rows']:,} rows, {state['bytes'] / (1024**2):.2f} MB in {elapsed:.2f}s "
+                f"({state['rows'] / max(elapsed, 1e-9):,.0f} rows/s, {state['bytes'] / (1024**2) / max(elapsed, 1e-9):.2f} MB/s)",
+                color="#00FF7F", bold=True
+            )
+
     except Exception as e:
-        rich_print(f"❌ Query error: {e}", color="#FF4500", bold=True)
+        rich_print(f"❌ Load error: {e}", color="#FF4500", bold=True)
     finally:
-        await conn.close()
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        try:
+            if dropped_indexes:
+                rich_print(f"🧱 Rebuilding {len(dropped_indexes)} index(es)...", color="#00CED1", bold=True)
+                await rebuild_indexes(pool, dropped_indexes)
+            if args.analyze and not state['error']:
+                async with pool.acquire() as conn:
+                    await conn.execute(f"ANALYZE {qualified}")
+                rich_print(f"📈 ANALYZE {schema}.{table} done", color="#00CED1")
+        finally:
+            await pool.close()
 
 
 # ============================================================================
-# CREATE & DROP COMMANDS
+# BACKUP COMMAND
 # ============================================================================
 
-async def create_user_db(args):
-    """Create PostgreSQL user and database"""
-    import asyncpg
-    from pwinput import pwinput
-    from configset import configset
-    from pathlib import Path
-    config = configset(str(Path(__file__).parent / 'psqlc.ini'))
-    
-    logger.notice(f"args.CONFIG: {args.CONFIG}")
-    logger.notice(f"LEN args.CONFIG: {len(args.CONFIG)}")
-    logger.notice(f"args.up_level: {args.up_level}")
-    logger.notice(f"args.down_level: {args.down_level}")
+BACKUP_FORMATS = {'plain': ('p', '.sql'), 'custom': ('c', '.dump'), 'directory': ('d', ''), 'tar': ('t', '.tar')}
 
-    if args.CONFIG:
-        args.up_level = 0
-        args.down_level = 0
-    db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
 
-    logger.debug(f"db_config: {db_config}")
-    logger.debug(f"config.get_config('server', 'host'): {config.get_config('server', 'host')}")
-    username = password = database = None
-    PORT = config.get_config('server', 'port') or args.port or DEFAULT_PORT
-    HOST = config.get_config('server', 'host') or args.hostname
-    
-    # Parse configuration
-    if args.CONFIG and len(args.CONFIG) == 3:
-        username, password, database = args.CONFIG
-        logger.debug(f"username: {username}, password: {'*****' if password else ''}, database: {database}, HOST: {HOST}, PORT: {PORT}")
-    elif not args.username and not args.password and not args.database:
-        if db_config:
-            username = db_config.get('username')
-            password = db_config.get('password')
-            database = db_config.get('database')
-            HOST = db_config.get('host') or HOST
-            PORT = db_config.get('port') or PORT
-    elif args.CONFIG and len(args.CONFIG) == 1:
-        if os.path.isfile(args.CONFIG[0]) and args.CONFIG[0].endswith("settings.py"):
-            db_config = parse_django_settings(args.CONFIG[0], max_depth_up=args.up_level, max_depth_down=args.down_level)
-        elif os.path.isdir(args.CONFIG[0]):
-            settings_path = os.path.join(args.CONFIG[0], "settings.py")
-            if os.path.isfile(settings_path):
-                db_config = parse_django_settings(settings_path, max_depth_up=args.up_level, max_depth_down=args.down_level)
-        
-        if db_config:
-            username = db_config.get('username')
-            password = db_config.get('password')
-            database = db_config.get('database')
-            HOST = db_config.get('host') or HOST
-            PORT = db_config.get('port') or PORT
-    
-    logger.debug(f"username: {username}, password: {'*****' if password else ''}, database: {database}, HOST: {HOST}, PORT: {PORT}")
-    # if not username or not password or not database:
-    username = username or args.username or (db_config.get('username') if db_config else None)
-    password = password or args.password or (db_config.get('password') if db_config else None)
-    database = database or args.database or (db_config.get('database') if db_config else None)
-    
-    logger.debug(f"username: {username}, password: {'*****' if password else ''}, database: {database}, HOST: {HOST}, PORT: {PORT}")
+async def table_size_distribution(conn) -> List[int]:
+    """Return on-disk sizes of all user tables (largest first)"""
+    rows = await conn.fetch("""
+        SELECT pg_total_relation_size(c.oid) AS size_bytes
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'm', 'p')
+          AND n.nspname NOT IN ('pg_catalog', 'information_schema')
+          AND n.nspname NOT LIKE 'pg_toast%'
+        ORDER BY 1 DESC;
+    """)
+    return [row['size_bytes'] for row in rows]
 
-    args.password = password if not args.password else args.password
-    args.user = username if not args.user else args.user
-    args.database = database if not args.database else args.database
 
-    logger.debug(f"username: {username}, password: {'*****' if password else ''}, database: {database}, HOST: {HOST}, PORT: {PORT}")
+def auto_backup_jobs(sizes: List[int], cpu_count: int = None) -> int:
+    """Pick a pg_dump --jobs value from the table size distribution.
+
+    A parallel dump cannot finish before its largest table, so workers beyond
+    total/largest only wait. The result is capped by CPU count and table count,
+    and small databases (< 64 MB) use a single job.
+    """
+    cpu_count = cpu_count or os.cpu_count() or 1
+    total = sum(sizes)
+    if not sizes or total < 64 * 1024**2:
+        return 1
+    useful = -(-total // max(sizes[0], 1))
+    return max(1, min(useful, cpu_count, len(sizes), 16))
+
+
+def pg_dump_command(params: Dict[str, Any], fmt: str, output: str, jobs: int = None,
+                    compress: str = None, level: int = None, version: int = None) -> List[str]:
+    """Build the pg_dump argument list for a backup.
+
+    pg_dump 16+ takes --compress=method[:level]; older versions only know
+    gzip levels via -Z, so the method is dropped there.
+    """
+    cmd = ["pg_dump", "-h", str(params['host']), "-p", str(params['port']), "-U", str(params['user']),
+           "-d", str(params['database']), "-F", BACKUP_FORMATS[fmt][0], "-f", output]
+    if jobs and jobs > 1:
+        cmd += ["-j", str(jobs)]
+    if compress:
+        if version is not None and version >= 16:
+            cmd += [f"--compress={compress}" + (f":{level}" if level is not None else "")]
+        else:
+            cmd += ["-Z", str(level if level is not None else 6)]
+    return cmd
+
+
+async def pg_dump_major_version() -> Optional[int]:
+    """Return the major version of pg_dump on PATH, or None when it is missing"""
+    import re
+    import shutil
+
+    if not shutil.which("pg_dump"):
+        return None
+    proc = await asyncio.create_subprocess_exec("pg_dump", "--version", stdout=asyncio.subprocess.PIPE)
+    out, _ = await proc.communicate()
+    match = re.search(r"(\d+)(?:\.\d+)?", out.decode(errors="ignore"))
+    return int(match.group(1)) if match else None
+
+
+async def run_pg_dump(cmd: List[str], env: Dict[str, str], output: str, table_count: int):
+    """Run pg_dump without blocking the event loop, showing tables done, bytes written and MB/s"""
+    import time
+    from rich.progress import Progress, TextColumn, BarColumn, MofNCompleteColumn, TimeElapsedColumn
+
+    def output_size() -> int:
+        if os.path.isdir(output):
+            total = 0
+            for entry in os.scandir(output):
+                try:
+                    total += entry.stat().st_size
+                except OSError:
+                    pass
+            return total
+        try:
+            return os.path.getsize(output)
+        except OSError:
+            return 0
+
+    proc = await asyncio.create_subprocess_exec(*cmd, env=env, stderr=asyncio.subprocess.PIPE)
+    started = time.monotonic()
+    errors = []
+
+    with Progress(
+        TextColumn("[bold cyan]{task.description}"), BarColumn(), MofNCompleteColumn(),
+        TextColumn("[green]{task.fields[written]:.1f} MB · {task.fields[rate]:.1f} MB/s"), TimeElapsedColumn(),
+    ) as progress:
+        task = progress.add_task("pg_dump", total=table_count or None, written=0.0, rate=0.0)
+
+        async def sample():
+            while True:
+                await asyncio.sleep(0.5)
+                written = output_size() / (1024**2)
+                progress.update(task, written=written, rate=written / max(time.monotonic() - started, 1e-9))
+
+        sampler = asyncio.ensure_future(sample())
+        try:
+            async for raw in proc.stderr:
+                line = raw.decode(errors="ignore").rstrip()
+                # verbose pg_dump logs one of these per table data item
+                if "dumping contents of table" in line or ("finished item" in line and "TABLE DATA" in line):
+                    progress.advance(task)
+                elif "error" in line.lower():
+                    errors.append(line)
+                logger.debug(line)
+            await proc.wait()
+        finally:
+            sampler.cancel()
+
+        written = output_size() / (1024**2)
+        elapsed = time.monotonic() - started
+        progress.update(task, completed=table_count, written=written, rate=written / max(elapsed, 1e-9))
+
+    for line in errors:
+        rich_print(f"   {line}", color="#FF4500")
+    return proc.returncode, written, elapsed
+
+
+async def backup_database(args):
+    """Back up a database with pg_dump, or print the command to run"""
+    import shlex
+    import asyncpg
+    from datetime import datetime
     
-    if not all([username, password, database]):
-        rich_print("❌ Missing required info (username, password, database)", color="#FF4500", bold=True)
-        sys.exit(1)
+    if not args.database:
+        db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
+        if db_config and db_config.get('database'):
+            args.database = db_config.get('database')
+            rich_print(f"📄 Using database: {args.database}", color="#00CED1")
+        else:
+            rich_print("❌ Database name required. Use -d/--database", color="#FF4500", bold=True)
+            return
     
-    rich_print(f"🕵🏿 USERNAME: {username}", color="#00CED1", bold=True)
-    rich_print(f"🔑 PASSWORD: {'*****' if password else ''}", color="#FFFF00", bold=True)
-    rich_print(f"🧰 DATABASE: {database}", color="#00FF7F", bold=True)
-    rich_print(f"👻 HOSTNAME: {HOST}", color="#FFFFFF")
-    rich_print(f"🚢 PORT: {PORT}", color="#FFFFFF")
+    fmt = getattr(args, 'format', None) or 'plain'
+    jobs = getattr(args, 'jobs', None)
+    compress = getattr(args, 'compress', None)
+    engine = getattr(args, 'engine', None) or 'pg_dump'
+
+    if engine == 'pg_dump' and compress == 'none':
+        compress = None
+    if engine == 'pg_dump' and jobs is not None and jobs != 1 and fmt != 'directory':
+        rich_print("❌ --jobs needs --format directory", color="#FF4500", bold=True)
+        return
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    extension = BACKUP_FORMATS[fmt][1]
+    backup_file = getattr(args, 'output', None) or f"{args.database}_backup_{timestamp}{extension}"
     
-    async def start():
-        logger.info(f"args.user: {args.user}")
-        logger.info(f"args.password: {args.password}")
-        logger.info(f"HOST: {HOST}")
-        logger.info(f"PORT: {PORT}")
+    rich_print(f"🗄️ Creating backup of '{args.database}'...", color="#00CED1", bold=True)
 
-        conn = await asyncpg.connect(database="postgres", user=args.user, host=HOST, port=PORT, password=args.passwd)
-        
+    config = get_db_config_or_args(args)
+    params = resolve_connection_params(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+    if params is None:
+        return
+
+    if engine == 'psqlc':
+        output_dir = getattr(args, 'output', None) or f"{args.database}_backup_{timestamp}.psqlc"
         try:
-            await conn.execute(f"CREATE USER {username} WITH PASSWORD '{password}'")
-            rich_print(f"✅ User '{username}' created", color="#00FF7F", bold=True)
-        except asyncpg.DuplicateObjectError:
-            rich_print(f"⚠️ User '{username}' already exists", color="#FFFF00", bold=True)
-        
-        await conn.execute(f"ALTER USER {username} WITH LOGIN CREATEDB REPLICATION BYPASSRLS")
-        rich_print(f"✅ User '{username}' updated with privileges", color="#00FF7F", bold=True)
-        
-        await conn.close()
-        rich_print("🔒 Logged out from postgres superuser", color="#00CED1")
+            await dump_database_copy(params, output_dir, jobs=jobs or 0, compress=None if compress == 'none' else (compress or 'gzip'),
+                                     level=getattr(args, 'compress_level', None), chunk_mb=args.chunk_size)
+        except Exception as e:
+            rich_print(f"❌ Dump error: {e}", color="#FF4500", bold=True)
+        return
 
-    # Create user
-    try:
-        await start()
-    except asyncpg.InvalidPasswordError:
-        rich_print("❌ Invalid PostgreSQL password", color="#FF4500", bold=True)
-        pwinput(f"[{os.getpid()}]Password for {args.user}: ")
+    sizes = []
+    if fmt == 'directory' and (jobs == 0 or args.run):
+        try:
+            conn = await asyncpg.connect(**params, timeout=10)
+            try:
+                sizes = await table_size_distribution(conn)
+            finally:
+                await conn.close()
+        except Exception as e:
+            rich_print(f"⚠️ Could not read table sizes: {e}", color="#FFFF00")
+    if fmt == 'directory' and jobs == 0:
+        jobs = auto_backup_jobs(sizes)
+        largest = sizes[0] / (1024**2) if sizes else 0
+        rich_print(f"⚙️ {len(sizes)} tables, {sum(sizes) / (1024**3):.2f} GB, largest {largest:.1f} MB → --jobs {jobs}", color="#00CED1")
+
+    version = await pg_dump_major_version() if compress else None
+    if compress == 'zstd' and version is not None and version < 16:
+        rich_print(f"❌ zstd compression needs pg_dump 16+, found {version}", color="#FF4500", bold=True)
         return
-    
-    except Exception as e:
-        if str(os.getenv('TRACEBACK', '0')).lower() in ['1', 'yes', 'true']:
-            print_exception()
-        else:
-            rich_print(f"❌ Error (superuser connection): {e}", color="#FF4500", bold=True)
-            while 1:
-                args.password = pwinput(f"[{os.getpid()}]Password for {args.user} [q/x/quit/exit for exit]: ")
-                if args.password:
-                    if args.password in ['x', 'q', 'exit', 'quit']:
-                        rich_print(f"❌ exit/quit without password user '{args.user}' nedded !", color="#FF4500", bold=True)
-                        return
-                    else:
-                        break
+    cmd = pg_dump_command({**params, 'database': args.database}, fmt, backup_file, jobs=jobs, compress=compress,
+                          level=getattr(args, 'compress_level', None), version=version)
+
+    if not args.run:
+        rich_print(f"💡 Run this command manually (or add --run):", color="#FFFF00")
+        rich_print(f"   {' '.join(shlex.quote(part) for part in cmd)}", color="#00FF7F")
         return
-    
-    # Create database
-    try:
-        logger.warning(f"username = {username}")
-        logger.warning(f"password = {password}")
-        logger.warning(f"HOST = {HOST}")
-        logger.warning(f"PORT = {PORT}")
 
-        conn = await connect(database="template1", user=username, password=password, host=HOST, port=PORT)
-        if not conn:
-            rich_print(f"❌ Error (Failed connect to database server)", color="#FF4500", bold=True)
-            return
+    if await pg_dump_major_version() is None:
+        rich_print("❌ pg_dump not found on PATH", color="#FF4500", bold=True)
+        return
+
+    env = dict(os.environ)
+    if params.get('password'):
+        env['PGPASSWORD'] = str(params['password'])
+    returncode, written, elapsed = await run_pg_dump(cmd + ["--verbose"], env, backup_file, len(sizes))
+
+    if returncode == 0:
+        rich_print(f"✅ Backup written to {backup_file} ({written:.1f} MB in {elapsed:.1f}s, {written / max(elapsed, 1e-9):.1f} MB/s)", color="#00FF7F", bold=True)
+    else:
+        rich_print(f"❌ pg_dump exited with code {returncode}", color="#FF4500", bold=True)
+
+
+# ============================================================================
+# DUMP ENGINE (COPY-based, no pg_dump)
+# ============================================================================
+
+ARCHIVE_MANIFEST = "manifest.json"
+ARCHIVE_FORMAT_VERSION = 1
+
+
+def archive_codec(name: Optional[str], level: int = None):
+    """Return (extension, compress, decompress) for an archive compression method"""
+    import gzip
+
+    if name == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd compression needs the 'zstandard' package (pip install zstandard)")
+        return ('.zst',
+                lambda data: zstandard.ZstdCompressor(level=level or 3).compress(data),
+                lambda data: zstandard.ZstdDecompressor().decompress(data))
+    if name == 'gzip':
+        return ('.gz', lambda data: gzip.compress(data, compresslevel=level or 6), gzip.decompress)
+    return ('', lambda data: data, lambda data: data)
+
+
+def _write_chunk(path: str, data: bytes, compress) -> int:
+    payload = compress(data)
+    with open(path, 'wb') as f:
+        f.write(payload)
+    return len(payload)
+
+
+def _read_chunk(path: str, decompress) -> bytes:
+    with open(path, 'rb') as f:
+        return decompress(f.read())
+
+
+class ChunkWriter:
+    """Collect a COPY stream and write it as compressed chunk files of about `chunk_bytes` each.
+
+    Compression runs in the default executor (zlib and zstd release the GIL),
+    so several workers can compress at the same time.
+    """
+
+    def __init__(self, directory: str, prefix: str, codec, chunk_bytes: int):
+        self.directory = directory
+        self.prefix = prefix
+        self.extension, self.compress, _ = codec
+        self.chunk_bytes = chunk_bytes
+        self.buffer = bytearray()
+        self.chunks = []
+        self.raw_bytes = 0
+
+    async def write(self, data: bytes):
+        self.buffer += data
+        self.raw_bytes += len(data)
+        if len(self.buffer) >= self.chunk_bytes:
+            await self.flush()
+
+    async def flush(self):
+        if not self.buffer:
+            return
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        name = f"{self.prefix}.{len(self.chunks):05d}.bin{self.extension}"
+        size = await asyncio.get_running_loop().run_in_executor(
+            None, _write_chunk, os.path.join(self.directory, name), data, self.compress)
+        self.chunks.append({'file': name, 'bytes': size, 'raw_bytes': len(data)})
+
+
+def quote_literal(value: str) -> str:
+    """Quote an SQL string literal"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+async def collect_schema(conn) -> Dict[str, Any]:
+    """Read extensions, types, tables, sequences, constraints and indexes as DDL for an archive manifest.
+
+    pre_data holds schemas, extensions, enum/composite types, domains,
+    sequences and tables, then ATTACH PARTITION for partitions. post_data
+    items carry a `step`: 0 for primary/unique/exclusion constraints and plain
+    indexes, 1 for check and foreign key constraints, 2 for sequence values.
+    Items within a step are independent of each other. `skipped` counts the
+    objects the archive does not cover (views, functions, triggers, ...).
+    """
+    excluded = "('pg_catalog', 'information_schema')"
+    user_schema = f"""n.nspname NOT IN {excluded}
+          AND n.nspname NOT LIKE 'pg_toast%' AND n.nspname NOT LIKE 'pg_temp%'"""
+
+    def not_from_extension(catalog: str, oid: str) -> str:
+        return f"NOT EXISTS (SELECT 1 FROM pg_depend d WHERE d.classid = '{catalog}'::regclass AND d.objid = {oid} AND d.deptype = 'e')"
 
-        result = await conn.fetchval("SELECT 1 FROM pg_database WHERE datname = $1", database)
-        if result:
-            rich_print(f"⚠️ Database '{database}' already exists.", color="#FFFF00", bold=True)
-            rich_print(f"❓ Drop and recreate '{database}'? [y/N]: ", color="#FFFF00", bold=True, end="")
-            choice = input().strip().lower()
-            
-            if choice == "y":
-                try:
-                    await conn.execute(f"DROP DATABASE {database}")
-                    rich_print(f"🗑️ Database '{database}' dropped", color="#FF4500", bold=True)
-                    await conn.execute(f"CREATE DATABASE {database}")
-                    rich_print(f"✅ Database '{database}' recreated", color="#00FF7F", bold=True)
-                except Exception as e:
-                    rich_print(f"❌ Error: {e}", color="#FF4500", bold=True)
+    tables = await conn.fetch(f"""
+        SELECT c.oid, n.nspname AS schema, c.relname AS name, c.relkind::text, pg_total_relation_size(c.oid) AS size_bytes,
+               pg_get_partkeydef(c.oid) AS partition_key, pg_get_expr(c.relpartbound, c.oid) AS partition_bound,
+               pn.nspname AS parent_schema, pc.relname AS parent_name
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_inherits inh ON inh.inhrelid = c.oid AND c.relispartition
+        LEFT JOIN pg_class pc ON pc.oid = inh.inhparent
+        LEFT JOIN pg_namespace pn ON pn.oid = pc.relnamespace
+        WHERE c.relkind IN ('r', 'p') AND {user_schema}
+          AND {not_from_extension('pg_class', 'c.oid')}
+        ORDER BY pg_total_relation_size(c.oid) DESC;
+    """)
+    oids = [t['oid'] for t in tables]
+
+    extensions = await conn.fetch("""
+        SELECT e.extname, n.nspname AS schema
+        FROM pg_extension e
+        JOIN pg_namespace n ON n.oid = e.extnamespace
+        WHERE e.extname <> 'plpgsql'
+        ORDER BY e.oid;
+    """)
+
+    types = await conn.fetch(f"""
+        SELECT t.oid, n.nspname AS schema, t.typname AS name, t.typtype::text,
+               format_type(t.typbasetype, t.typtypmod) AS base_type, t.typnotnull, t.typdefault,
+               (SELECT array_agg(e.enumlabel ORDER BY e.enumsortorder) FROM pg_enum e WHERE e.enumtypid = t.oid) AS labels,
+               (SELECT array_agg(quote_ident(a.attname) || ' ' || format_type(a.atttypid, a.atttypmod) ORDER BY a.attnum)
+                FROM pg_attribute a WHERE a.attrelid = t.typrelid AND a.attnum > 0 AND NOT a.attisdropped) AS attributes,
+               (SELECT array_agg('CONSTRAINT ' || quote_ident(con.conname) || ' ' || pg_get_constraintdef(con.oid) ORDER BY con.conname)
+                FROM pg_constraint con WHERE con.contypid = t.oid AND con.contype = 'c') AS checks
+        FROM pg_type t
+        JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE (t.typtype IN ('e', 'd') OR (t.typtype = 'c' AND (SELECT relkind FROM pg_class WHERE oid = t.typrelid) = 'c'))
+          AND {user_schema}
+          AND {not_from_extension('pg_type', 't.oid')}
+        ORDER BY t.oid;
+    """)
+
+    columns = await conn.fetch("""
+        SELECT a.attrelid, a.attname, format_type(a.atttypid, a.atttypmod) AS type, a.attnotnull,
+               pg_get_expr(d.adbin, d.adrelid) AS default_expr, a.attidentity::text, a.attgenerated::text
+        FROM pg_attribute a
+        LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+        WHERE a.attrelid = ANY($1::oid[]) AND a.attnum > 0 AND NOT a.attisdropped
+        ORDER BY a.attrelid, a.attnum;
+    """, oids)
+
+    sequences = await conn.fetch(f"""
+        SELECT n.nspname AS schema, c.relname AS name, format_type(s.seqtypid, NULL) AS type,
+               s.seqstart, s.seqincrement, s.seqmin, s.seqmax, s.seqcycle, ps.last_value,
+               dep.deptype::text, tn.nspname AS owner_schema, tc.relname AS owner_table, ta.attname AS owner_column
+        FROM pg_sequence s
+        JOIN pg_class c ON c.oid = s.seqrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_sequences ps ON ps.schemaname = n.nspname AND ps.sequencename = c.relname
+        LEFT JOIN pg_depend dep ON dep.objid = s.seqrelid AND dep.classid = 'pg_class'::regclass AND dep.deptype IN ('a', 'i')
+        LEFT JOIN pg_class tc ON tc.oid = dep.refobjid
+        LEFT JOIN pg_namespace tn ON tn.oid = tc.relnamespace
+        LEFT JOIN pg_attribute ta ON ta.attrelid = dep.refobjid AND ta.attnum = dep.refobjsubid
+        WHERE n.nspname NOT IN {excluded}
+          AND {not_from_extension('pg_class', 'c.oid')};
+    """)
+
+    # constraints and indexes a partition inherits from its parent are created by the parent's
+    constraints = await conn.fetch("""
+        SELECT n.nspname AS schema, c.relname AS table, con.conname, con.contype::text, pg_get_constraintdef(con.oid) AS definition
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE con.conrelid = ANY($1::oid[]) AND con.contype IN ('p', 'u', 'x', 'c', 'f')
+          AND con.conislocal AND con.conparentid = 0
+        ORDER BY con.conrelid, con.conname;
+    """, oids)
+
+    indexes = await conn.fetch("""
+        SELECT n.nspname AS schema, c.relname AS table, pg_get_indexdef(i.indexrelid) AS definition
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE i.indrelid = ANY($1::oid[])
+          AND NOT EXISTS (SELECT 1 FROM pg_constraint con WHERE con.conindid = i.indexrelid)
+          AND NOT EXISTS (SELECT 1 FROM pg_inherits inh WHERE inh.inhrelid = i.indexrelid);
+    """, oids)
+
+    uncovered = await conn.fetch(f"""
+        SELECT 'view' AS kind, n.nspname || '.' || c.relname AS name
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('v', 'm') AND {user_schema} AND {not_from_extension('pg_class', 'c.oid')}
+        UNION ALL
+        SELECT 'function', n.nspname || '.' || p.proname
+        FROM pg_proc p JOIN pg_namespace n ON n.oid = p.pronamespace
+        WHERE {user_schema} AND {not_from_extension('pg_proc', 'p.oid')}
+        UNION ALL
+        SELECT 'trigger', n.nspname || '.' || c.relname || ': ' || t.tgname
+        FROM pg_trigger t JOIN pg_class c ON c.oid = t.tgrelid JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE NOT t.tgisinternal AND {user_schema} AND {not_from_extension('pg_class', 'c.oid')}
+        UNION ALL
+        SELECT 'type', n.nspname || '.' || t.typname
+        FROM pg_type t JOIN pg_namespace n ON n.oid = t.typnamespace
+        WHERE t.typtype IN ('r', 'b') AND t.typelem = 0 AND {user_schema} AND {not_from_extension('pg_type', 't.oid')}
+        UNION ALL
+        SELECT 'inheritance', n.nspname || '.' || c.relname
+        FROM pg_inherits inh JOIN pg_class c ON c.oid = inh.inhrelid JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind = 'r' AND NOT c.relispartition AND {user_schema}
+        ORDER BY 1, 2;
+    """)
+
+    def qualified(schema: str, name: str) -> str:
+        return f"{quote_ident(schema)}.{quote_ident(name)}"
+
+    columns_by_table = {}
+    for col in columns:
+        columns_by_table.setdefault(col['attrelid'], []).append(col)
+
+    schemas = {t['schema'] for t in tables} | {s['schema'] for s in sequences} | {t['schema'] for t in types} | {e['schema'] for e in extensions}
+    pre_data = [f"CREATE SCHEMA IF NOT EXISTS {quote_ident(s)}" for s in sorted(schemas) if s != 'public']
+    owned_by = []
+    post_data = []
+
+    for ext in extensions:
+        pre_data.append(f"CREATE EXTENSION IF NOT EXISTS {quote_ident(ext['extname'])} WITH SCHEMA {quote_ident(ext['schema'])}")
+
+    # enums first: composite types and domains may be built on them; the rest follow creation (oid) order
+    for kind in ('e', 'cd'):
+        for typ in types:
+            if typ['typtype'] not in kind:
+                continue
+            name = qualified(typ['schema'], typ['name'])
+            if typ['typtype'] == 'e':
+                pre_data.append(f"CREATE TYPE {name} AS ENUM (" + ", ".join(quote_literal(label) for label in typ['labels'] or []) + ")")
+            elif typ['typtype'] == 'c':
+                pre_data.append(f"CREATE TYPE {name} AS (" + ", ".join(typ['attributes'] or []) + ")")
             else:
-                rich_print(f"⏭️ Skipping database creation", color="#FFFF00", bold=True)
-        else:
-            try:
-                await conn.execute(f"CREATE DATABASE {database}")
-                rich_print(f"✅ Database '{database}' created", color="#00FF7F", bold=True)
-            except Exception as e:
-                if "already exists" not in str(e):
-                    raise
-                rich_print(f"⚠️ Database '{database}' already exists", color="#FFFF00", bold=True)
-        
-        await conn.close()
-        rich_print("🔒 Logged out from new user session", color="#00CED1")
-    
-    except Exception as e:
-        if str(os.getenv("TRACEBACK", "0")).lower() in ["1", "true", "yes"]:
-            if tprint:
-                tprint(e)
+                sql = f"CREATE DOMAIN {name} AS {typ['base_type']}"
+                if typ['typdefault'] is not None:
+                    sql += f" DEFAULT {typ['typdefault']}"
+                if typ['typnotnull']:
+                    sql += " NOT NULL"
+                pre_data.append(" ".join([sql, *(typ['checks'] or [])]))
+
+    for seq in sequences:
+        if seq['deptype'] == 'i':
+            continue
+        pre_data.append(
+            f"CREATE SEQUENCE IF NOT EXISTS {qualified(seq['schema'], seq['name'])} AS {seq['type']} "
+            f"INCREMENT BY {seq['seqincrement']} MINVALUE {seq['seqmin']} MAXVALUE {seq['seqmax']} "
+            f"START WITH {seq['seqstart']} {'CYCLE' if seq['seqcycle'] else 'NO CYCLE'}"
+        )
+        if seq['deptype'] == 'a':
+            owned_by.append(f"ALTER SEQUENCE {qualified(seq['schema'], seq['name'])} OWNED BY "
+                            f"{qualified(seq['owner_schema'], seq['owner_table'])}.{quote_ident(seq['owner_column'])}")
+
+    manifest_tables = []
+    attach = []
+    for table in tables:
+        definitions = []
+        copy_columns = []
+        for col in columns_by_table.get(table['oid'], []):
+            definition = f"{quote_ident(col['attname'])} {col['type']}"
+            if col['attgenerated'] == 's':
+                definition += f" GENERATED ALWAYS AS ({col['default_expr']}) STORED"
             else:
-                import traceback
-                print(traceback.format_exc())
+                copy_columns.append(col['attname'])
+                if col['attidentity']:
+                    definition += f" GENERATED {'ALWAYS' if col['attidentity'] == 'a' else 'BY DEFAULT'} AS IDENTITY"
+                elif col['default_expr']:
+                    definition += f" DEFAULT {col['default_expr']}"
+            if col['attnotnull']:
+                definition += " NOT NULL"
+            definitions.append(definition)
+        sql = f"CREATE TABLE {qualified(table['schema'], table['name'])} (\n    " + ",\n    ".join(definitions) + "\n)"
+        if table['relkind'] == 'p':
+            sql += f" PARTITION BY {table['partition_key']}"
+        pre_data.append(sql)
+        if table['parent_name']:
+            # partitions are created standalone and attached before data is loaded into them directly
+            attach.append(f"ALTER TABLE {qualified(table['parent_schema'], table['parent_name'])} "
+                          f"ATTACH PARTITION {qualified(table['schema'], table['name'])} {table['partition_bound']}")
+        if table['relkind'] == 'p':
+            continue  # a partitioned table holds no rows of its own
+        manifest_tables.append({'schema': table['schema'], 'name': table['name'], 'columns': copy_columns,
+                                'size_bytes': table['size_bytes']})
+
+    pre_data.extend(attach)
+    pre_data.extend(owned_by)
+
+    for con in constraints:
+        step = 0 if con['contype'] in ('p', 'u', 'x') else 1
+        post_data.append({'step': step, 'kind': 'constraint', 'table': f"{con['schema']}.{con['table']}",
+                          'sql': f"ALTER TABLE {qualified(con['schema'], con['table'])} ADD CONSTRAINT {quote_ident(con['conname'])} {con['definition']}"})
+    for idx in indexes:
+        # an index on a partitioned table is dumped as ON ONLY; without it the index cascades to the partitions
+        post_data.append({'step': 0, 'kind': 'index', 'table': f"{idx['schema']}.{idx['table']}",
+                          'sql': idx['definition'].replace(' ON ONLY ', ' ON ', 1)})
+    for seq in sequences:
+        if seq['last_value'] is None:
+            continue
+        if seq['deptype'] == 'i':
+            target = f"pg_get_serial_sequence('{qualified(seq['owner_schema'], seq['owner_table'])}', '{seq['owner_column']}')"
         else:
-            rich_print(f"❌ Error (new user connection): {e}", color="#FF4500", bold=True)
+            target = f"'{qualified(seq['schema'], seq['name'])}'"
+        post_data.append({'step': 2, 'kind': 'sequence', 'table': None,
+                          'sql': f"SELECT setval({target}, {seq['last_value']}, true)"})
 
+    skipped = {}
+    for row in uncovered:
+        skipped.setdefault(row['kind'], []).append(row['name'])
 
-async def drop_database(args):
-    """Drop a database with confirmation"""
+    return {'tables': manifest_tables, 'pre_data': pre_data, 'post_data': post_data, 'skipped': skipped}
+
+
+def warn_skipped_objects(skipped: Dict[str, List[str]]):
+    """Print the object kinds a psqlc archive leaves out, with a few names each"""
+    for kind, names in sorted((skipped or {}).items()):
+        shown = ", ".join(names[:5]) + (f" and {len(names) - 5} more" if len(names) > 5 else "")
+        rich_print(f"⚠️ Not in the archive: {len(names)} {kind}(s): {shown}", color="#FFFF00", bold=True)
+
+
+async def dump_database_copy(params: Dict[str, Any], output_dir: str, jobs: int = 0, compress: Optional[str] = 'gzip',
+                             level: int = None, chunk_mb: int = 32) -> Dict[str, Any]:
+    """Dump a database into a psqlc archive directory using COPY ... TO STDOUT (FORMAT binary).
+
+    A coordinator transaction exports its snapshot with pg_export_snapshot();
+    every worker imports it with SET TRANSACTION SNAPSHOT, so all tables are
+    read from the same consistent point in time. Tables are handed out largest
+    first to `jobs` pooled connections.
+    """
+    import time
     import asyncpg
-    
-    if not args.database:
-        db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
-        if db_config and db_config.get('database'):
-            args.database = db_config.get('database')
-            rich_print(f"📄 Using database: {args.database}", color="#00CED1")
-        else:
-            rich_print("❌ Database name required. Use -d/--database", color="#FF4500", bold=True)
-            return
-    
-    rich_print(f"⚠️ WARNING: You are about to DROP database '{args.database}'", color="#FFE713", bold=True)
-    rich_print(f"❓ Type the database name to confirm: ", color="#19CDFF", bold=True, end="")
-    confirmation = input().strip()
-    
-    if confirmation != args.database:
-        rich_print("❌ Database name mismatch. Aborted.", color="#FF0008", bold=True)
-        return
-    
+    from datetime import datetime
+    from rich.progress import Progress, TextColumn, BarColumn, MofNCompleteColumn, TimeElapsedColumn
+
+    codec = archive_codec(compress, level)
+    data_dir = os.path.join(output_dir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+
+    coordinator = await asyncpg.connect(**params, timeout=10)
+    snapshot_tx = coordinator.transaction(isolation='repeatable_read', readonly=True)
+    await snapshot_tx.start()
+    pool = None
     try:
-        logger.notice(f"database : postgres")
-        logger.notice(f"user     : {args.user}")
-        logger.notice(f"password : {args.passwd}")
-        logger.notice(f"host     : {args.hostname}")
-        logger.notice(f"port     : {args.port}")
+        snapshot = await coordinator.fetchval("SELECT pg_export_snapshot()")
+        server_version = await coordinator.fetchval("SHOW server_version")
+        schema = await collect_schema(coordinator)
+        warn_skipped_objects(schema['skipped'])
+        tables = schema['tables']
+        if not jobs:
+            jobs = auto_backup_jobs([t['size_bytes'] for t in tables])
+        jobs = max(1, min(jobs, len(tables) or 1))
+        rich_print(f"⚙️ {len(tables)} tables, snapshot {snapshot}, {jobs} job(s)", color="#00CED1")
 
-        conn = await asyncpg.connect(
-            database="postgres",
-            user=args.user,
-            host=args.hostname,
-            port=args.port,
-            password=args.passwd,
-        )
-        
-        await conn.execute("""
-            SELECT pg_terminate_backend(pid)
-            FROM pg_stat_activity
-            WHERE datname = $1 AND pid <> pg_backend_pid()
-        """, args.database)
-        
-        await conn.execute(f"DROP DATABASE IF EXISTS {args.database}")
-        rich_print(f"✅ Database '{args.database}' dropped successfully", color="#00FF7F", bold=True)
-        
-        await conn.close()
-    
-    except Exception as e:
-        rich_print(f"❌ Error dropping database [0]: {e}", color="#FF4500", bold=True)
+        pool = await asyncpg.create_pool(**params, min_size=jobs, max_size=jobs, timeout=10)
+        queue = asyncio.Queue()
+        for index, table in enumerate(tables):
+            queue.put_nowait((index, table))
 
-        if str(os.getenv('TRACEBACK', '0')).lower() in ['1', 'yes', 'true']:
-            print_exception()
+        started = time.monotonic()
+        streamed = [0]
 
+        with Progress(
+            TextColumn("[bold cyan]{task.description}"), BarColumn(), MofNCompleteColumn(),
+            TextColumn("[green]{task.fields[mb]:.1f} MB · {task.fields[rate]:.1f} MB/s"), TimeElapsedColumn(),
+        ) as progress:
+            task = progress.add_task("COPY dump", total=len(tables), mb=0.0, rate=0.0)
 
-async def drop_user(args):
-    """Drop a user/role with confirmation"""
+            async def worker():
+                async with pool.acquire() as conn:
+                    async with conn.transaction(isolation='repeatable_read', readonly=True):
+                        await conn.execute(f"SET TRANSACTION SNAPSHOT '{snapshot}'")
+                        while True:
+                            try:
+                                index, table = queue.get_nowait()
+                            except asyncio.QueueEmpty:
+                                return
+                            writer = ChunkWriter(data_dir, f"{index:05d}", codec, chunk_mb * 1024**2)
+
+                            async def sink(data, writer=writer):
+                                await writer.write(data)
+                                streamed[0] += len(data)
+                                mb = streamed[0] / (1024**2)
+                                progress.update(task, mb=mb, rate=mb / max(time.monotonic() - started, 1e-9))
+
+                            await conn.copy_from_table(table['name'], schema_name=table['schema'], columns=table['columns'],
+                                                       output=sink, format='binary')
+                            await writer.flush()
+                            table['chunks'] = writer.chunks
+                            table['raw_bytes'] = writer.raw_bytes
+                            table['bytes'] = sum(c['bytes'] for c in writer.chunks)
+                            progress.advance(task)
+
+            await asyncio.gather(*(worker() for _ in range(jobs)))
+    finally:
+        if pool is not None:
+            await pool.close()
+        await snapshot_tx.rollback()
+        await coordinator.close()
+
+    manifest = {
+        'format': 'psqlc',
+        'version': ARCHIVE_FORMAT_VERSION,
+        'database': params.get('database'),
+        'server_version': server_version,
+        'created': datetime.now().isoformat(),
+        'snapshot': snapshot,
+        'compression': compress,
+        **schema,
+    }
+    write_archive_manifest(output_dir, manifest)
+
+    elapsed = time.monotonic() - started
+    raw = sum(t.get('raw_bytes', 0) for t in tables) / (1024**2)
+    stored = sum(t.get('bytes', 0) for t in tables) / (1024**2)
+    rich_print(f"✅ Archive written to {output_dir}: {raw:.1f} MB streamed, {stored:.1f} MB stored in {elapsed:.1f}s "
+               f"({raw / max(elapsed, 1e-9):.1f} MB/s)", color="#00FF7F", bold=True)
+    return manifest
+
+
+def write_archive_manifest(archive: str, manifest: Dict[str, Any]):
+    """Write manifest.json atomically, so a half-written archive is never taken for a complete one"""
+    import json
+    tmp_manifest = os.path.join(archive, ARCHIVE_MANIFEST + ".tmp")
+    with open(tmp_manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, default=str)
+    os.replace(tmp_manifest, os.path.join(archive, ARCHIVE_MANIFEST))
+
+
+def read_archive_manifest(archive: str) -> Optional[Dict[str, Any]]:
+    """Load the manifest of a psqlc archive directory, None when `archive` is not one"""
+    import json
+    path = os.path.join(archive, ARCHIVE_MANIFEST)
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return manifest if manifest.get('format') == 'psqlc' else None
+
+
+async def copy_archive_table(conn, archive: str, manifest: Dict[str, Any], table: Dict[str, Any], on_bytes=None):
+    """Stream one table's chunks from an archive into the database with binary COPY"""
+    _, _, decompress = archive_codec(manifest.get('compression'))
+    loop = asyncio.get_running_loop()
+
+    async def source():
+        for chunk in table.get('chunks', []):
+            data = await loop.run_in_executor(None, _read_chunk, os.path.join(archive, "data", chunk['file']), decompress)
+            yield data
+            if on_bytes:
+                on_bytes(chunk['bytes'])
+
+    await conn.copy_to_table(table['name'], schema_name=table['schema'], columns=table['columns'],
+                             source=source(), format='binary')
+
+
+async def run_post_data(pool, items: List[Dict[str, Any]], workers: int = 4, on_done=None):
+    """Run post-data DDL (constraints, indexes, sequence values) step by step.
+
+    Items of the same step run concurrently on up to `workers` connections;
+    items touching the same table stay in order on one connection, since
+    ALTER TABLE takes an exclusive lock anyway. Deadlocks between foreign
+    keys are retried.
+    """
     import asyncpg
-    
-    if not args.username:
-        rich_print("❌ Username required. Use -u/--username", color="#FF4500", bold=True)
-        return
-    
-    rich_print(f"⚠️  WARNING: You are about to DROP user '{args.username}'", color="#FF4500", bold=True)
-    rich_print(f"❓ Type the username to confirm: ", color="#FFFF00", bold=True, end="")
-    confirmation = input().strip()
-    
-    if confirmation != args.username:
-        rich_print("❌ Username mismatch. Aborted.", color="#FF4500", bold=True)
-        return
-    
-    try:
-        conn = await asyncpg.connect(
-            database="postgres",
-            user=args.user,
-            host=args.hostname,
-            port=args.port,
-            password=args.passwd,
-        )
-        
-        await conn.execute(f"DROP USER IF EXISTS {args.username}")
-        rich_print(f"✅ User '{args.username}' dropped successfully", color="#00FF7F", bold=True)
-        
-        await conn.close()
-    
-    except Exception as e:
-        rich_print(f"❌ Error dropping user [1]: {e}", color="#FF4500", bold=True)
+
+    for step in sorted({item['step'] for item in items}):
+        groups = {}
+        for n, item in enumerate(i for i in items if i['step'] == step):
+            groups.setdefault(item.get('table') or n, []).append(item)
+        semaphore = asyncio.Semaphore(max(1, workers))
+
+        async def run_group(group):
+            async with semaphore:
+                async with pool.acquire() as conn:
+                    for item in group:
+                        for attempt in range(3):
+                            try:
+                                await conn.execute(item['sql'])
+                                break
+                            except asyncpg.DeadlockDetectedError:
+                                if attempt == 2:
+                                    raise
+                        if on_done:
+                            on_done(item)
+
+        await asyncio.gather(*(run_group(g) for g in groups.values()))
+
+
+async def restore_archive_copy(pool, archive: str, manifest: Dict[str, Any], jobs: int = 4, index_jobs: int = 4,
+                               on_bytes=None, on_post_data=None):
+    """Restore a psqlc archive: schema, then table data on `jobs` connections, then post-data on `index_jobs`"""
+    async with pool.acquire() as conn:
+        for sql in manifest['pre_data']:
+            await conn.execute(sql)
+
+    queue = asyncio.Queue()
+    for table in sorted(manifest['tables'], key=lambda t: t.get('bytes', 0), reverse=True):
+        queue.put_nowait(table)
+
+    async def worker():
+        async with pool.acquire() as conn:
+            while True:
+                try:
+                    table = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                await copy_archive_table(conn, archive, manifest, table, on_bytes=on_bytes)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, jobs))))
+    await run_post_data(pool, manifest['post_data'], workers=index_jobs, on_done=on_post_data)
 
 
 # ============================================================================
-# BACKUP COMMAND
+# RESTORE COMMAND
 # ============================================================================
 
-def backup_database(args):
-    """Generate backup command for database"""
-    from datetime import datetime
-    
+def detect_archive_kind(path: str) -> Optional[str]:
+    """Return 'psqlc', 'directory', 'custom', 'tar' or 'plain' for a backup path"""
+    import tarfile
+
+    if os.path.isdir(path):
+        if read_archive_manifest(path):
+            return 'psqlc'
+        if os.path.isfile(os.path.join(path, "toc.dat")):
+            return 'directory'
+        return None
+    if not os.path.isfile(path):
+        return None
+    with open(path, 'rb') as f:
+        if f.read(5) == b'PGDMP':
+            return 'custom'
+    if tarfile.is_tarfile(path):
+        return 'tar'
+    return 'plain'
+
+
+def parse_pg_restore_list(listing: str) -> Dict[str, str]:
+    """Map "schema.table" to its TABLE DATA dump id in `pg_restore -l` output.
+
+    The listing separates schema, table and owner with spaces, so table names
+    may contain spaces but the schema name is taken to be the first word.
+    """
+    import re
+
+    entries = {}
+    for line in listing.splitlines():
+        match = re.match(r"^(\d+);\s+\d+\s+\d+\s+TABLE DATA\s+(.+)\s+\S+$", line)
+        if match:
+            entries[match.group(2).replace(' ', '.', 1)] = match.group(1)
+    return entries
+
+
+async def pg_archive_table_sizes(path: str, kind: str) -> Dict[str, int]:
+    """Map "schema.table" to the byte size of its data in a pg_dump archive.
+
+    Sizes come from the data files of a directory archive. Other formats do
+    not expose them, so every table counts as 1.
+    """
+    proc = await asyncio.create_subprocess_exec("pg_restore", "-l", path, stdout=asyncio.subprocess.PIPE)
+    out, _ = await proc.communicate()
+    files = {}
+    if kind == 'directory':
+        files = {entry.name.split('.')[0]: entry.stat().st_size for entry in os.scandir(path)}
+    return {name: files.get(dump_id, 1) for name, dump_id in parse_pg_restore_list(out.decode(errors="ignore")).items()}
+
+
+async def restore_pg_archive(params: Dict[str, Any], path: str, kind: str, jobs: int, index_jobs: int, progress, task):
+    """Restore a pg_dump archive with pg_restore, section by section.
+
+    pre-data runs once, data runs with `jobs` workers, and post-data (indexes,
+    constraints) runs with `index_jobs` workers after all data is loaded.
+    Plain SQL files go through `psql -f` serially.
+    """
+    import re
+    import shutil
+
+    env = dict(os.environ)
+    if params.get('password'):
+        env['PGPASSWORD'] = str(params['password'])
+    connection = ["-h", str(params['host']), "-p", str(params['port']), "-U", str(params['user']), "-d", params['database']]
+
+    if kind == 'plain':
+        if not shutil.which("psql"):
+            raise RuntimeError("psql not found on PATH (needed for plain SQL backups)")
+        proc = await asyncio.create_subprocess_exec("psql", *connection, "-v", "ON_ERROR_STOP=1", "-q", "-f", path, env=env)
+        if await proc.wait() != 0:
+            raise RuntimeError(f"psql exited with code {proc.returncode}")
+        progress.update(task, completed=progress.tasks[task].total)
+        return
+
+    if not shutil.which("pg_restore"):
+        raise RuntimeError("pg_restore not found on PATH")
+
+    sizes = await pg_archive_table_sizes(path, kind)
+    progress.update(task, total=sum(sizes.values()) or None)
+    parallel = kind in ('directory', 'custom')
+
+    for section, workers in (("pre-data", 1), ("data", jobs), ("post-data", index_jobs)):
+        cmd = ["pg_restore", *connection, f"--section={section}", "--verbose"]
+        if parallel and workers > 1:
+            cmd += ["-j", str(workers)]
+        proc = await asyncio.create_subprocess_exec(*cmd, path, env=env, stderr=asyncio.subprocess.PIPE)
+        async for raw in proc.stderr:
+            line = raw.decode(errors="ignore").rstrip()
+            match = re.search(r'processing data for table "(.+?)"', line)
+            if match:
+                progress.advance(task, sizes.get(match.group(1), 0))
+            elif "error" in line.lower():
+                rich_print(f"   {line}", color="#FF4500")
+            logger.debug(line)
+        if await proc.wait() != 0:
+            raise RuntimeError(f"pg_restore --section={section} exited with code {proc.returncode}")
+
+
+async def restore_database(args):
+    """Restore a psqlc or pg_dump archive into an existing database"""
+    import time
+    from rich.progress import Progress, TextColumn, BarColumn, DownloadColumn, TransferSpeedColumn, TimeRemainingColumn
+
     if not args.database:
         db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
         if db_config and db_config.get('database'):
@@ -1380,16 +6437,66 @@ def backup_database(args):
         else:
             rich_print("❌ Database name required. Use -d/--database", color="#FF4500", bold=True)
             return
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_file = f"{args.database}_backup_{timestamp}.sql"
-    
-    rich_print(f"🗄️ Creating backup of '{args.database}'...", color="#00CED1", bold=True)
-    
-    cmd = f"pg_dump -h {args.hostname} -p {args.port} -U {args.user} -d {args.database} -F p -f {backup_file}"
-    
-    rich_print(f"💡 Run this command manually:", color="#FFFF00")
-    rich_print(f"   {cmd}", color="#00FF7F")
+
+    kind = detect_archive_kind(args.ARCHIVE)
+    if kind is None:
+        rich_print(f"❌ '{args.ARCHIVE}' is not a psqlc or pg_dump backup", color="#FF4500", bold=True)
+        return
+
+    jobs = max(1, args.jobs)
+    index_jobs = max(1, args.index_jobs or jobs)
+    config = get_db_config_or_args(args)
+    started = time.monotonic()
+
+    columns = (TextColumn("[bold cyan]{task.description}"), BarColumn(), DownloadColumn(), TransferSpeedColumn(), TimeRemainingColumn())
+
+    if kind != 'psqlc':
+        params = resolve_connection_params(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level)
+        if params is None:
+            return
+        rich_print(f"♻️ Restoring {kind} pg_dump backup '{args.ARCHIVE}' into '{args.database}'...", color="#00CED1", bold=True)
+        try:
+            with Progress(*columns) as progress:
+                task = progress.add_task("pg_restore", total=1)
+                await restore_pg_archive(params, args.ARCHIVE, kind, jobs, index_jobs, progress, task)
+            rich_print(f"✅ Restore finished in {time.monotonic() - started:.1f}s", color="#00FF7F", bold=True)
+        except Exception as e:
+            rich_print(f"❌ Restore error: {e}", color="#FF4500", bold=True)
+        return
+
+    manifest = read_archive_manifest(args.ARCHIVE)
+    pool = await get_pool(**config, database=args.database, auto_settings=False, max_depth_up=args.up_level, max_depth_down=args.down_level,
+                          min_size=1, max_size=max(jobs, index_jobs))
+    if pool is None:
+        return
+
+    total_bytes = sum(c['bytes'] for t in manifest['tables'] for c in t.get('chunks', []))
+    rich_print(f"♻️ Restoring {len(manifest['tables'])} tables ({total_bytes / (1024**2):.1f} MB) from '{args.ARCHIVE}' into '{args.database}'...", color="#00CED1", bold=True)
+    warn_skipped_objects(manifest.get('skipped'))
+    try:
+        with Progress(TextColumn("[bold cyan]{task.description}"), BarColumn(), TextColumn("[green]{task.fields[detail]}"),
+                      TimeRemainingColumn()) as progress:
+            data_task = progress.add_task("table data", total=total_bytes, detail="")
+            post_task = progress.add_task("indexes & constraints", total=len(manifest['post_data']), detail="", start=False)
+
+            def on_bytes(n: int):
+                progress.advance(data_task, n)
+                done = progress.tasks[data_task].completed
+                elapsed = max(time.monotonic() - started, 1e-9)
+                progress.update(data_task, detail=f"{done / (1024**2):.1f}/{total_bytes / (1024**2):.1f} MB · {done / (1024**2) / elapsed:.1f} MB/s")
+
+            def on_post_data(item):
+                progress.start_task(post_task)
+                progress.advance(post_task)
+                progress.update(post_task, detail=f"{int(progress.tasks[post_task].completed)}/{len(manifest['post_data'])}")
+
+            await restore_archive_copy(pool, args.ARCHIVE, manifest, jobs=jobs, index_jobs=index_jobs,
+                                       on_bytes=on_bytes, on_post_data=on_post_data)
+        rich_print(f"✅ Restore finished in {time.monotonic() - started:.1f}s", color="#00FF7F", bold=True)
+    except Exception as e:
+        rich_print(f"❌ Restore error: {e}", color="#FF4500", bold=True)
+    finally:
+        await pool.close()
 
 
 # ============================================================================
@@ -1415,39 +6522,86 @@ def setup_argument_parser():
     parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"PostgreSQL server port (default: {DEFAULT_PORT})")
     parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
     parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
+    parser.add_argument("--hosts", help="Run on these hosts concurrently: h1,h2:5433 (show dbs/connections/size, query --readonly)")
+    parser.add_argument("--inventory", help="Host inventory file (YAML/TOML/JSON), see docs")
+    parser.add_argument("--host-timeout", type=float, default=10, help="Per-host timeout in seconds for --hosts/--inventory (default: 10)")
+    parser.add_argument("--host-concurrency", type=int, default=32, help="Hosts contacted at once for --hosts/--inventory (default: 32)")
+    parser.add_argument("--timings", action="store_true", help="Print time spent in discovery, connect, query and render at exit ($PSQLC_TIMINGS=1)")
+    parser.add_argument("--timings-json", action="store_true", help="Like --timings, as one JSON line on stderr ($PSQLC_TIMINGS=json)")
+    parser.add_argument("--plain", dest="plain", action="store_const", const="aligned", help="Print results as plain aligned text, streamed as rows arrive")
+    parser.add_argument("--tsv", dest="plain", action="store_const", const="tsv", help="Print results as tab-separated text, streamed as rows arrive")
+    parser.add_argument("--no-pager", action="store_true", help="Never pipe output taller than the terminal through $PAGER")
+    parser.add_argument("--exec-settings", action="store_true", help="Import settings.py when static parsing cannot resolve DATABASES ($PSQLC_EXEC_SETTINGS=1)")
+    parser.add_argument("--config-sources", action="store_true", help="Show which config key and file each connection setting came from")
     parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     parser.add_argument('-v', "--version", action="store_true", help="Show version")
     
+    # the output switches are also accepted after the subcommand (psqlc show tables --plain);
+    # SUPPRESS keeps a subcommand from resetting a value given before it
+    output_parser = argparse.ArgumentParser(add_help=False)
+    output_parser.add_argument("--plain", dest="plain", action="store_const", const="aligned", default=argparse.SUPPRESS, help="Print results as plain aligned text, streamed as rows arrive")
+    output_parser.add_argument("--tsv", dest="plain", action="store_const", const="tsv", default=argparse.SUPPRESS, help="Print results as tab-separated text, streamed as rows arrive")
+    output_parser.add_argument("--no-pager", action="store_true", default=argparse.SUPPRESS, help="Never pipe output taller than the terminal through $PAGER")
+
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # SHOW command
     show_parser = subparsers.add_parser('show', help='Show database information', formatter_class=CustomRichHelpFormatter)
     show_subparsers = show_parser.add_subparsers(dest='show_command', help='Show options')
     
-    show_subparsers.add_parser('dbs', help='List all databases', formatter_class=CustomRichHelpFormatter)
+    show_subparsers.add_parser('dbs', parents=[output_parser], help='List all databases', formatter_class=CustomRichHelpFormatter)
     
-    show_tables_parser = show_subparsers.add_parser('tables', help='List tables in database', formatter_class=CustomRichHelpFormatter)
+    show_tables_parser = show_subparsers.add_parser('tables', parents=[output_parser], help='List tables in database', formatter_class=CustomRichHelpFormatter)
     show_tables_parser.add_argument("-d", "--database", help="Database name (auto-detect if not provided)")
+    show_tables_parser.add_argument("-s", "--schema", help="Only tables in this schema")
+    show_tables_parser.add_argument("-p", "--pattern", help="Table name pattern, glob (user_*) or LIKE (user%%)")
+    show_tables_parser.add_argument("--sort", choices=["name", "size"], default="name", help="Sort by schema/table name or by total size (default: name)")
+    show_tables_parser.add_argument("--limit", type=int, default=1000, help="Tables per page (default: 1000)")
+    show_tables_parser.add_argument("--after", help="Continue after this page token (printed at the end of a page)")
+    show_tables_parser.add_argument("--all-databases", action="store_true", help="Run against every database that accepts connections")
+    show_tables_parser.add_argument("--databases", help="Comma separated databases to run against (a,b,c)")
+    show_tables_parser.add_argument("--concurrency", type=int, default=8, help="Databases queried at once with --all-databases/--databases (default: 8)")
+    show_tables_parser.add_argument("--db-timeout", type=float, default=30, help="Per-database timeout in seconds (default: 30)")
     show_tables_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     show_tables_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
     show_tables_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
     
-    show_subparsers.add_parser('users', help='List all users/roles', formatter_class=CustomRichHelpFormatter)
-    show_subparsers.add_parser('connections', help='Show active connections', formatter_class=CustomRichHelpFormatter)
+    show_subparsers.add_parser('users', parents=[output_parser], help='List all users/roles', formatter_class=CustomRichHelpFormatter)
+    show_subparsers.add_parser('connections', parents=[output_parser], help='Show active connections', formatter_class=CustomRichHelpFormatter)
     
-    show_indexes_parser = show_subparsers.add_parser('indexes', help='Show indexes', formatter_class=CustomRichHelpFormatter)
+    show_indexes_parser = show_subparsers.add_parser('indexes', parents=[output_parser], help='Show indexes', formatter_class=CustomRichHelpFormatter)
     show_indexes_parser.add_argument("-d", "--database", help="Database name (auto-detect if not provided)")
     show_indexes_parser.add_argument("-t", "--table", help="Table name (optional)")
+    show_indexes_parser.add_argument("--all-databases", action="store_true", help="Run against every database that accepts connections")
+    show_indexes_parser.add_argument("--databases", help="Comma separated databases to run against (a,b,c)")
+    show_indexes_parser.add_argument("--concurrency", type=int, default=8, help="Databases queried at once with --all-databases/--databases (default: 8)")
+    show_indexes_parser.add_argument("--db-timeout", type=float, default=30, help="Per-database timeout in seconds (default: 30)")
     show_indexes_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     show_indexes_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
     show_indexes_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
     
-    show_size_parser = show_subparsers.add_parser('size', help='Show sizes', formatter_class=CustomRichHelpFormatter)
+    show_size_parser = show_subparsers.add_parser('size', parents=[output_parser], help='Show sizes', formatter_class=CustomRichHelpFormatter)
     show_size_parser.add_argument("-d", "--database", help="Database name (auto-detect if not provided)")
     show_size_parser.add_argument("-t", "--table", help="Table name (optional)")
+    show_size_parser.add_argument("--all-databases", action="store_true", help="Run against every database that accepts connections")
+    show_size_parser.add_argument("--databases", help="Comma separated databases to run against (a,b,c)")
+    show_size_parser.add_argument("--concurrency", type=int, default=8, help="Databases queried at once with --all-databases/--databases (default: 8)")
+    show_size_parser.add_argument("--db-timeout", type=float, default=30, help="Per-database timeout in seconds (default: 30)")
     show_size_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     show_size_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
     show_size_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
+
+    show_slow_parser = show_subparsers.add_parser('slow', parents=[output_parser], help='Top statements from pg_stat_statements over a time window', formatter_class=CustomRichHelpFormatter)
+    show_slow_parser.add_argument("-d", "--database", help="Database where pg_stat_statements is installed (default: postgres)")
+    show_slow_parser.add_argument("-n", "--interval", type=float, default=10, help="Seconds between the two snapshots (default: 10)")
+    show_slow_parser.add_argument("--sort", choices=list(SLOW_SORT_KEYS), default="time",
+                                  help="Rank by total time, mean time, calls, rows, blocks read (io) or hit (default: time)")
+    show_slow_parser.add_argument("--limit", type=int, default=20, help="Statements shown (default: 20)")
+    show_slow_parser.add_argument("--save", metavar="FILE", help="Save the latest snapshot to FILE")
+    show_slow_parser.add_argument("--since", metavar="FILE", help="Diff against a snapshot saved with --save instead of waiting --interval")
+    show_slow_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    show_slow_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
+    show_slow_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
     
     # CREATE command
     create_parser = subparsers.add_parser('create', help='Create user and database', formatter_class=CustomRichHelpFormatter)
@@ -1460,30 +6614,139 @@ def setup_argument_parser():
     create_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
     
     # DESCRIBE command
-    desc_parser = subparsers.add_parser('describe', help='Show table structure', formatter_class=CustomRichHelpFormatter)
+    desc_parser = subparsers.add_parser('describe', parents=[output_parser], help='Show table structure', formatter_class=CustomRichHelpFormatter)
     desc_parser.add_argument("-d", "--database", help="Database name (auto-detect if not provided)")
     desc_parser.add_argument("-t", "--table", required=True, help="Table name")
+    desc_parser.add_argument("--all-databases", action="store_true", help="Run against every database that accepts connections")
+    desc_parser.add_argument("--databases", help="Comma separated databases to run against (a,b,c)")
+    desc_parser.add_argument("--concurrency", type=int, default=8, help="Databases queried at once with --all-databases/--databases (default: 8)")
+    desc_parser.add_argument("--db-timeout", type=float, default=30, help="Per-database timeout in seconds (default: 30)")
     desc_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     desc_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
     desc_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
     
     # QUERY command
-    query_parser = subparsers.add_parser('query', help='Execute SQL query', formatter_class=CustomRichHelpFormatter)
+    query_parser = subparsers.add_parser('query', parents=[output_parser], help='Execute SQL query', formatter_class=CustomRichHelpFormatter)
     query_parser.add_argument("-d", "--database", help="Database name (auto-detect if not provided)")
-    query_parser.add_argument("-q", "--query", required=True, help="SQL query to execute")
+    query_parser.add_argument("-q", "--query", action="append", help="SQL query to execute (repeat to run several concurrently)")
+    query_parser.add_argument("--queries-file", help="File of ';'-separated queries to run concurrently ('-' for stdin)")
+    query_parser.add_argument("--concurrency", type=int, default=4, help="Pooled connections running queries at once (default: 4)")
     query_parser.add_argument("--readonly", action="store_true", help="Prevent destructive operations")
-    query_parser.add_argument("--limit", type=int, help="Limit rows displayed (default: 100)")
+    query_parser.add_argument("--limit", type=int, help="Limit rows fetched and displayed (default: 100)")
+    query_parser.add_argument("--no-limit", action="store_true", help="Stream all rows as tab-separated output (aligned with --plain)")
+    query_parser.add_argument("--prefetch", type=int, help="Rows fetched per cursor round trip (default: limit+1, max 1000)")
+    query_parser.add_argument("--format", choices=["csv", "tsv", "jsonl", "binary"], help="Export results instead of rendering a table (csv/tsv/binary use COPY)")
+    query_parser.add_argument("-o", "--output", default="-", help="Export destination file, '-' for stdout (default: -)")
     query_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     query_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
     query_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
+
+    # RUN command
+    run_parser = subparsers.add_parser('run', help='Run a SQL script file', formatter_class=CustomRichHelpFormatter)
+    run_parser.add_argument("FILE", help="SQL script ('-' for stdin)")
+    run_parser.add_argument("-d", "--database", help="Database name (auto-detect if not provided)")
+    run_parser.add_argument("--batch", type=int, default=1, help="Statements sent per round trip, each batch runs as one transaction (default: 1)")
+    run_parser.add_argument("--single-transaction", action="store_true", help="Run the whole script in one transaction, rolled back on error")
+    run_parser.add_argument("--on-error", choices=["stop", "continue"], default="stop", help="Stop at the first failed statement or report it and go on (default: stop)")
+    run_parser.add_argument("--encoding", default="utf-8", help="Script encoding (default: utf-8)")
+    run_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    run_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
+    run_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
     
     # BACKUP command
     backup_parser = subparsers.add_parser('backup', help='Backup database', formatter_class=CustomRichHelpFormatter)
     backup_parser.add_argument("-d", "--database", help="Database name (auto-detect if not provided)")
+    backup_parser.add_argument("-F", "--format", choices=list(BACKUP_FORMATS), default="plain", help="pg_dump output format (default: plain)")
+    backup_parser.add_argument("-j", "--jobs", type=int, help="Parallel dump jobs for --format directory (0 = size from table sizes)")
+    backup_parser.add_argument("--engine", choices=["pg_dump", "psqlc"], default="pg_dump", help="pg_dump, or psqlc's built-in COPY dump engine (default: pg_dump)")
+    backup_parser.add_argument("--compress", choices=["zstd", "gzip", "none"], help="Compression method (zstd needs pg_dump 16+, or the zstandard package with --engine psqlc)")
+    backup_parser.add_argument("--chunk-size", type=int, default=32, help="Archive chunk size in MB for --engine psqlc (default: 32)")
+    backup_parser.add_argument("--compress-level", type=int, help="Compression level")
+    backup_parser.add_argument("-o", "--output", help="Output file or directory (default: <db>_backup_<timestamp>)")
+    backup_parser.add_argument("--run", action="store_true", help="Run pg_dump with live progress instead of printing the command")
     backup_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
     backup_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
     backup_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
 
+    # LOAD command
+    load_parser = subparsers.add_parser('load', help='Bulk load a CSV/TSV/JSON/JSONL file into a table', formatter_class=CustomRichHelpFormatter)
+    load_parser.add_argument("FILE", help="Input file ('-' for stdin)")
+    load_parser.add_argument("-d", "--database", help="Database name (auto-detect if not provided)")
+    load_parser.add_argument("-t", "--table", required=True, help="Target table (schema.table allowed)")
+    load_parser.add_argument("--schema", help="Target schema (default: public)")
+    load_parser.add_argument("--format", choices=["csv", "tsv", "json", "jsonl"], help="Input format (default: from file extension)")
+    load_parser.add_argument("--columns", help="Comma-separated source column names (CSV without header, or JSON keys to load)")
+    load_parser.add_argument("--map", help="Column mapping 'src:dst,src2:dst2' (empty dst skips the column)")
+    load_parser.add_argument("--no-header", dest="header", action="store_false", help="CSV/TSV input has no header row")
+    load_parser.add_argument("--encoding", default="utf-8", help="Input encoding (default: utf-8)")
+    load_parser.add_argument("--batch-size", type=int, default=10000, help="Rows per COPY batch (default: 10000)")
+    load_parser.add_argument("--parallel", type=int, default=1, help="Number of pooled connections loading batches (default: 1). Above 1, batches commit separately and a failed load is not rolled back")
+    load_parser.add_argument("--drop-indexes", action="store_true", help="Drop non-constraint indexes before loading and rebuild them after")
+    load_parser.add_argument("--analyze", action="store_true", help="Run ANALYZE on the table after loading")
+    load_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    load_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
+    load_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
+
+    # RESTORE command
+    restore_parser = subparsers.add_parser('restore', help='Restore a psqlc or pg_dump backup', formatter_class=CustomRichHelpFormatter)
+    restore_parser.add_argument("ARCHIVE", help="psqlc archive directory, pg_dump directory/custom/tar archive or plain .sql file")
+    restore_parser.add_argument("-d", "--database", help="Target database, must exist (auto-detect if not provided)")
+    restore_parser.add_argument("-j", "--jobs", type=int, default=4, help="Tables loaded concurrently (default: 4)")
+    restore_parser.add_argument("--index-jobs", type=int, help="Indexes/constraints built concurrently after the data (default: --jobs)")
+    restore_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    restore_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
+    restore_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
+
+    # TOP command
+    top_parser = subparsers.add_parser('top', help='Live view of sessions, waits, blocking locks and TPS', formatter_class=CustomRichHelpFormatter)
+    top_parser.add_argument("-d", "--database", help="Database to connect to (default: postgres; activity is shown for all databases)")
+    top_parser.add_argument("-n", "--interval", type=float, default=2.0, help="Seconds between samples (default: 2)")
+    top_parser.add_argument("--limit", type=int, default=20, help="Sessions shown, longest running first (default: 20)")
+    top_parser.add_argument("--iterations", type=int, default=0, help="Stop after N samples (default: 0, run until Ctrl+C)")
+    top_parser.add_argument("--no-screen", action="store_true", help="Draw inline instead of on the alternate screen")
+    top_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    top_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
+    top_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
+
+    # Ping command
+    ping_parser = subparsers.add_parser('ping', parents=[output_parser], help='Measure DNS, TCP, auth and query latency with percentiles', formatter_class=CustomRichHelpFormatter)
+    ping_parser.add_argument("-d", "--database", help="Database to connect to (default: postgres)")
+    ping_parser.add_argument("-n", "--count", type=int, default=10, help="Probes per mode (default: 10)")
+    ping_parser.add_argument("-c", "--concurrency", type=int, default=1, help="Probes in flight at once (default: 1)")
+    ping_parser.add_argument("--mode", choices=["both", "fresh", "reused"], default="both",
+                             help="fresh: new connection per probe, reused: query on open connections (default: both)")
+    ping_parser.add_argument("-i", "--interval", type=float, default=0, help="Seconds each worker waits between probes (default: 0)")
+    ping_parser.add_argument("--query", default="SELECT 1", help="Statement timed on each probe (default: SELECT 1)")
+    ping_parser.add_argument("--timeout", type=float, default=5, help="Connect timeout in seconds (default: 5)")
+    ping_parser.add_argument("--quiet", action="store_true", help="Only print the summary")
+    ping_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    ping_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
+    ping_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
+
+    # Bench command
+    bench_parser = subparsers.add_parser('bench', parents=[output_parser], help='pgbench-style load test: TPC-B-like or custom scripts', formatter_class=CustomRichHelpFormatter)
+    bench_parser.add_argument("-d", "--database", help="Database name (auto-detect if not provided)")
+    bench_parser.add_argument("-i", "--init", action="store_true", help="Create and fill the pgbench_* tables, then exit")
+    bench_parser.add_argument("-s", "--scale", type=int, help="Scale factor: 100,000 accounts each (default: 1 for --init, detected otherwise)")
+    bench_parser.add_argument("-b", "--builtin", choices=list(BENCH_BUILTINS), default="tpcb-like", help="Built-in script (default: tpcb-like)")
+    bench_parser.add_argument("-f", "--file", help="Custom script: SQL with :variables and \\set / \\sleep lines")
+    bench_parser.add_argument("-c", "--clients", type=int, default=10, help="Concurrent clients, one connection each (default: 10)")
+    bench_parser.add_argument("-T", "--time", type=float, default=10, help="Duration in seconds (default: 10)")
+    bench_parser.add_argument("-t", "--transactions", type=int, help="Transactions per client, instead of --time")
+    bench_parser.add_argument("-R", "--rate", type=float, help="Target total transactions per second (default: as fast as possible)")
+    bench_parser.add_argument("-P", "--progress", type=float, default=5, help="Seconds between progress lines, 0 to disable (default: 5)")
+    bench_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+    bench_parser.add_argument("-ul", '--up-level', action="store", help="Max deep up level config file search, default=0", default=0)
+    bench_parser.add_argument("-dl", '--down-level', action="store", help="Max deep down level config file search, default=1", default=1)
+    
+    # SERVE command
+    serve_parser = subparsers.add_parser('serve', help='Run a local daemon that keeps pooled connections', formatter_class=CustomRichHelpFormatter)
+    serve_parser.add_argument("--socket", help="Unix socket path (default: $PSQLC_SOCKET or ~/.cache/psqlc/psqlc.sock)")
+    serve_parser.add_argument("--pool-min", type=int, default=1, help="Minimum connections kept open per pool (default: 1)")
+    serve_parser.add_argument("--pool-max", type=int, default=10, help="Maximum connections per pool (default: 10)")
+    serve_parser.add_argument("--idle-timeout", type=float, default=300.0, help="Close pooled connections idle for this many seconds (default: 300)")
+    serve_parser.add_argument("--debug", action="store_true", help="Enable debug mode")
+
     # DROP command
     drop_parser = subparsers.add_parser('drop', help='Drop database or user', formatter_class=CustomRichHelpFormatter)
     drop_subparsers = drop_parser.add_subparsers(dest='drop_command', help='Drop options')
@@ -1500,6 +6763,32 @@ def setup_argument_parser():
     
     return parser
 
+def argv_with_config_placeholder(parser, argv: list) -> list:
+    """Give the optional CONFIG_FILE positional an empty value when the command comes first.
+
+    argparse would otherwise bind `show` in `psqlc show dbs` to CONFIG_FILE and then reject `dbs`.
+    """
+    import argparse
+
+    takes_value = {option for action in parser._actions if action.option_strings and action.nargs != 0
+                   for option in action.option_strings}
+    commands = set()
+    for action in parser._actions:
+        if isinstance(action, argparse._SubParsersAction):
+            commands.update(action.choices)
+
+    index = 0
+    while index < len(argv):
+        token = argv[index]
+        if token in takes_value:
+            index += 2
+        elif token.startswith('-'):
+            index += 1
+        else:
+            return argv[:index] + [''] + argv[index:] if token in commands else argv
+    return argv
+
+
 def command_requires_superuser(args) -> bool:
     """Return True for commands that typically require superuser privileges."""
     if not args or not getattr(args, "command", None):
@@ -1540,7 +6829,9 @@ async def run_command(args, show_parser, drop_parser):
     from pwinput import pwinput
 
     async def _dispatch():
-        if args.command == 'create':
+        if fleet_requested(args):
+            await run_fleet(args)
+        elif args.command == 'create':
             if hasattr(args, 'CONFIG'):
                 args.up_level = 0
                 args.down_level = 0
@@ -1558,14 +6849,30 @@ async def run_command(args, show_parser, drop_parser):
                 await show_indexes(args)
             elif args.show_command == 'size':
                 await show_size(args)
+            elif args.show_command == 'slow':
+                await show_slow(args)
             else:
                 show_parser.print_help()
         elif args.command == 'describe':
             await describe_table(args)
         elif args.command == 'query':
             await execute_query(args)
+        elif args.command == 'run':
+            await run_script(args)
         elif args.command == 'backup':
-            backup_database(args)
+            await backup_database(args)
+        elif args.command == 'load':
+            await load_data(args)
+        elif args.command == 'restore':
+            await restore_database(args)
+        elif args.command == 'serve':
+            await serve_daemon(args)
+        elif args.command == 'top':
+            await top_dashboard(args)
+        elif args.command == 'ping':
+            await ping_database(args)
+        elif args.command == 'bench':
+            await bench_database(args)
         elif args.command == 'drop':
             if args.drop_command == 'database':
                 await drop_database(args)
@@ -1613,22 +6920,46 @@ def main():
     """Main entry point"""
     # import getpass
     # from pwinput import pwinput
-    from rich.console import Console
-    console = Console()
-    import argparse
     
-    # Early version check
+    # Early version check, before rich or argparse are imported
     if '--version' in sys.argv or '-v' in sys.argv:
-        Console().print(f"📦 [bold #FFFF00]Version:[/] [bold #00FFFF]{get_version()}[/]")
+        print_version()
         sys.exit(0)
+
+    env_timings = str(os.getenv("PSQLC_TIMINGS", "")).lower()
+    if env_timings not in ("", "0", "false", "no"):
+        TIMINGS.enable(env_timings)
+    if '--timings' in sys.argv or '--timings-json' in sys.argv:
+        TIMINGS.enable("json" if '--timings-json' in sys.argv else TIMINGS.format)
+    if TIMINGS.enabled:
+        TIMINGS.add("import", time.perf_counter() - TIMINGS.started)
+        try:
+            _run_main()
+        finally:
+            TIMINGS.report()
+    else:
+        _run_main()
+
+
+def _run_main():
+    import argparse
+    with TIMINGS.phase("parse args"):
+        parser = setup_argument_parser()
     
-    parser = setup_argument_parser()
-    
-    if len(sys.argv) == 1:
-        parser.print_help()
-        sys.exit(1)
+        if len(sys.argv) == 1:
+            parser.print_help()
+            sys.exit(1)
     
-    args = parser.parse_args()
+        args = parser.parse_args(argv_with_config_placeholder(parser, sys.argv[1:]))
+        args.CONFIG_FILE = args.CONFIG_FILE or None
+
+    global STATUS_TO_STDERR, PLAIN_OUTPUT, USE_PAGER, EXEC_SETTINGS, SHOW_CONFIG_SOURCES
+    EXEC_SETTINGS = EXEC_SETTINGS or args.exec_settings
+    SHOW_CONFIG_SOURCES = args.config_sources
+    PLAIN_OUTPUT = args.plain
+    USE_PAGER = not args.no_pager
+    if getattr(args, 'no_limit', False) or args.plain or (getattr(args, 'format', None) and getattr(args, 'output', '-') == '-'):
+        STATUS_TO_STDERR = True
 
     if hasattr(args, 'CONFIG'):
         args.up_level = 0
@@ -1638,10 +6969,18 @@ def main():
     db_config = parse_django_settings(args.CONFIG_FILE, max_depth_up=args.up_level, max_depth_down=args.down_level)
     logger.info(f"db_config:: {db_config}")
     
+    if getattr(args, 'database', None):
+        CONFIG_SOURCES['database'] = ('-d/--database', 'command line', args.database)
     if db_config:
-        args.database = db_config.get('database') or args.database
+        # an explicit -d/--database beats the NAME found in the project config
+        if not getattr(args, 'database', None) and db_config.get('database'):
+            args.database = db_config['database']
+            CONFIG_SOURCES['database'] = (*(db_config.get('_sources') or {}).get('database', ('?', 'config')), args.database)
         args.hostname = db_config.get('host') or args.hostname
         args.port = int(db_config.get('port')) if db_config.get('port') else args.port
+        for param in ('host', 'port'):
+            if db_config.get(param):
+                CONFIG_SOURCES[param] = (*(db_config.get('_sources') or {}).get(param, ('?', 'config')), db_config[param])
     
     # Set debug mode
     if hasattr(args, 'debug') and args.debug:
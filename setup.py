@@ -306,7 +306,6 @@ setup(
         'Topic :: Software Development :: Build Tools',
         'Topic :: System :: Filesystems',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3.9',
@@ -316,7 +315,7 @@ setup(
         'Environment :: Console',
     ],
     keywords='postgresql, automation, analytics, developer tools, monitoring, devops, django, asyncpg, dotenv',
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     install_requires=['rich', 'asyncpg', 'licface', 'envdot', 'pwinput', 'richcolorlog'],
     entry_points={
         'console_scripts': [
@@ -0,0 +1,43 @@
+import asyncio
+import json
+import os
+
+import psqlc
+
+
+def test_manifest_round_trip(tmp_path):
+    manifest = {
+        "format": "psqlc",
+        "version": psqlc.ARCHIVE_FORMAT_VERSION,
+        "compression": "gzip",
+        "tables": [{"schema": "public", "name": "t", "columns": ["id"], "chunks": [], "bytes": 0}],
+        "pre_data": ['CREATE TABLE "public"."t" (\n    "id" integer\n)'],
+        "post_data": [{"step": 0, "kind": "index", "table": "public.t", "sql": "CREATE INDEX ..."}],
+        "skipped": {"view": ["public.v"]},
+    }
+    psqlc.write_archive_manifest(str(tmp_path), manifest)
+    assert not os.path.exists(tmp_path / (psqlc.ARCHIVE_MANIFEST + ".tmp"))
+    assert psqlc.read_archive_manifest(str(tmp_path)) == manifest
+
+
+def test_read_archive_manifest_rejects_other_directories(tmp_path):
+    assert psqlc.read_archive_manifest(str(tmp_path)) is None
+    (tmp_path / psqlc.ARCHIVE_MANIFEST).write_text(json.dumps({"format": "other"}))
+    assert psqlc.read_archive_manifest(str(tmp_path)) is None
+
+
+def test_chunks_round_trip(tmp_path):
+    codec = psqlc.archive_codec("gzip")
+    writer = psqlc.ChunkWriter(str(tmp_path), "00000", codec, chunk_bytes=10)
+    payload = [b"PGCOPY\n\xff\r\n\x00", b"row-1" * 3, b"row-2"]
+
+    async def write():
+        for data in payload:
+            await writer.write(data)
+        await writer.flush()
+
+    asyncio.run(write())
+    assert writer.raw_bytes == sum(map(len, payload))
+    assert [c["file"] for c in writer.chunks] == ["00000.%05d.bin.gz" % i for i in range(3)]
+    restored = b"".join(psqlc._read_chunk(str(tmp_path / c["file"]), codec[2]) for c in writer.chunks)
+    assert restored == b"".join(payload)
@@ -0,0 +1,56 @@
+import pytest
+
+import psqlc
+
+MB = 1024**2
+PARAMS = {"host": "db1", "port": 5433, "user": "app", "database": "shop"}
+
+
+def test_small_or_empty_database_uses_one_job():
+    assert psqlc.auto_backup_jobs([], cpu_count=8) == 1
+    assert psqlc.auto_backup_jobs([40 * MB, 20 * MB], cpu_count=8) == 1
+
+
+def test_jobs_stop_at_total_over_largest_table():
+    # 1000 MB total, largest 400 MB: a third worker still helps, a fourth would only wait
+    assert psqlc.auto_backup_jobs([400 * MB] + [100 * MB] * 6, cpu_count=32) == 3
+    # one table dominates the dump
+    assert psqlc.auto_backup_jobs([900 * MB, 50 * MB, 50 * MB], cpu_count=32) == 2
+
+
+@pytest.mark.parametrize("sizes, cpu_count, expected", [
+    ([10 * MB] * 100, 4, 4),
+    ([100 * MB] * 3, 32, 3),
+    ([10 * MB] * 100, 64, 16),
+])
+def test_jobs_capped_by_cpus_tables_and_sixteen(sizes, cpu_count, expected):
+    assert psqlc.auto_backup_jobs(sizes, cpu_count=cpu_count) == expected
+
+
+@pytest.mark.parametrize("fmt, flag", [("plain", "p"), ("custom", "c"), ("directory", "d"), ("tar", "t")])
+def test_pg_dump_command_format(fmt, flag):
+    cmd = psqlc.pg_dump_command(PARAMS, fmt, "out")
+    assert cmd == ["pg_dump", "-h", "db1", "-p", "5433", "-U", "app", "-d", "shop", "-F", flag, "-f", "out"]
+
+
+def test_pg_dump_command_jobs():
+    assert "-j" not in psqlc.pg_dump_command(PARAMS, "directory", "out", jobs=1)
+    assert psqlc.pg_dump_command(PARAMS, "directory", "out", jobs=4)[-2:] == ["-j", "4"]
+
+
+@pytest.mark.parametrize("compress, level, version, expected", [
+    ("zstd", None, 16, ["--compress=zstd"]),
+    ("zstd", 9, 17, ["--compress=zstd:9"]),
+    ("gzip", 3, 16, ["--compress=gzip:3"]),
+    ("gzip", None, 15, ["-Z", "6"]),
+    ("gzip", 2, 14, ["-Z", "2"]),
+    ("gzip", None, None, ["-Z", "6"]),
+])
+def test_pg_dump_command_compression(compress, level, version, expected):
+    cmd = psqlc.pg_dump_command(PARAMS, "custom", "out", compress=compress, level=level, version=version)
+    assert cmd[cmd.index("out") + 1:] == expected
+
+
+def test_pg_dump_command_without_compression():
+    cmd = psqlc.pg_dump_command(PARAMS, "custom", "out", version=16)
+    assert cmd[-1] == "out"
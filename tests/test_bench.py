@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+import psqlc
+
+
+def evaluate(text, **variables):
+    functions = {"__builtins__": {}, "random": random.Random(1).randint, "abs": abs, "min": min, "max": max,
+                 "int": int, **psqlc.BENCH_OPERATORS}
+    return eval(psqlc.compile_bench_expression(text), functions, variables)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("7 / 2", 3), ("-7 / 2", -3), ("7 / -2", -3), ("-7 / -2", 3),
+    ("7 % 3", 1), ("-7 % 3", -1), ("7 % -3", 1), ("-7 % -3", -1),
+    ("(:aid - 1) / 100000 + 1", 3),
+    ("-:aid / 100000", -2),
+    ("abs(-5) + min(1, 2) * max(3, 4)", 9),
+    ("7.0 / 2", 3.5),
+])
+def test_division_and_modulo_follow_pgbench(text, expected):
+    assert evaluate(text, aid=250000) == expected
+
+
+def test_random_stays_in_range():
+    assert all(1 <= evaluate("random(1, 10 * :scale)", scale=1) <= 10 for _ in range(20))
+
+
+@pytest.mark.parametrize("text", ["__import__('os')", "x.y", "'a'", "open(1)", "random(lo=1)", "2 ** 8", "7 // 2", "[1]"])
+def test_rejects_anything_else(text):
+    with pytest.raises(ValueError):
+        psqlc.compile_bench_expression(text)
+
+
+def test_division_by_zero_raises():
+    with pytest.raises(ZeroDivisionError):
+        evaluate("1 / :n", n=0)
+
+
+def test_parse_bench_script():
+    steps = psqlc.parse_bench_script(
+        "\\set aid random(1, 100 * :scale)\n"
+        "\\sleep 5 ms\n"
+        "UPDATE t SET v = v + :delta WHERE id = :aid AND other = :aid;\n"
+        "SELECT '::text', :aid::int;\n"
+    )
+    assert [step[0] for step in steps] == ["set", "sleep", "sql", "sql"]
+    assert steps[0][1] == "aid"
+    assert steps[1][2] == 0.001
+    assert steps[2][1:3] == ("UPDATE t SET v = v + $1 WHERE id = $2 AND other = $2", ["delta", "aid"])
+    assert steps[3][1:3] == ("SELECT '::text', $1::int", ["aid"])
+
+
+@pytest.mark.parametrize("script, message", [
+    ("\\set x 1\n", "no SQL"),
+    ("\\gset\nSELECT 1;", "unsupported meta-command"),
+    ("\\sleep 1 min\nSELECT 1;", "\\sleep takes"),
+])
+def test_parse_bench_script_errors(script, message):
+    with pytest.raises(ValueError, match=message.replace("\\", "\\\\")):
+        psqlc.parse_bench_script(script)
+
+
+def test_latency_histogram_buckets():
+    table = psqlc.latency_histogram([0.0001, 0.0003, 0.0003, 0.0015, 2.0])
+    labels, counts = table.columns[0]._cells, table.columns[1]._cells
+    # empty buckets between the first and last used one are kept, the open bucket is last
+    assert labels[0] == "≤ 0.25 ms" and labels[-1] == "> 1024 ms"
+    assert len(labels) == len(psqlc.BENCH_HISTOGRAM_MS) + 1
+    assert counts[:4] == ["1", "2", "0", "1"]
+    assert counts[-1] == "1"
+
+
+def test_latency_histogram_edges():
+    assert psqlc.latency_histogram([]).row_count == 0
+    # a latency equal to a bound falls into that bucket
+    table = psqlc.latency_histogram([0.001])
+    assert table.columns[0]._cells == ["≤ 1 ms"]
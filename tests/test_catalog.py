@@ -0,0 +1,62 @@
+import asyncio
+
+import psqlc
+
+IDENT = {"database": "app", "host": "local", "port": 5432}
+
+
+class FakeCatalog:
+    """Answers the stamp and refresh queries of catalog_snapshot from in-memory relations"""
+
+    def __init__(self):
+        self.relations = {1: ("public", "users", "s1", ["id", "name"]), 2: ("public", "orders", "s1", ["id"])}
+        self.refreshed = []
+
+    async def fetch(self, sql, *args):
+        if sql is psqlc.CATALOG_STAMPS_SQL:
+            name, schema = args
+            rows = [dict(IDENT, oid=oid, schema=s, table=t, stamp=stamp)
+                    for oid, (s, t, stamp, _) in self.relations.items()
+                    if name in (None, t) and schema in (None, s)]
+            return rows or [dict(IDENT, oid=None, schema=None, table=None, stamp=None)]
+        oids = args[0]
+        if "pg_attribute" in sql:
+            self.refreshed.append(sorted(oids))
+            return [{"schema": s, "table": t, "ordinal": n, "column_name": c, "data_type": "text",
+                     "character_maximum_length": None, "is_nullable": "YES", "column_default": None}
+                    for oid in oids for s, t, _, cols in [self.relations[oid]] for n, c in enumerate(cols, 1)]
+        return []
+
+
+def lookup(conn, table):
+    found = asyncio.run(psqlc.catalog_lookup(conn, table, ("columns",)))
+    return [row["column_name"] for row in found["columns"]]
+
+
+def test_catalog_cache_refreshes_only_changed_relations(tmp_path, monkeypatch):
+    monkeypatch.setattr(psqlc, "get_cache_dir", lambda: str(tmp_path))
+    monkeypatch.delenv("PSQLC_NO_CACHE", raising=False)
+    conn = FakeCatalog()
+
+    assert lookup(conn, "users") == ["id", "name"]
+    assert lookup(conn, "users") == ["id", "name"]
+    assert conn.refreshed == [[1]]
+
+    assert lookup(conn, "orders") == ["id"]
+    assert conn.refreshed == [[1], [2]]
+
+    conn.relations[1] = ("public", "users", "s2", ["id", "name", "email"])
+    assert lookup(conn, "public.users") == ["id", "name", "email"]
+    assert lookup(conn, "orders") == ["id"]
+    assert conn.refreshed == [[1], [2], [1]]
+
+    del conn.relations[2]
+    assert lookup(conn, "orders") == []
+    assert len(conn.refreshed) == 3
+
+
+def test_unscoped_lookup_skips_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(psqlc, "get_cache_dir", lambda: str(tmp_path))
+    conn = FakeCatalog()
+    conn.fetch = None  # any stamp query would fail
+    assert asyncio.run(psqlc.catalog_lookup(conn, None, ("indexes",))) is None
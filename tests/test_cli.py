@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def import_with_argv(*argv):
+    """Import psqlc in a fresh interpreter with the given argv and return its DEBUG setting."""
+    code = (
+        "import os, sys; sys.argv = ['psqlc'] + sys.argv[1:]; "
+        "import psqlc; print(os.environ.get('DEBUG', ''))"
+    )
+    env = {k: v for k, v in os.environ.items() if k not in ("DEBUG", "LOGGING")}
+    env["PYTHONPATH"] = str(ROOT)
+    result = subprocess.run([sys.executable, "-c", code, *argv], env=env, cwd=str(ROOT),
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+
+
+def test_database_flag_does_not_enable_debug():
+    assert import_with_argv("-d", "shop", "show", "tables") == ""
+
+
+def test_debug_flag_enables_debug():
+    assert import_with_argv("--debug", "show", "dbs") == "1"
+
+
+def test_config_placeholder_inserted_before_command():
+    import psqlc
+
+    parser = psqlc.setup_argument_parser()
+    assert psqlc.argv_with_config_placeholder(parser, ["show", "dbs"]) == ["", "show", "dbs"]
+    assert psqlc.argv_with_config_placeholder(parser, ["-H", "db1", "show", "tables"]) == \
+        ["-H", "db1", "", "show", "tables"]
+    assert psqlc.argv_with_config_placeholder(parser, ["settings.py", "show", "dbs"]) == \
+        ["settings.py", "show", "dbs"]
+
+    args = parser.parse_args(psqlc.argv_with_config_placeholder(parser, ["show", "dbs"]))
+    assert args.command == "show" and args.CONFIG_FILE == ""
+
+
+def test_output_flags_after_subcommand():
+    import psqlc
+
+    parser = psqlc.setup_argument_parser()
+
+    def parse(*argv):
+        return parser.parse_args(psqlc.argv_with_config_placeholder(parser, list(argv)))
+
+    args = parse("show", "tables", "--plain", "--no-pager")
+    assert args.plain == "aligned" and args.no_pager
+    assert parse("query", "-q", "SELECT 1", "--tsv").plain == "tsv"
+
+    # given before the subcommand, the value survives the subparser's defaults
+    args = parse("--tsv", "--no-pager", "show", "dbs")
+    assert args.plain == "tsv" and args.no_pager
+    args = parse("show", "dbs")
+    assert args.plain is None and not args.no_pager
@@ -0,0 +1,71 @@
+import asyncio
+import datetime
+import decimal
+import ipaddress
+import uuid
+
+import asyncpg
+
+import psqlc
+
+
+class FakeWriter:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+
+def round_trip(obj):
+    async def run():
+        writer = FakeWriter()
+        await psqlc._send_frame(writer, obj)
+        reader = asyncio.StreamReader()
+        reader.feed_data(writer.data)
+        reader.feed_eof()
+        return await psqlc._recv_frame(reader), await psqlc._recv_frame(reader)
+
+    return asyncio.run(run())
+
+
+def test_frame_round_trip_keeps_types():
+    row = [
+        decimal.Decimal("12345678901234567890.000001"),
+        datetime.datetime(2024, 2, 29, 23, 59, 59, 123456, tzinfo=datetime.timezone.utc),
+        datetime.date(2024, 1, 1),
+        datetime.time(12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=5))),
+        datetime.timedelta(days=1, seconds=7200, microseconds=5),
+        uuid.UUID("12345678-1234-5678-1234-567812345678"),
+        b"\x00\xffbinary",
+        ipaddress.ip_interface("10.0.0.1/8"),
+        None, True, 3, 1.5, "text", [1, 2, None],
+    ]
+    frame, eof = round_trip({"ok": True, "columns": ["c%d" % i for i in range(len(row))], "rows": [row]})
+    assert eof is None
+    assert frame["rows"][0] == row
+    assert type(frame["rows"][0][0]) is decimal.Decimal
+
+
+def test_frame_round_trip_records():
+    record = psqlc.DaemonRecord(["id", "name"], [1, "a"])
+    frame, _ = round_trip({"value": record})
+    assert frame["value"] == record
+    assert frame["value"]["name"] == "a" and frame["value"][0] == 1
+    assert dict(frame["value"].items()) == {"id": 1, "name": "a"}
+
+
+def test_error_response_reraises_sqlstate_class():
+    error = asyncpg.PostgresError.new({"C": "23505", "M": "duplicate key value", "n": "users_pkey"})
+    frame, _ = round_trip(psqlc.error_response(error))
+    exc = psqlc.daemon_exception(frame)
+    assert isinstance(exc, asyncpg.UniqueViolationError)
+    assert exc.sqlstate == "23505" and exc.constraint_name == "users_pkey"
+
+
+def test_error_response_without_sqlstate():
+    exc = psqlc.daemon_exception(psqlc.error_response(ValueError("bad op")))
+    assert isinstance(exc, psqlc.DaemonError) and str(exc) == "bad op"
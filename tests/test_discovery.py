@@ -0,0 +1,230 @@
+import json
+import os
+
+import pytest
+
+import psqlc
+
+
+def touch(path, text=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return str(path)
+
+
+def discover(start, **kwargs):
+    kwargs.setdefault("max_files", 100000)
+    kwargs.setdefault("time_budget", 60)
+    return psqlc.discover_config_files(str(start), **kwargs)
+
+
+def test_shallowest_match_in_priority_order(tmp_path):
+    touch(tmp_path / "a" / "b" / "settings.py")
+    shallow = touch(tmp_path / "a" / "settings.py")
+    env = touch(tmp_path / ".env")
+    touch(tmp_path / "z" / ".env")
+    assert discover(tmp_path, filenames=(".env", "settings.py")) == [env]
+    # .env sits in a directory listed before settings.py turned up, so it is reported too
+    assert discover(tmp_path, filenames=("settings.py", ".env")) == [shallow, env]
+
+
+def test_stops_once_the_first_name_is_found(tmp_path):
+    touch(tmp_path / "settings.py")
+    touch(tmp_path / "deep" / "er" / ".env")
+    visited = []
+    assert discover(tmp_path, visited=visited) == [str(tmp_path / "settings.py")]
+    assert visited == [str(tmp_path)]
+
+
+def test_lower_priority_names_keep_the_walk_going(tmp_path):
+    env = touch(tmp_path / ".env")
+    settings = touch(tmp_path / "app" / "settings.py")
+    assert discover(tmp_path, filenames=("settings.py", ".env")) == [settings, env]
+
+
+@pytest.mark.parametrize("max_depth_down, found", [(0, False), (2, False), (3, True)])
+def test_depth_down_limit(tmp_path, max_depth_down, found):
+    path = touch(tmp_path / "a" / "b" / "c" / "settings.py")
+    assert discover(tmp_path, max_depth_down=max_depth_down, filenames=("settings.py",)) == ([path] if found else [])
+
+
+def test_depth_up_scans_ancestor_subtrees_once(tmp_path):
+    start = tmp_path / "project" / "src"
+    start.mkdir(parents=True)
+    sibling = touch(tmp_path / "project" / "conf" / "settings.py")
+    touch(tmp_path / "other" / "deeper" / "settings.py")
+
+    assert discover(start, filenames=("settings.py",)) == []
+    visited = []
+    assert discover(start, max_depth_up=1, filenames=("settings.py",), visited=visited) == [sibling]
+    assert visited.count(str(start)) == 1
+
+
+def test_ignored_directories_are_pruned(tmp_path):
+    for name in ("node_modules", ".git", "venv", "web-env", "build"):
+        touch(tmp_path / name / "settings.py")
+    touch(tmp_path / ".gitignore", "build/\n# comment\n!keep\n")
+    touch(tmp_path / "app" / ".psqlcignore", "generated\n")
+    touch(tmp_path / "app" / "generated" / "settings.py")
+    settings = touch(tmp_path / "app" / "src" / "settings.py")
+    # ignore rules prune directories, never the candidate files themselves
+    env = touch(tmp_path / "app" / ".env")
+    touch(tmp_path / "app" / ".gitignore", ".env\n")
+
+    assert discover(tmp_path, filenames=("settings.py", ".env")) == [settings, env]
+
+
+def test_scandir_entry_budget(tmp_path):
+    for n in range(5):
+        touch(tmp_path / f"d{n}" / "filler.txt")
+    touch(tmp_path / "d4" / "sub" / "settings.py")
+    visited = []
+    # the root alone holds 5 entries: the walk stops after listing it
+    assert discover(tmp_path, max_files=5, visited=visited, filenames=("settings.py",)) == []
+    assert visited == [str(tmp_path)]
+    assert discover(tmp_path, max_files=20, filenames=("settings.py",)) == [str(tmp_path / "d4" / "sub" / "settings.py")]
+
+
+def test_budget_from_environment(tmp_path, monkeypatch):
+    touch(tmp_path / "a" / "settings.py")
+    touch(tmp_path / "b" / "filler.txt")
+    monkeypatch.setenv("PSQLC_DISCOVERY_MAX_FILES", "2")
+    assert psqlc.discover_config_files(str(tmp_path), filenames=("settings.py",)) == []
+    monkeypatch.setenv("PSQLC_DISCOVERY_MAX_FILES", "100")
+    monkeypatch.setenv("PSQLC_DISCOVERY_TIMEOUT", "0")
+    assert psqlc.discover_config_files(str(tmp_path), filenames=("settings.py",)) == []
+
+
+def test_symlinked_directories_are_not_followed(tmp_path):
+    touch(tmp_path / "real" / "settings.py")
+    (tmp_path / "start").mkdir()
+    os.symlink(tmp_path / "real", tmp_path / "start" / "link")
+    assert discover(tmp_path / "start", filenames=("settings.py",)) == []
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """An empty project directory as cwd, with its own cache dir and a fresh in-process memo"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.delenv("PSQLC_NO_CACHE", raising=False)
+    monkeypatch.setattr(psqlc, "_discovery_memo", {})
+    root = tmp_path / "project"
+    root.mkdir()
+    monkeypatch.chdir(root)
+    return root
+
+
+class Resolver:
+    """A resolve() callback that finds .env like find_env_engine_config and counts its walks"""
+
+    def __init__(self, depends=None):
+        self.calls = 0
+        self.depends = depends
+
+    def __call__(self, visited):
+        self.calls += 1
+        paths = psqlc.discover_config_files(max_depth_down=2, filenames=(".env",), visited=visited)
+        if not paths:
+            return None, None
+        config = {"host": open(paths[0]).read().strip()}
+        if self.depends:
+            config["_depends"] = self.depends
+        return paths[0], config
+
+
+def lookup(resolve, kind="env"):
+    psqlc._discovery_memo.clear()  # a new process: only the on-disk cache survives
+    return psqlc.cached_discovery(kind, None, 0, 2, resolve)
+
+
+def test_second_lookup_comes_from_disk(project, capsys):
+    (project / ".env").write_text("db1")
+    resolve = Resolver()
+    assert lookup(resolve) == (str(project / ".env"), {"host": "db1"})
+    assert lookup(resolve) == (str(project / ".env"), {"host": "db1"})
+    assert resolve.calls == 1
+    assert "(cached)" in capsys.readouterr().out
+
+
+def test_memo_skips_the_disk_within_a_process(project, monkeypatch):
+    resolve = Resolver()
+    psqlc.cached_discovery("env", None, 0, 2, resolve)
+    monkeypatch.setattr(psqlc, "_load_discovery_cache", lambda: pytest.fail("disk cache read again"))
+    psqlc.cached_discovery("env", None, 0, 2, resolve)
+    assert resolve.calls == 1
+
+
+def test_negative_entry_rebuilt_after_a_file_is_added(project):
+    (project / "app" / "conf").mkdir(parents=True)
+    resolve = Resolver()
+    assert lookup(resolve) == (None, None)
+    assert lookup(resolve) == (None, None)
+    assert resolve.calls == 1
+
+    # the new file bumps the mtime of a directory the first walk visited
+    (project / "app" / "conf" / ".env").write_text("db2")
+    assert lookup(resolve) == (str(project / "app" / "conf" / ".env"), {"host": "db2"})
+    assert resolve.calls == 2
+    assert lookup(resolve)[1] == {"host": "db2"}
+    assert resolve.calls == 2
+
+
+def test_closer_file_replaces_a_cached_deeper_one(project):
+    (project / "app").mkdir()
+    (project / "app" / ".env").write_text("deep")
+    resolve = Resolver()
+    assert lookup(resolve)[1] == {"host": "deep"}
+    (project / ".env").write_text("near")
+    assert lookup(resolve)[1] == {"host": "near"}
+    assert resolve.calls == 2
+
+
+def test_editing_the_chosen_file_invalidates(project):
+    env = project / ".env"
+    env.write_text("db1")
+    resolve = Resolver()
+    lookup(resolve)
+    env.write_text("db9")
+    os.utime(env, ns=(env.stat().st_atime_ns, env.stat().st_mtime_ns + 1_000_000_000))
+    assert lookup(resolve)[1] == {"host": "db9"}
+    assert resolve.calls == 2
+
+
+def test_reported_dependencies_invalidate(project, monkeypatch):
+    (project / ".env").write_text("db1")
+    base = project / "base.py"
+    base.write_text("")
+    monkeypatch.setenv("PSQLC_TEST_HOST", "a")
+    resolve = Resolver(depends={"files": {str(base): base.stat().st_mtime_ns}, "environ": {"PSQLC_TEST_HOST": "a"}})
+    lookup(resolve)
+    lookup(resolve)
+    assert resolve.calls == 1
+
+    monkeypatch.setenv("PSQLC_TEST_HOST", "b")
+    lookup(resolve)
+    assert resolve.calls == 2
+
+    resolve.depends = {"files": {str(base): base.stat().st_mtime_ns}}
+    lookup(resolve)
+    os.utime(base, ns=(base.stat().st_atime_ns, base.stat().st_mtime_ns + 1_000_000_000))
+    lookup(resolve)
+    assert resolve.calls == 4
+
+
+def test_no_cache_bypasses_the_disk(project, monkeypatch):
+    monkeypatch.setenv("PSQLC_NO_CACHE", "1")
+    resolve = Resolver()
+    lookup(resolve)
+    lookup(resolve)
+    assert resolve.calls == 2
+    assert not os.path.exists(psqlc._discovery_cache_file())
+
+
+def test_oldest_entries_are_dropped(project, monkeypatch):
+    monkeypatch.setattr(psqlc, "DISCOVERY_CACHE_MAX_ENTRIES", 2)
+    resolve = Resolver()
+    for kind in ("a", "b", "c"):
+        lookup(resolve, kind)
+    with open(psqlc._discovery_cache_file()) as f:
+        kinds = [json.loads(key)[1] for key in json.load(f)]
+    assert kinds == ["b", "c"]
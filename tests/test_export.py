@@ -0,0 +1,34 @@
+import datetime
+import decimal
+import json
+import uuid
+from collections import namedtuple
+
+import psqlc
+
+Type = namedtuple("Type", "oid name kind schema")
+Attribute = namedtuple("Attribute", "name type")
+
+
+def test_json_fragment_keeps_types():
+    assert psqlc.json_fragment(decimal.Decimal("12345678901234567890.10")) == "12345678901234567890.10"
+    assert psqlc.json_fragment(decimal.Decimal("NaN")) == '"NaN"'
+    assert psqlc.json_fragment(b"\xde\xad") == '"3q0="'
+    assert psqlc.json_fragment(datetime.date(2024, 2, 29)) == '"2024-02-29"'
+    assert psqlc.json_fragment(datetime.timedelta(days=1, seconds=3)) == '"P1DT3S"'
+    assert psqlc.json_fragment([1, None, "é"]) == '[1,null,"é"]'
+
+
+def test_jsonl_encoder_decodes_json_columns():
+    attributes = [
+        Attribute("id", Type(23, "int4", "scalar", "pg_catalog")),
+        Attribute("doc", Type(3802, "jsonb", "scalar", "pg_catalog")),
+        Attribute("raw", Type(114, "json", "scalar", "pg_catalog")),
+        Attribute("u", Type(2950, "uuid", "scalar", "pg_catalog")),
+    ]
+    encode = psqlc.jsonl_encoder(attributes)
+    key = uuid.UUID("12345678-1234-5678-1234-567812345678")
+    line = encode([7, '{"a": [1, 2.50]}', '{"k":\n 1}', key])
+    assert "\n" not in line
+    assert json.loads(line) == {"id": 7, "doc": {"a": [1, 2.5]}, "raw": {"k": 1}, "u": str(key)}
+    assert json.loads(encode([None, None, None, None])) == {"id": None, "doc": None, "raw": None, "u": None}
@@ -0,0 +1,153 @@
+import asyncio
+import json
+
+import pytest
+
+import psqlc
+
+# the example from docs/commands.rst (Fleet Options)
+DOCUMENTED_YAML = """\
+defaults:
+  user: monitor
+  password: secret
+hosts:
+  db01: {host: 10.0.0.1}
+  db02: {host: 10.0.0.2, port: 5433, database: app}
+  db03: 10.0.0.3:5432
+"""
+
+DOCUMENTED_TOML = """\
+[defaults]
+user = "monitor"
+password = "secret"
+
+[hosts]
+db01 = {host = "10.0.0.1"}
+db02 = {host = "10.0.0.2", port = 5433, database = "app"}
+db03 = "10.0.0.3:5432"
+"""
+
+EXPECTED = [
+    {"user": "monitor", "password": "secret", "host": "10.0.0.1", "name": "db01"},
+    {"user": "monitor", "password": "secret", "host": "10.0.0.2", "port": 5433, "database": "app", "name": "db02"},
+    {"user": "monitor", "password": "secret", "host": "10.0.0.3:5432", "name": "db03"},
+]
+
+
+def test_documented_yaml_inventory(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "fleet.yaml"
+    path.write_text(DOCUMENTED_YAML)
+    assert psqlc.load_inventory(str(path)) == EXPECTED
+
+
+def test_documented_toml_inventory(tmp_path):
+    try:
+        import tomllib  # noqa: F401
+    except ImportError:
+        pytest.importorskip("tomli")
+    path = tmp_path / "fleet.toml"
+    path.write_text(DOCUMENTED_TOML)
+    assert psqlc.load_inventory(str(path)) == EXPECTED
+
+
+def test_json_inventory_list_of_hosts(tmp_path):
+    path = tmp_path / "fleet.json"
+    path.write_text(json.dumps({"defaults": {"port": 5433}, "hosts": ["a", {"host": "b", "port": 5432}]}))
+    assert psqlc.load_inventory(str(path)) == [{"port": 5433, "host": "a"}, {"port": 5432, "host": "b"}]
+
+
+@pytest.mark.parametrize("data, message", [
+    ([], "expected a mapping"),
+    ({"defaults": {"user": "x"}}, "no 'hosts'"),
+    ({"hosts": 5}, "'hosts' must be"),
+    ({"hosts": [["a"]]}, "host #1 must be"),
+    ({"hosts": {"db01": {"port": 5432}}}, "host #1 (db01) has no 'host'"),
+])
+def test_invalid_inventory(tmp_path, data, message):
+    path = tmp_path / "fleet.json"
+    path.write_text(json.dumps(data))
+    with pytest.raises(ValueError, match=message.replace("(", r"\(").replace(")", r"\)")):
+        psqlc.load_inventory(str(path))
+
+
+class FakeConn:
+    def __init__(self, label, state):
+        self.label, self.state = label, state
+
+    async def close(self):
+        self.state["closed"].append(self.label)
+
+
+def run_gather(monkeypatch, behaviour, concurrency=10, timeout=0.2):
+    state = {"running": 0, "peak": 0, "closed": []}
+
+    async def daemon_connect(host, **kwargs):
+        if behaviour[host] == "refused":
+            raise ConnectionRefusedError(f"connection to {host} refused")
+        return FakeConn(host, state)
+
+    async def fetch(conn):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        try:
+            kind = behaviour[conn.label]
+            if kind == "hang":
+                await asyncio.Event().wait()
+            if kind == "raise":
+                raise RuntimeError("relation does not exist")
+            await asyncio.sleep(kind)
+            return [{"host": conn.label}]
+        finally:
+            state["running"] -= 1
+
+    monkeypatch.setattr(psqlc, "daemon_connect", daemon_connect)
+    targets = {label: {"host": label, "port": 5432, "user": "u", "password": None, "database": "d"} for label in behaviour}
+    results, failures = asyncio.run(psqlc.gather_targets(targets, fetch, concurrency, timeout))
+    return results, failures, state
+
+
+def test_gather_targets_isolates_hanging_and_failing_targets(monkeypatch):
+    behaviour = {"slow": 0.05, "hang": "hang", "fast": 0, "raise": "raise", "refused": "refused"}
+    results, failures, state = run_gather(monkeypatch, behaviour)
+
+    assert results == {"slow": [{"host": "slow"}], "fast": [{"host": "fast"}]}
+    assert list(failures) == ["hang", "raise", "refused"]
+    assert failures["hang"] == "timed out after 0.2s"
+    assert failures["raise"] == "relation does not exist"
+    assert failures["refused"] == "connection to refused refused"
+    # connections are closed on success, error and timeout alike
+    assert sorted(state["closed"]) == ["fast", "hang", "raise", "slow"]
+
+
+def test_gather_targets_results_keep_input_order(monkeypatch):
+    results, _, _ = run_gather(monkeypatch, {"c": 0.03, "a": 0, "b": 0.01})
+    assert list(results) == ["c", "a", "b"]
+
+
+def test_gather_targets_concurrency_bound(monkeypatch):
+    behaviour = {f"db{n:02d}": 0.01 for n in range(12)}
+    results, failures, state = run_gather(monkeypatch, behaviour, concurrency=3)
+    assert len(results) == 12 and not failures
+    assert state["peak"] == 3
+
+    _, _, state = run_gather(monkeypatch, behaviour, concurrency=0)
+    assert state["peak"] == 1
+
+
+def test_gather_targets_timeout_is_per_target(monkeypatch):
+    # queued one at a time, eight 0.1s targets take longer than the 0.5s timeout in total
+    behaviour = {f"db{n}": 0.1 for n in range(8)}
+    results, failures, _ = run_gather(monkeypatch, behaviour, concurrency=1, timeout=0.5)
+    assert len(results) == 8 and not failures
+
+
+def test_render_merged_lists_failures(monkeypatch, capsys):
+    monkeypatch.setenv("COLUMNS", "200")
+    results = {"db01": [{"database": "app", "size": "1 MB"}], "db02": []}
+    failures = {"db03": "timed out after 5s", "db04": "connection refused"}
+    psqlc.render_merged("Databases", "Host", results, failures, [("database", "Database", "cyan"), ("size", "Size", "green")])
+    out = capsys.readouterr().out
+    assert "db01" in out and "app" in out
+    assert "db03: timed out after 5s" in out
+    assert "db04: connection refused" in out
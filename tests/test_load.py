@@ -0,0 +1,50 @@
+import psqlc
+
+
+def test_csv_records_keep_quoted_empty_distinct_from_null():
+    lines = ['1,"",,x\n', '2,"a ""q"", b",,\n', '3,"multi\n', 'line",""\n']
+    assert list(psqlc.csv_records(iter(lines))) == [
+        ["1", "", None, "x"],
+        ["2", 'a "q", b', None, None],
+        ["3", "multi\nline", ""],
+    ]
+
+
+def test_split_csv_record():
+    assert psqlc._split_csv_record('"",,"x""y",\r\n', ",") == ["", None, 'x"y', None]
+    assert psqlc._split_csv_record('a\t""\t', "\t") == ["a", "", None]
+
+
+def test_csv_copy_line_round_trips_null_and_empty():
+    line = psqlc.csv_copy_line([None, "", 'say "hi"', "a,b"])
+    assert line == ',"","say ""hi""","a,b"\n'
+    assert list(psqlc.csv_records(iter([line]))) == [[None, "", 'say "hi"', "a,b"]]
+
+
+def test_text_copy_for_types_without_binary_converter():
+    assert psqlc.binary_copy_supported(["int4", "text", "numeric", "jsonb"])
+    for name in ("_text", "interval", "timetz", "posint"):
+        assert not psqlc.binary_copy_supported(["int4", name])
+
+
+def test_text_converter_builds_array_literals():
+    convert = psqlc.make_text_converter("_text")
+    assert convert(["a", 'b"c', None, ["d"], True]) == '{"a","b\\"c",NULL,{"d"},"t"}'
+    assert convert("{x,y}") == "{x,y}"
+    assert psqlc.make_text_converter("jsonb")({"k": [1]}) == '{"k": [1]}'
+
+
+def test_text_records_decode_copy_text_format():
+    lines = ['\\N\tx\\ty\n', 'a\\\\b\t"quoted"\t\\n\\101\\x42\r\n', '\t\n', '\\.\n', 'after end\n']
+    assert list(psqlc.text_records(iter(lines))) == [
+        [None, "x\ty"],
+        ["a\\b", '"quoted"', "\nAB"],
+        ["", ""],
+    ]
+
+
+def test_detect_load_format():
+    assert psqlc._detect_load_format("a.TSV") == "tsv"
+    assert psqlc._detect_load_format("a.ndjson") == "jsonl"
+    assert psqlc._detect_load_format("a.json") == "json"
+    assert psqlc._detect_load_format("a.txt") == "csv"
@@ -0,0 +1,35 @@
+import pytest
+
+import psqlc
+
+
+def test_percentile_single_sample():
+    for pct in (0, 50, 95, 99, 100):
+        assert psqlc.percentile([0.004], pct) == 0.004
+
+
+def test_percentile_bounds():
+    ordered = [1.0, 2.0, 3.0, 4.0]
+    # p0 and p100 clamp to the smallest and largest sample
+    assert psqlc.percentile(ordered, 0) == 1.0
+    assert psqlc.percentile(ordered, 100) == 4.0
+    assert psqlc.percentile([], 50) == 0.0
+
+
+@pytest.mark.parametrize("pct, expected", [(25, 1.0), (26, 2.0), (50, 2.0), (75, 3.0), (76, 4.0), (99, 4.0)])
+def test_percentile_is_nearest_rank_without_interpolation(pct, expected):
+    assert psqlc.percentile([1.0, 2.0, 3.0, 4.0], pct) == expected
+
+
+def test_percentile_large_sample():
+    ordered = [i / 1000 for i in range(1, 1001)]
+    assert psqlc.percentile(ordered, 50) == 0.5
+    assert psqlc.percentile(ordered, 99) == 0.99
+    assert psqlc.percentile(ordered, 99.9) == 0.999
+
+
+def test_latency_table_in_ms_and_skips_empty_phases():
+    table = psqlc.latency_table("Latency", {"dns": [], "query": [0.003, 0.001, 0.002]})
+    assert table.row_count == 1
+    cells = [column._cells[0] for column in table.columns]
+    assert cells == ["query", "1.00", "2.00", "3.00", "3.00", "3.00", "3"]
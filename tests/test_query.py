@@ -0,0 +1,107 @@
+import argparse
+import asyncio
+import re
+
+import psqlc
+
+
+class FakeConn:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def execute(self, query):
+        await asyncio.sleep(0)
+        return "UPDATE 3"
+
+
+class FakePool:
+    """Hands out at most `size` connections, like an asyncpg pool with max_size"""
+
+    def __init__(self, size):
+        self.size = size
+        self.slots = asyncio.Semaphore(size)
+        self.running = self.peak = 0
+        self.closed = False
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                await pool.slots.acquire()
+                pool.running += 1
+                pool.peak = max(pool.peak, pool.running)
+                return FakeConn(pool)
+
+            async def __aexit__(self, *exc):
+                pool.running -= 1
+                pool.slots.release()
+                return False
+
+        return Acquire()
+
+    async def close(self):
+        self.closed = True
+
+
+def run_queries(monkeypatch, capsys, queries, concurrency):
+    monkeypatch.setenv("COLUMNS", "200")
+    pools = []
+
+    async def get_pool(**kwargs):
+        assert kwargs["min_size"] == kwargs["max_size"]
+        pools.append(FakePool(kwargs["max_size"]))
+        return pools[-1]
+
+    async def fetch_limited(conn, query, limit, prefetch, readonly):
+        # "SELECT 0.05" sleeps 50 ms and returns one row
+        if "missing" in query:
+            raise RuntimeError('relation "missing" does not exist')
+        seconds = float(query.split()[1])
+        await asyncio.sleep(seconds)
+        return [{"seconds": seconds}]
+
+    monkeypatch.setattr(psqlc, "get_pool", get_pool)
+    monkeypatch.setattr(psqlc, "get_db_config_or_args", lambda args: {})
+    monkeypatch.setattr(psqlc, "fetch_limited", fetch_limited)
+    args = argparse.Namespace(concurrency=concurrency, limit=None, prefetch=None, database="app",
+                              up_level=0, down_level=0, readonly=False)
+    asyncio.run(psqlc.execute_queries(args, queries))
+    return pools[0], capsys.readouterr().out
+
+
+def reported(out):
+    """(index, query, ms) for every per-query line, in printed order"""
+    return [(int(index), query, float(ms))
+            for index, query, ms in re.findall(r"\[(\d+)\] (.+?) · (?:.* · )?([\d.]+) ms", out)]
+
+
+def test_results_are_printed_in_input_order(monkeypatch, capsys):
+    queries = ["SELECT 0.08", "SELECT 0.01", "UPDATE t SET v = 1", "SELECT 0.04", "SELECT * FROM missing"]
+    pool, out = run_queries(monkeypatch, capsys, queries, concurrency=5)
+
+    assert [(index, query) for index, query, _ in reported(out)] == list(enumerate(queries, 1))
+    assert "UPDATE 3" in out
+    assert 'relation "missing" does not exist' in out
+    assert "4 ok, 1 failed" in out
+    assert pool.closed
+
+
+def test_concurrency_is_capped(monkeypatch, capsys):
+    pool, _ = run_queries(monkeypatch, capsys, [f"SELECT 0.0{n}" for n in range(1, 9)], concurrency=3)
+    assert pool.peak == 3
+
+    # never more connections than queries
+    pool, _ = run_queries(monkeypatch, capsys, ["SELECT 0.01", "SELECT 0.01"], concurrency=10)
+    assert pool.size == 2
+
+
+def test_latency_excludes_waiting_for_a_connection(monkeypatch, capsys):
+    _, out = run_queries(monkeypatch, capsys, ["SELECT 0.1"] * 3, concurrency=1)
+    latencies = [ms for _, _, ms in reported(out)]
+    # one connection: the batch takes ~300 ms, but each query reports its own ~100 ms
+    assert len(latencies) == 3
+    assert all(90 <= ms < 190 for ms in latencies)
+    wall = float(re.search(r"in ([\d.]+)s wall", out).group(1))
+    assert wall >= 0.3
+    assert re.search(r"\(0\.3\ds of query time, 1\.0x overlap\)", out)
@@ -0,0 +1,134 @@
+import asyncio
+import tarfile
+
+import asyncpg
+import pytest
+
+import psqlc
+
+
+class FakeConn:
+    def __init__(self, pool):
+        self.pool = pool
+
+    async def execute(self, sql):
+        self.pool.running += 1
+        self.pool.peak = max(self.pool.peak, self.pool.running)
+        try:
+            await asyncio.sleep(0)
+            self.pool.log.append((id(self), sql))
+            if self.pool.deadlocks.get(sql, 0):
+                self.pool.deadlocks[sql] -= 1
+                raise asyncpg.DeadlockDetectedError("deadlock detected")
+        finally:
+            self.pool.running -= 1
+
+
+class FakePool:
+    def __init__(self, deadlocks=None):
+        self.log = []
+        self.running = self.peak = 0
+        self.deadlocks = dict(deadlocks or {})
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                return FakeConn(pool)
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Acquire()
+
+
+def item(step, sql, table=None):
+    return {"step": step, "sql": sql, "table": table}
+
+
+def test_post_data_runs_step_by_step():
+    pool = FakePool()
+    items = [item(1, "fk a"), item(0, "index a", "a"), item(2, "setval"), item(0, "index b", "b"), item(1, "fk b")]
+    done = []
+    asyncio.run(psqlc.run_post_data(pool, items, workers=4, on_done=lambda i: done.append(i["sql"])))
+
+    steps = [next(i["step"] for i in items if i["sql"] == sql) for _, sql in pool.log]
+    assert steps == sorted(steps)
+    assert sorted(done) == sorted(i["sql"] for i in items)
+
+
+def test_post_data_keeps_same_table_in_order_on_one_connection():
+    pool = FakePool()
+    items = [item(0, f"a{n}", "public.a") for n in range(3)] + [item(0, f"b{n}", "public.b") for n in range(3)]
+    asyncio.run(psqlc.run_post_data(pool, items, workers=4))
+
+    for table in "ab":
+        runs = [(conn, sql) for conn, sql in pool.log if sql.startswith(table)]
+        assert [sql for _, sql in runs] == [f"{table}{n}" for n in range(3)]
+        assert len({conn for conn, _ in runs}) == 1
+    # the two tables ran side by side, but never more than one statement per table
+    assert pool.peak == 2
+
+
+def test_post_data_worker_limit():
+    pool = FakePool()
+    asyncio.run(psqlc.run_post_data(pool, [item(0, f"i{n}") for n in range(10)], workers=3))
+    assert len(pool.log) == 10
+    assert pool.peak == 3
+
+
+def test_post_data_retries_deadlocks():
+    pool = FakePool(deadlocks={"fk": 2})
+    done = []
+    asyncio.run(psqlc.run_post_data(pool, [item(0, "fk", "a")], on_done=lambda i: done.append(i["sql"])))
+    assert [sql for _, sql in pool.log] == ["fk"] * 3
+    assert done == ["fk"]
+
+    pool = FakePool(deadlocks={"fk": 3})
+    with pytest.raises(asyncpg.DeadlockDetectedError):
+        asyncio.run(psqlc.run_post_data(pool, [item(0, "fk", "a")]))
+    assert len(pool.log) == 3
+
+
+def test_detect_archive_kind(tmp_path):
+    (tmp_path / "psqlc").mkdir()
+    psqlc.write_archive_manifest(str(tmp_path / "psqlc"), {"format": "psqlc"})
+    (tmp_path / "directory").mkdir()
+    (tmp_path / "directory" / "toc.dat").write_bytes(b"PGDMP")
+    (tmp_path / "other").mkdir()
+    (tmp_path / "custom.dump").write_bytes(b"PGDMP\x01\x0f\x00")
+    (tmp_path / "plain.sql").write_text("CREATE TABLE t (id int);\n")
+    with tarfile.open(tmp_path / "backup.tar", "w") as tar:
+        tar.add(tmp_path / "plain.sql", arcname="toc.dat")
+
+    kinds = {name: psqlc.detect_archive_kind(str(tmp_path / name))
+             for name in ("psqlc", "directory", "other", "custom.dump", "backup.tar", "plain.sql", "missing")}
+    assert kinds == {"psqlc": "psqlc", "directory": "directory", "other": None, "custom.dump": "custom",
+                     "backup.tar": "tar", "plain.sql": "plain", "missing": None}
+
+
+PG_RESTORE_LIST = """\
+;
+; Archive created at 2026-10-18 09:51:03 UTC
+;     dbname: postgres
+;
+; Selected TOC Entries:
+;
+6; 2615 38332 SCHEMA - sales postgres
+216; 1259 38333 TABLE sales orders postgres
+2548; 0 38333 TABLE DATA sales orders postgres
+2549; 0 38338 TABLE DATA public plain_t app_owner
+2550; 0 38341 TABLE DATA public with space postgres
+2400; 2606 38337 CONSTRAINT sales orders orders_pkey postgres
+3041; 0 0 SEQUENCE SET public plain_t_id_seq postgres
+"""
+
+
+def test_parse_pg_restore_list():
+    assert psqlc.parse_pg_restore_list(PG_RESTORE_LIST) == {
+        "sales.orders": "2548",
+        "public.plain_t": "2549",
+        "public.with space": "2550",
+    }
+    assert psqlc.parse_pg_restore_list("") == {}
@@ -0,0 +1,78 @@
+import io
+
+import pytest
+
+import psqlc
+
+SCRIPT = """-- setup
+CREATE TABLE t (id int, note text);
+INSERT INTO t VALUES (1, 'a;b'), (2, E'it\\'s; here'), (3, 'x''y;');
+/* outer /* nested; */ still comment; */ SELECT "odd;name" FROM t;
+CREATE FUNCTION f() RETURNS int AS $body$ SELECT 1; $body$ LANGUAGE sql;
+\\set ON_ERROR_STOP on
+;;
+COPY t FROM stdin;
+4\tfour
+5\tfive
+\\.
+SELECT 2"""
+
+
+def statements(script, chunk_size):
+    reader = psqlc.SqlScriptReader(io.BytesIO(script.encode()), chunk_size=chunk_size)
+    result = []
+    for kind, text, line, offset in reader:
+        result.append((kind, text[offset:], line))
+        if text[offset:].startswith("COPY"):
+            result.append(("data", b"".join(reader.copy_data()).decode(), reader.line))
+    return result
+
+
+@pytest.mark.parametrize("chunk_size", [1 << 20, 7, 1])
+def test_statements_split_on_top_level_semicolons(chunk_size):
+    assert statements(SCRIPT, chunk_size) == [
+        ("sql", "CREATE TABLE t (id int, note text)", 2),
+        ("sql", "INSERT INTO t VALUES (1, 'a;b'), (2, E'it\\'s; here'), (3, 'x''y;')", 3),
+        ("sql", 'SELECT "odd;name" FROM t', 4),
+        ("sql", "CREATE FUNCTION f() RETURNS int AS $body$ SELECT 1; $body$ LANGUAGE sql", 5),
+        ("meta", "\\set ON_ERROR_STOP on", 6),
+        ("sql", "COPY t FROM stdin", 8),
+        ("data", "4\tfour\n5\tfive\n", 12),
+        ("sql", "SELECT 2", 12),
+    ]
+
+
+def test_multibyte_characters_split_across_chunks():
+    script = "SELECT 'héllo — ünïcode';\nSELECT '日本';"
+    assert [text for _, text, _ in statements(script, 3)] == [
+        "SELECT 'héllo — ünïcode'",
+        "SELECT '日本'",
+    ]
+
+
+def test_trailing_comment_is_not_a_statement():
+    assert statements("SELECT 1;\n-- done\n", 1 << 20) == [("sql", "SELECT 1", 1)]
+
+
+def test_parse_copy_from_stdin():
+    assert psqlc.parse_copy_from_stdin('COPY public.t (a, "B c") FROM stdin') == \
+        {"table_name": "t", "schema_name": "public", "columns": ["a", "B c"]}
+    assert psqlc.parse_copy_from_stdin(
+        "copy \"My T\" from STDIN with (format csv, header true, delimiter E'\\t', null '', force_not_null (a))"
+    ) == {"table_name": "My T", "schema_name": None, "columns": None, "format": "csv", "header": True,
+          "delimiter": "\t", "null": "", "force_not_null": ["a"]}
+    # the syntax before 9.0
+    assert psqlc.parse_copy_from_stdin("COPY t FROM stdin WITH CSV HEADER DELIMITER AS ';' NULL 'x'") == \
+        {"table_name": "t", "schema_name": None, "columns": None, "format": "csv", "header": True,
+         "delimiter": ";", "null": "x"}
+
+
+@pytest.mark.parametrize("statement", [
+    "COPY t FROM stdin WHERE a > 1",
+    "COPY t FROM stdin (FORMAT binary)",
+    "COPY t FROM stdin (HEADER match)",
+    "COPY t FROM stdin (ON_ERROR ignore)",
+])
+def test_parse_copy_from_stdin_rejects_what_copy_to_table_cannot_run(statement):
+    with pytest.raises(ValueError):
+        psqlc.parse_copy_from_stdin(statement)
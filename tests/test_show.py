@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+import psqlc
+
+
+class FakeConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    async def fetch(self, query, *args):
+        self.calls.append(args)
+        return self.rows[:args[-1]]
+
+
+def table_rows(n):
+    return [{"schema": "s.x", "table": 't"%d' % i, "oid": 100 - i, "size_bytes": 1000 - i} for i in range(n)]
+
+
+def test_name_page_token_round_trip():
+    token = psqlc.name_page_token("a.b", 'x."y')
+    assert psqlc.parse_name_page_token(token) == ("a.b", 'x."y')
+    assert psqlc.parse_name_page_token("public.events_2024") == ("public", "events_2024")
+    with pytest.raises(ValueError):
+        psqlc.parse_name_page_token("nodot")
+
+
+def test_next_page_only_when_more_rows_exist():
+    conn = FakeConn(table_rows(3))
+    rows, next_after = asyncio.run(psqlc.fetch_tables_page(conn, limit=3))
+    assert len(rows) == 3 and next_after is None
+    assert conn.calls[0][-1] == 4
+
+    rows, next_after = asyncio.run(psqlc.fetch_tables_page(conn, limit=2))
+    assert len(rows) == 2
+    assert psqlc.parse_name_page_token(next_after) == ("s.x", 't"1')
+
+    rows, next_after = asyncio.run(psqlc.fetch_tables_page(conn, sort="size", limit=2))
+    assert next_after == "999:99"
+
+
+def test_like_pattern():
+    assert psqlc.like_pattern(None) is None
+    assert psqlc.like_pattern("user_*") == "user\\_%"
+    assert psqlc.like_pattern("user_1") == "user\\_1"
+    assert psqlc.like_pattern("log?") == "log_"
+    assert psqlc.like_pattern("user_%") == "user_%"
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+
+import psqlc
+
+
+def by_key(deltas):
+    return {delta["key"]: delta for delta in deltas}
+
+
+def test_statement_deltas_between_snapshots():
+    before = {"10:5:1": [100, 50.0, 1000, 900, 100], "10:5:2": [7, 70.0, 7, 0, 0]}
+    after = {"10:5:1": [104, 90.0, 1040, 950, 110], "10:5:2": [7, 70.0, 7, 0, 0]}
+    deltas = by_key(psqlc.statement_deltas(before, after))
+
+    # entries without calls in the window are left out
+    assert list(deltas) == ["10:5:1"]
+    delta = deltas["10:5:1"]
+    assert (delta["calls"], delta["rows"], delta["hits"], delta["reads"]) == (4, 40, 50, 10)
+    assert delta["total_ms"] == pytest.approx(40.0)
+    assert delta["mean_ms"] == pytest.approx(10.0)
+
+
+def test_new_and_reset_entries_count_in_full():
+    before = {"10:5:1": [500, 900.0, 500, 0, 0]}
+    after = {"10:5:1": [3, 6.0, 3, 1, 2], "10:5:9": [2, 1.0, 0, 0, 0]}
+    deltas = by_key(psqlc.statement_deltas(before, after))
+    assert deltas["10:5:1"]["calls"] == 3 and deltas["10:5:1"]["total_ms"] == pytest.approx(6.0)
+    assert deltas["10:5:9"]["calls"] == 2 and deltas["10:5:9"]["mean_ms"] == pytest.approx(0.5)
+
+
+def test_saved_snapshot_round_trips_through_json():
+    before = {"10:5:1": [1, 2.5, 1, 0, 0]}
+    saved = json.loads(json.dumps({"taken_at": 0, "statements": before}))["statements"]
+    deltas = psqlc.statement_deltas(saved, {"10:5:1": [3, 4.5, 2, 0, 0]})
+    assert deltas[0]["calls"] == 2 and deltas[0]["total_ms"] == pytest.approx(2.0)
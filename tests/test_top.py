@@ -0,0 +1,33 @@
+import pytest
+
+import psqlc
+
+
+def sample(**values):
+    base = dict(commits=0, rollbacks=0, reads=0, writes=0, blks_read=0, blks_hit=0)
+    base.update(values)
+    return base
+
+
+def test_first_sample_has_no_rates():
+    assert psqlc.counter_rates(None, sample(commits=10), 1.0) == {}
+    assert psqlc.counter_rates(sample(), sample(commits=10), 0) == {}
+
+
+def test_counter_rates_per_second():
+    previous = sample(commits=100, rollbacks=5, reads=1000, writes=10, blks_read=10, blks_hit=90)
+    current = sample(commits=300, rollbacks=9, reads=5000, writes=50, blks_read=30, blks_hit=270)
+    rates = psqlc.counter_rates(previous, current, 2.0)
+    assert rates["tps"] == pytest.approx(102)
+    assert rates["commits"] == pytest.approx(100)
+    assert rates["rollbacks"] == pytest.approx(2)
+    assert rates["reads"] == pytest.approx(2000)
+    assert rates["writes"] == pytest.approx(20)
+    assert rates["hit_ratio"] == pytest.approx(90)
+
+
+def test_counter_rates_without_block_activity():
+    previous = sample(writes=None)
+    rates = psqlc.counter_rates(previous, sample(commits=1, writes=4), 1.0)
+    assert rates["hit_ratio"] is None
+    assert rates["writes"] == 4